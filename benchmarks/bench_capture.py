@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from contextlib import ExitStack
+
+from benchmarks.fixtures import fake_mss, synthetic_frame
+from benchmarks.harness import Context, case
+
+
+def _capture(ctx: Context, width: int, height: int):
+    from jp_assist_ai.adapters.capture.mac_capture import Region, capture_region
+
+    stack = ExitStack()
+    stack.enter_context(fake_mss(synthetic_frame(width, height)))
+    ctx.defer(stack.close)
+    region = Region(0, 0, width, height)
+    return lambda: capture_region(region)
+
+
+@case("capture_region.1080p")
+def capture_1080p(ctx: Context):
+    return _capture(ctx, 1920, 1080)
+
+
+@case("capture_region.5k", repeat=10)
+def capture_5k(ctx: Context):
+    return _capture(ctx, 5120, 2880)
+
+
+def _frozen_crop(ctx: Context, width: int, height: int):
+    from jp_assist_ai.adapters.capture.mac_capture import Region, grab_desktop
+
+    stack = ExitStack()
+    stack.enter_context(fake_mss(synthetic_frame(width, height)))
+    ctx.defer(stack.close)
+    frame = grab_desktop()
+    # A typical selection: a paragraph-sized box in the middle of the desktop
+    region = Region(width // 4, height // 4, width // 2, height // 3)
+    return lambda: frame.crop(region)
+
+
+@case("capture.frozen_crop.1080p")
+def frozen_crop_1080p(ctx: Context):
+    return _frozen_crop(ctx, 1920, 1080)
+
+
+@case("capture.frozen_crop.5k", repeat=10)
+def frozen_crop_5k(ctx: Context):
+    return _frozen_crop(ctx, 5120, 2880)
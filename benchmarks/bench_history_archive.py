@@ -0,0 +1,126 @@
+"""
+History export / import through the streaming archive.
+
+The sample is one full export (or import into an empty database) of a
+history with text entries and shared capture images. Peak RSS is recorded
+at two history sizes: with streaming it should not grow with the history.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import random
+import time
+
+from benchmarks.fixtures import _JP_WORDS, RssSampler
+from benchmarks.harness import Context, case
+
+_IMAGES = 1000
+_IMAGE_BYTES = 24_000
+_DATABASES: dict[int, str] = {}
+
+
+def _history(ctx: Context, entries: int) -> str:
+    """A history database of `entries`, a third of them with one of _IMAGES captures (built once per size)."""
+    from jp_assist_ai.adapters.storage.base import HistoryEntry
+    from jp_assist_ai.adapters.storage.sqlite_store import SqliteStore
+
+    if entries in _DATABASES:
+        return _DATABASES[entries]
+    path = os.path.join(ctx.workdir, f"history-{entries}.db")
+    store = SqliteStore(path)
+    rng = random.Random(0)
+    # Random bytes: as incompressible as real PNGs
+    images = [rng.randbytes(_IMAGE_BYTES) for _ in range(_IMAGES)]
+    store.import_history((), images)
+    digests = [hashlib.sha256(data).hexdigest() for data in images]
+    batch = []
+    for i in range(entries):
+        source = "".join(rng.choice(_JP_WORDS) for _ in range(rng.randint(4, 16)))
+        translation = f"Original:\n{source}\n\nTranslation:\n" + " ".join(rng.choice(_JP_WORDS) for _ in range(8))
+        image = digests[rng.randrange(_IMAGES)] if i % 3 == 0 else None
+        batch.append(HistoryEntry(0, 1_700_000_000 + i, "JP", "VI", source, translation, image))
+        if len(batch) == 1000:
+            store.import_history(batch)
+            batch = []
+    store.import_history(batch)
+    store.close()
+    _DATABASES[entries] = path
+    return path
+
+
+def _export_case(ctx: Context, entries: int):
+    from jp_assist_ai.adapters.storage.sqlite_store import SqliteStore
+    from jp_assist_ai.services.history_archive import export_history
+
+    store = SqliteStore(_history(ctx, entries))
+    ctx.defer(store.close)
+    out = os.path.join(ctx.workdir, f"export-{entries}.tar")
+
+    def run() -> float:
+        with RssSampler() as rss:
+            start = time.perf_counter()
+            stats = export_history(store, out)
+            elapsed = time.perf_counter() - start
+        size = os.path.getsize(out) / 1e6
+        ctx.extra.update(
+            entries=stats.entries,
+            images=stats.images,
+            archive_mb=round(size, 1),
+            mb_per_s=round(size / elapsed, 1),
+            peak_rss_mb=max(ctx.extra.get("peak_rss_mb", 0.0), round(rss.peak_delta_mb, 1)),
+        )
+        return elapsed * 1000
+
+    return run
+
+
+def _import_case(ctx: Context, entries: int):
+    from jp_assist_ai.adapters.storage.sqlite_store import SqliteStore
+    from jp_assist_ai.services.history_archive import export_history, import_history
+
+    source = SqliteStore(_history(ctx, entries))
+    archive = os.path.join(ctx.workdir, f"import-{entries}.tar")
+    export_history(source, archive)
+    source.close()
+
+    def run() -> float:
+        store = SqliteStore(os.path.join(ctx.workdir, f"restore-{time.perf_counter_ns()}.db"))
+        try:
+            with RssSampler() as rss:
+                start = time.perf_counter()
+                stats = import_history(store, archive)
+                elapsed = time.perf_counter() - start
+            again = import_history(store, archive)
+        finally:
+            store.close()
+        ctx.extra.update(
+            entries=stats.entries,
+            images=stats.images,
+            reimport_skipped=again.skipped,
+            reimport_added=again.entries,
+            peak_rss_mb=max(ctx.extra.get("peak_rss_mb", 0.0), round(rss.peak_delta_mb, 1)),
+        )
+        return elapsed * 1000
+
+    return run
+
+
+@case("history_archive.export.10k", repeat=3, warmup=1)
+def export_10k(ctx: Context):
+    return _export_case(ctx, 10_000)
+
+
+@case("history_archive.export.50k", repeat=3, warmup=1)
+def export_50k(ctx: Context):
+    return _export_case(ctx, 50_000)
+
+
+@case("history_archive.import.10k", repeat=2, warmup=0)
+def import_10k(ctx: Context):
+    return _import_case(ctx, 10_000)
+
+
+@case("history_archive.import.50k", repeat=2, warmup=0)
+def import_50k(ctx: Context):
+    return _import_case(ctx, 50_000)
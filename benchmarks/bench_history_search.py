@@ -0,0 +1,133 @@
+"""
+Semantic history search: embedding throughput, queries over 100k stored
+vectors (flat scan and IVF), and search quality on a history with a few
+known entries planted among synthetic ones.
+"""
+from __future__ import annotations
+
+import os
+import random
+import time
+
+import numpy as np
+
+from benchmarks.fixtures import _JP_WORDS, RssSampler
+from benchmarks.harness import Context, case
+
+_EN_WORDS = (
+    "the", "a", "of", "to", "and", "please", "check", "confirm", "meeting", "tomorrow", "document",
+    "fix", "release", "review", "test", "environment", "problem", "cause", "schedule", "owner",
+    "deploy", "server", "login", "error", "screen", "layout", "report",
+)
+_PLANTED = (
+    ("バッチ処理のリトライ仕様を確認してください。", "Please check the spec for batch retries.", "where did I see the spec about batch retries?"),
+    ("ログイン時のエラーについて", "About the error at login", "login error"),
+    ("請求書の出力形式", "Invoice export format", "invoice export"),
+    ("請求書の出力形式", "Invoice export format", "請求書"),
+)
+
+
+def _documents(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    docs = []
+    for _ in range(count):
+        jp = "".join(rng.choice(_JP_WORDS) for _ in range(rng.randint(4, 12)))
+        en = " ".join(rng.choice(_EN_WORDS) for _ in range(rng.randint(6, 16)))
+        docs.append(f"{jp}\n{en}")
+    return docs
+
+
+@case("history_search.embed.10k", repeat=3, warmup=1)
+def embed_10k(ctx: Context):
+    from jp_assist_ai.core.embedding import HashedNgramEmbedder
+
+    embedder = HashedNgramEmbedder()
+    docs = _documents(10_000)
+    return lambda: embedder.embed_many(docs)
+
+
+_VECTORS: dict[int, np.ndarray] = {}
+
+
+def _vector_store(ctx: Context, rows: int, ivf: bool):
+    from jp_assist_ai.adapters.storage.vector_store import VectorStore
+    from jp_assist_ai.core.embedding import HashedNgramEmbedder
+
+    embedder = HashedNgramEmbedder()
+    if rows not in _VECTORS:
+        _VECTORS[rows] = embedder.embed_many(_documents(rows))
+    store = VectorStore(os.path.join(ctx.workdir, f"vectors-{time.perf_counter_ns()}"), embedder.dim)
+    store.append(np.arange(1, rows + 1), _VECTORS[rows])
+    if ivf:
+        start = time.perf_counter()
+        store.build_ivf()
+        ctx.extra["build_ivf_s"] = round(time.perf_counter() - start, 2)
+    mean = store.mean()
+    queries = []
+    for text in _documents(50, seed=1):
+        query = embedder.embed(text) - mean
+        queries.append(query / np.linalg.norm(query))
+    return store, queries
+
+
+def _query_case(ctx: Context, ivf: bool):
+    store, queries = _vector_store(ctx, 100_000, ivf)
+    if ivf:
+        from jp_assist_ai.adapters.storage.vector_store import VectorStore
+
+        # The same rows without the lists: recall@10 of the IVF search against an exact one
+        flat = VectorStore.__new__(VectorStore)
+        flat.__dict__.update(store.__dict__)
+        flat._ivf = None
+        found = 0
+        for query in queries:
+            truth = {hit for hit, _ in flat.search(query, 10)}
+            found += len(truth & {hit for hit, _ in store.search(query, 10)})
+        ctx.extra["recall_at_10"] = round(found / (10 * len(queries)), 3)
+    step = [0]
+
+    def run() -> None:
+        query = queries[step[0] % len(queries)]
+        step[0] += 1
+        with RssSampler() as rss:
+            store.search(query, 10)
+        ctx.extra["peak_rss_mb"] = max(ctx.extra.get("peak_rss_mb", 0.0), round(rss.peak_delta_mb, 1))
+
+    return run
+
+
+@case("history_search.query.100k.flat", repeat=20, warmup=2)
+def query_flat(ctx: Context):
+    return _query_case(ctx, ivf=False)
+
+
+@case("history_search.query.100k.ivf", repeat=20, warmup=2)
+def query_ivf(ctx: Context):
+    return _query_case(ctx, ivf=True)
+
+
+@case("history_search.quality.5k", repeat=3, warmup=0)
+def quality(ctx: Context):
+    """Rank of planted entries among 5k synthetic ones (0 = first), through the history store."""
+    from jp_assist_ai.adapters.storage.sqlite_store import SqliteStore
+    from jp_assist_ai.services.history_search import HistorySearch
+
+    store = SqliteStore(os.path.join(ctx.workdir, f"quality-{time.perf_counter_ns()}.db"))
+    ctx.defer(store.close)
+    for doc in _documents(5_000):
+        source, translation = doc.split("\n")
+        store.add_history("JP", "EN", translation, source=source)
+    planted = [store.add_history("JP", "EN", translation, source=source).id for source, translation, _ in _PLANTED]
+    search = HistorySearch(store, os.path.join(ctx.workdir, f"quality-index-{time.perf_counter_ns()}"))
+    start = time.perf_counter()
+    search.sync()
+    ctx.extra["sync_s"] = round(time.perf_counter() - start, 2)
+
+    def run() -> None:
+        for i, ((_, _, query), history_id) in enumerate(zip(_PLANTED, planted)):
+            ids = [entry.id for entry, _ in search.search(query, 50)]
+            # Entries 2 and 3 are the same text; either counts
+            wanted = {history_id, planted[2], planted[3]} if i >= 2 else {history_id}
+            ctx.extra[f"rank.{query}"] = next((rank for rank, hid in enumerate(ids) if hid in wanted), None)
+
+    return run
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from benchmarks.fixtures import synthetic_frame
+from benchmarks.harness import Context, case
+
+
+def _translate_image(ctx: Context, width: int, height: int):
+    from jp_assist_ai.adapters.llm.openai_llm import OpenAITranslator
+
+    translator = OpenAITranslator(api_key="stub")
+    image = synthetic_frame(width, height)
+    return lambda: translator.translate_image(image, "JP", "VI")
+
+
+@case("translate_image.1080p", repeat=10)
+def translate_image_1080p(ctx: Context):
+    return _translate_image(ctx, 1920, 1080)
+
+
+@case("translate_image.5k", repeat=5, warmup=1)
+def translate_image_5k(ctx: Context):
+    return _translate_image(ctx, 5120, 2880)
+
+
+def _translate_tiled(ctx: Context, width: int, height: int):
+    from jp_assist_ai.adapters.llm.openai_llm import OpenAITranslator
+    from jp_assist_ai.adapters.llm.tiled import TiledTranslator
+    from jp_assist_ai.core.tiling import plan_tiles
+
+    # A fixed per-request delay, so the number reflects how well tiles overlap
+    latency = ctx.stub.config.latency_ms
+    ctx.stub.config.latency_ms = 150
+    ctx.defer(lambda: setattr(ctx.stub.config, "latency_ms", latency))
+    translator = TiledTranslator(OpenAITranslator(api_key="stub"), max_workers=8)
+    image = synthetic_frame(width, height)
+    ctx.extra["tiles"] = len(plan_tiles(image))
+    return lambda: translator.translate_image(image, "JP", "VI")
+
+
+@case("translate_image.tiled.1080p", repeat=5, warmup=1)
+def translate_tiled_1080p(ctx: Context):
+    return _translate_tiled(ctx, 1920, 1080)
+
+
+@case("translate_image.tiled.5k", repeat=5, warmup=1)
+def translate_tiled_5k(ctx: Context):
+    return _translate_tiled(ctx, 5120, 2880)
+
+
+@case("translate_image.tiled.scroll_12k", repeat=5, warmup=1)
+def translate_tiled_scroll(ctx: Context):
+    return _translate_tiled(ctx, 1200, 12000)
+
+
+def _first_request(ctx: Context, speculative: bool):
+    """Time the first request of a fresh translator, as the first capture after a hotkey press sees it."""
+    import threading
+    import time
+
+    from jp_assist_ai.adapters.llm.openai_llm import OpenAITranslator
+
+    # Stand-ins for a remote backend: a handshake on every new connection, a fixed answer time
+    config = ctx.stub.config
+    saved = config.connect_ms, config.latency_ms
+    config.connect_ms, config.latency_ms = 80, 100
+    ctx.defer(lambda: (setattr(config, "connect_ms", saved[0]), setattr(config, "latency_ms", saved[1])))
+    warm_ups: list[float] = []
+
+    def warm(translator) -> None:
+        start = time.perf_counter()
+        translator.warm_up()
+        warm_ups.append((time.perf_counter() - start) * 1000)
+
+    def run() -> float:
+        translator = OpenAITranslator(api_key="stub")
+        try:
+            if speculative:
+                thread = threading.Thread(target=warm, args=(translator,))
+                thread.start()
+                time.sleep(0.5)  # the user dragging a selection
+                thread.join()
+                ctx.extra["warm_up_ms"] = sorted(warm_ups)[len(warm_ups) // 2]
+            start = time.perf_counter()
+            translator.translate_text("仕様書を確認してください。", "JP", "VI")
+            return (time.perf_counter() - start) * 1000
+        finally:
+            translator.transport.close()
+
+    return run
+
+
+@case("first_request.cold", repeat=5, warmup=1)
+def first_request_cold(ctx: Context):
+    return _first_request(ctx, speculative=False)
+
+
+@case("first_request.speculative", repeat=5, warmup=1)
+def first_request_speculative(ctx: Context):
+    return _first_request(ctx, speculative=True)
+
+
+def _burst(ctx: Context, coalesce: bool, identical: bool):
+    """32 callers at once, each translating one short line, against a backend that takes 4 requests at a time."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from jp_assist_ai.adapters.llm.coalescing import CoalescingTranslator
+    from jp_assist_ai.adapters.llm.openai_llm import OpenAITranslator
+
+    config = ctx.stub.config
+    saved = config.latency_ms, config.max_concurrency
+    config.latency_ms, config.max_concurrency = 100, 4
+    ctx.defer(lambda: (setattr(config, "latency_ms", saved[0]), setattr(config, "max_concurrency", saved[1])))
+    inner = OpenAITranslator(api_key="stub")
+    ctx.defer(inner.transport.close)
+    translator = CoalescingTranslator(inner) if coalesce else inner
+    pool = ThreadPoolExecutor(32)
+    ctx.defer(pool.shutdown)
+    round_ = [0]
+
+    def one(i: int) -> None:
+        text = "仕様書を確認してください。" if identical else f"仕様書の{round_[0]}-{i}行目を確認してください。"
+        result = translator.translate_text(text, "JP", "VI")
+        assert result.endswith(text) or result == config.reply, result
+
+    def run() -> None:
+        round_[0] += 1
+        before = ctx.stub.requests
+        list(pool.map(one, range(32)))
+        ctx.extra["backend_requests"] = ctx.stub.requests - before
+
+    return run
+
+
+@case("translate_text.burst32.direct", repeat=5, warmup=1)
+def burst_direct(ctx: Context):
+    return _burst(ctx, coalesce=False, identical=False)
+
+
+@case("translate_text.burst32.coalesced", repeat=5, warmup=1)
+def burst_coalesced(ctx: Context):
+    return _burst(ctx, coalesce=True, identical=False)
+
+
+@case("translate_text.burst32_identical.coalesced", repeat=5, warmup=1)
+def burst_identical(ctx: Context):
+    return _burst(ctx, coalesce=True, identical=True)
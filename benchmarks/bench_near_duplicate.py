@@ -0,0 +1,193 @@
+"""
+Near-duplicate capture detection: signature cost, index lookups at history
+scale, which capture variants count as repeats, and a repeat capture end to
+end through the capture window's worker.
+"""
+from __future__ import annotations
+
+import io
+import os
+import random
+import time
+from unittest import mock
+
+from PIL import Image, ImageDraw
+
+from benchmarks.fixtures import japanese_font, japanese_screenshot, qt_app, reset_services, synthetic_frame
+from benchmarks.harness import Context, Skip, case
+
+
+# (line in the page, the same line edited by one glyph or word)
+_DIGIT_EDIT = ("上限は1,000件です。", "上限は9,000件です。")
+_NEGATION_EDIT = ("この操作は許可されています。", "この操作は許可されていません。")
+
+
+def _page(width: int = 1280, height: int = 720) -> tuple[Image.Image, list[str], object]:
+    font = japanese_font(20)
+    if font is None:
+        raise Skip("no Japanese font found (set JP_ASSIST_BENCH_FONT)")
+    image, lines = japanese_screenshot(width, height, font, seed=3)
+    image = _with_line(image, font, _DIGIT_EDIT[0])
+    return _with_line(image, font, _NEGATION_EDIT[0], row=8), lines, font
+
+
+def _with_line(base: Image.Image, font, text: str, row: int = 6) -> Image.Image:
+    image = base.copy()
+    line_h = int(font.size * 1.6)
+    y = 16 + line_h * row
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, y, image.width, y + line_h - 1), fill="white")
+    draw.text((24, y), text, font=font, fill=(20, 20, 20))
+    return image
+
+
+def _variants(base: Image.Image, lines: list[str], font) -> dict[str, tuple[Image.Image, bool]]:
+    """name -> (image, whether its earlier translation may be reused)"""
+    line_h = int(font.size * 1.6)
+
+    def edit(fn) -> Image.Image:
+        image = base.copy()
+        fn(ImageDraw.Draw(image), image)
+        return image
+
+    def shifted(dx: int, dy: int) -> Image.Image:
+        image = Image.new("RGB", base.size, "white")
+        image.paste(base, (dx, dy))
+        return image
+
+    def jpeg() -> Image.Image:
+        buf = io.BytesIO()
+        base.save(buf, "JPEG", quality=70)
+        return Image.open(io.BytesIO(buf.getvalue())).convert("RGB")
+
+    def clock(draw, image) -> None:
+        draw.rectangle((image.width - 100, 0, image.width, 30), fill="white")
+        draw.text((image.width - 90, 4), "12:35", font=font, fill=(20, 20, 20))
+
+    def replace_line(draw, image) -> None:
+        y = 16 + line_h * 4
+        draw.rectangle((0, y, image.width, y + line_h - 1), fill="white")
+        draw.text((24, y), lines[min(7, len(lines) - 1)], font=font, fill=(20, 20, 20))
+
+    # Cursor, clock, shift and recompression are not reused either: pixels alone cannot
+    # tell them from an edit that changes the meaning, which would reuse a wrong translation
+    return {
+        "identical": (base.copy(), True),
+        "digit_edit": (_with_line(base, font, _DIGIT_EDIT[1]), False),
+        "negation_edit": (_with_line(base, font, _NEGATION_EDIT[1], row=8), False),
+        "cursor": (edit(lambda draw, _: draw.rectangle((300, 50, 301, 70), fill=(0, 0, 0))), False),
+        "clock": (edit(clock), False),
+        "shift_x": (shifted(1, 0), False),
+        "shift_y": (shifted(0, 1), False),
+        "jpeg": (jpeg(), False),
+        "line_replaced": (edit(replace_line), False),
+        "other_page": (japanese_screenshot(base.width, base.height, font, seed=4)[0], False),
+    }
+
+
+def _signature_case(width: int, height: int):
+    from jp_assist_ai.core.near_duplicate import signature
+
+    image = synthetic_frame(width, height).convert("RGBA")
+    return lambda: signature(image)
+
+
+@case("near_duplicate.signature.1080p", repeat=20)
+def signature_1080p(ctx: Context):
+    return _signature_case(1920, 1080)
+
+
+@case("near_duplicate.signature.retina_5k", repeat=10)
+def signature_5k(ctx: Context):
+    return _signature_case(5120, 2880)
+
+
+@case("near_duplicate.lookup.100k", repeat=20, warmup=1)
+def lookup_100k(ctx: Context):
+    """Index searches over 100k hashes: 20k screens with 5 near variants each; the sample is per search."""
+    from jp_assist_ai.core.near_duplicate import MultiIndexHash
+
+    rng = random.Random(1)
+    index: MultiIndexHash[int] = MultiIndexHash(radius=4)
+    keys = []
+    for i in range(20_000):
+        base = rng.getrandbits(64)
+        for _ in range(5):
+            key = base
+            for _ in range(rng.randint(0, 2)):
+                key ^= 1 << rng.randrange(64)
+            keys.append(key)
+            index.add(key, len(keys))
+    queries = [rng.choice(keys) ^ (1 << rng.randrange(64)) for _ in range(500)]
+    queries += [rng.getrandbits(64) for _ in range(500)]
+
+    def run() -> float:
+        start = time.perf_counter()
+        hits = sum(1 for key in queries if index.search(key))
+        ctx.extra["hit_share"] = hits / len(queries)
+        return (time.perf_counter() - start) * 1000 / len(queries)
+
+    return run
+
+
+@case("near_duplicate.variants", repeat=3, warmup=0)
+def variants(ctx: Context):
+    """
+    Which edits of a page are answered from history, confirmed by pixels and
+    (text_*) by recognized text; the sample is one full find() per variant.
+    """
+    from jp_assist_ai.adapters.storage.base import HistoryEntry
+    from jp_assist_ai.adapters.storage.sqlite_store import SqliteStore
+    from jp_assist_ai.core.near_duplicate import signature
+    from jp_assist_ai.services.job_queue import encode_png
+    from jp_assist_ai.services.near_duplicates import NearDuplicateIndex
+
+    base, lines, font = _page()
+    text = "\n".join([*lines, _DIGIT_EDIT[0], _NEGATION_EDIT[0]])
+    store = SqliteStore(os.path.join(ctx.workdir, f"variants-{time.perf_counter_ns()}.db"))
+    ctx.defer(store.close)
+    index = NearDuplicateIndex(store)
+    entry: HistoryEntry = store.add_history("JP", "VI", "earlier translation", source=text, image=encode_png(base))
+    index.add(entry, signature(base))
+    variants = _variants(base, lines, font)
+    # (signature, image, OCR text, expected reuse)
+    cases = {name: (signature(image), image, None, same) for name, (image, same) in variants.items()}
+    cases["text_clock"] = (cases["clock"][0], None, text, True)
+    cases["text_digit_edit"] = (cases["digit_edit"][0], None, text.replace(*_DIGIT_EDIT), False)
+
+    def run() -> float:
+        start = time.perf_counter()
+        for name, (sig, image, ocr_text, same) in cases.items():
+            hit = index.find(sig, "JP", "VI", image=image, text=ocr_text) is not None
+            ctx.extra[name] = "hit" if hit else "miss"
+            ctx.extra[f"{name}_ok"] = hit == same
+        return (time.perf_counter() - start) * 1000 / len(cases)
+
+    return run
+
+
+@case("pipeline.repeat_capture", repeat=10, warmup=0)
+def repeat_capture(ctx: Context):
+    """The same screen captured again: answered from history, no backend request."""
+    qt_app()
+    patch = mock.patch.dict(os.environ, {"JP_ASSIST_NEAR_DUPLICATES": "1"})
+    patch.start()
+    ctx.defer(patch.stop)
+    ctx.defer(reset_services)
+    reset_services()
+    from jp_assist_ai.app.overlay.floating_capture_window import _TranslateWorker
+    from jp_assist_ai.core.frames import FrameView
+
+    base, _, _ = _page()
+    first = _TranslateWorker(FrameView.from_image(base), "JP", "VI")
+    first.run()
+    def run() -> None:
+        before = ctx.stub.requests
+        results = []
+        worker = _TranslateWorker(FrameView.from_image(base.copy()), "JP", "VI")
+        worker.finished.connect(results.append)
+        worker.run()
+        assert results, "no translation"
+        ctx.extra["backend_requests"] = ctx.extra.get("backend_requests", 0) + ctx.stub.requests - before
+
+    return run
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import difflib
+import os
+
+from PIL import Image
+
+from benchmarks.fixtures import japanese_font, japanese_screenshot, synthetic_frame
+from benchmarks.harness import Context, Skip, case
+
+
+@case("paddle_recognize.1080p", repeat=5, warmup=1)
+def paddle_recognize(ctx: Context):
+    try:
+        from jp_assist_ai.adapters.ocr.paddle_ocr import PaddleOcrEngine
+    except ImportError as exc:
+        raise Skip(f"paddleocr not installed ({exc})")
+
+    engine = PaddleOcrEngine()
+    image = synthetic_frame(1920, 1080)
+    return lambda: engine.recognize(image)
+
+
+def _corpus() -> list[tuple[Image.Image, list[str]]]:
+    """Six 1080p pages: three text sizes (small UI to Retina-scale), light and dark."""
+    pages = []
+    for i, size in enumerate((14, 20, 32)):
+        font = japanese_font(size)
+        if font is None:
+            raise Skip("no Japanese font found (set JP_ASSIST_BENCH_FONT)")
+        for dark in (False, True):
+            pages.append(japanese_screenshot(1920, 1080, font, seed=i, dark=dark))
+    return pages
+
+
+def _char_accuracy(expected: list[str], lines: list) -> float:
+    truth = "".join("".join(expected).split())
+    found = "".join("".join(line.text for line in lines).split())
+    return difflib.SequenceMatcher(None, truth, found, autojunk=False).ratio()
+
+
+def _ocr_corpus(ctx: Context, make_engine, pages=None):
+    engine = make_engine()
+    ctx.defer(engine.close)
+    pages = pages or _corpus()
+    engine.warm_up()
+    scores: list[float] = []
+
+    def run() -> None:
+        lines = 0
+        for image, expected in pages:
+            found = engine.recognize_lines(image)
+            lines += len(found)
+            scores.append(_char_accuracy(expected, found))
+        ctx.extra["char_accuracy"] = round(sum(scores) / len(scores), 4)
+        ctx.extra["lines_per_page"] = lines / len(pages)
+
+    return run
+
+
+def _paddle():
+    try:
+        from jp_assist_ai.adapters.ocr.paddle_ocr import PaddleOcrEngine
+    except ImportError as exc:
+        raise Skip(f"paddleocr not installed ({exc})")
+    return PaddleOcrEngine()
+
+
+def _tesseract(workers: int | None):
+    try:
+        from jp_assist_ai.adapters.ocr.tesseract_ocr import TesseractOcrEngine
+    except ImportError as exc:
+        raise Skip(f"tesserocr not installed ({exc})")
+    try:
+        return TesseractOcrEngine("jpn", workers=workers, tessdata=os.getenv("TESSDATA_PREFIX") or None)
+    except RuntimeError as exc:
+        raise Skip(f"jpn traineddata not available ({exc})")
+
+
+@case("ocr_corpus.paddle", repeat=3, warmup=1)
+def ocr_corpus_paddle(ctx: Context):
+    return _ocr_corpus(ctx, _paddle)
+
+
+@case("ocr_corpus.tesseract", repeat=3, warmup=1)
+def ocr_corpus_tesseract(ctx: Context):
+    return _ocr_corpus(ctx, lambda: _tesseract(None))
+
+
+@case("ocr_corpus.tesseract.serial", repeat=3, warmup=1)
+def ocr_corpus_tesseract_serial(ctx: Context):
+    return _ocr_corpus(ctx, lambda: _tesseract(1))
+
+
+def _prepare(ctx: Context, width: int, height: int, font_size: int):
+    from jp_assist_ai.adapters.ocr.preprocess import prepare
+
+    font = japanese_font(font_size)
+    image = japanese_screenshot(width, height, font, dark=True)[0] if font else synthetic_frame(width, height, dark=True)
+    return lambda: prepare(image, text_height=20)
+
+
+@case("ocr_prepare.1080p", repeat=10)
+def ocr_prepare_1080p(ctx: Context):
+    return _prepare(ctx, 1920, 1080, 20)
+
+
+@case("ocr_prepare.retina_5k", repeat=5, warmup=1)
+def ocr_prepare_retina(ctx: Context):
+    return _prepare(ctx, 5120, 2880, 40)
+
+
+@case("ocr_corpus.tesseract.retina", repeat=3, warmup=1)
+def ocr_corpus_tesseract_retina(ctx: Context):
+    """Two 5K pages of Retina-scale (40 px) text: the rescale shrinks them before recognition."""
+    font = japanese_font(40)
+    if font is None:
+        raise Skip("no Japanese font found (set JP_ASSIST_BENCH_FONT)")
+    pages = [japanese_screenshot(5120, 2880, font, seed=seed, dark=seed == 1) for seed in (0, 1)]
+    return _ocr_corpus(ctx, lambda: _tesseract(None), pages)
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import os
+
+from contextlib import ExitStack
+
+from benchmarks.fixtures import RssSampler, fake_mss, qt_app, synthetic_frame
+from benchmarks.harness import Context, case
+
+
+@case("annotation_bounds.400x300", repeat=5, warmup=1)
+def annotation_bounds(ctx: Context):
+    qt_app()
+    from PySide6.QtCore import QPoint
+    from PySide6.QtGui import QImage
+
+    from jp_assist_ai.app.overlay.annotation_canvas import AnnotationCanvas
+
+    canvas = AnnotationCanvas()
+    background = QImage(400, 300, QImage.Format_RGB32)
+    background.fill(0xFFFFFFFF)
+    canvas.set_background(background)
+    canvas._draw_rect(QPoint(120, 80), QPoint(260, 140))
+    ctx.defer(canvas.deleteLater)
+    return canvas.annotation_bounds
+
+
+def _export(ctx: Context, mode: int):
+    qt_app()
+    from jp_assist_ai.app.overlay.floating_capture_window import FloatingCaptureWindow
+
+    window = FloatingCaptureWindow()
+    window.open_with_image(synthetic_frame(1920, 1080), None)
+    window._save_mode.setCurrentIndex(mode)
+    cwd = os.getcwd()
+    os.chdir(ctx.workdir)
+    ctx.defer(lambda: os.chdir(cwd))
+    ctx.defer(window.close)
+    return window._capture_images
+
+
+@case("capture_images.raw", repeat=10)
+def export_raw(ctx: Context):
+    return _export(ctx, 0)
+
+
+@case("capture_images.marked", repeat=10)
+def export_marked(ctx: Context):
+    return _export(ctx, 1)
+
+
+@case("capture_images.chat", repeat=10)
+def export_chat(ctx: Context):
+    return _export(ctx, 2)
+
+
+def _capture_window(ctx: Context, width: int, height: int):
+    """One capture end to end: crop the frozen desktop, show it, hand it to a translation, save it, close."""
+    app = qt_app()
+    from jp_assist_ai.adapters.capture.mac_capture import Region, grab_desktop
+    from jp_assist_ai.app.overlay.floating_capture_window import FloatingCaptureWindow
+    from jp_assist_ai.core.frames import default_budget
+
+    stack = ExitStack()
+    stack.enter_context(fake_mss(synthetic_frame(width, height)))
+    ctx.defer(stack.close)
+    frame = grab_desktop()
+    region = Region(0, 0, width, height)
+    window = FloatingCaptureWindow()
+    ctx.defer(window.deleteLater)
+    cwd = os.getcwd()
+    os.chdir(ctx.workdir)
+    ctx.defer(lambda: os.chdir(cwd))
+    peaks: list[float] = []
+
+    def run() -> None:
+        with RssSampler() as rss:
+            window.open_with_image(frame.crop_view(region, default_budget()), None)
+            app.processEvents()
+            # What a translation worker gets: a view of the same pixels
+            job = window._frame.crop((0, 0, width, height))
+            job.image().tobytes("raw", "RGBA", 0, 1)[:1]
+            window._capture_images()
+            job.release()
+            window.close()
+            app.processEvents()
+        peaks.append(rss.peak_delta_mb)
+        ctx.extra["peak_rss_mb"] = sorted(peaks)[len(peaks) // 2]
+        ctx.extra["budget_peak_mb"] = default_budget().peak / 2**20
+
+    return run
+
+
+@case("capture_window.1080p", repeat=10)
+def capture_window_1080p(ctx: Context):
+    return _capture_window(ctx, 1920, 1080)
+
+
+@case("capture_window.dual_5k", repeat=5, warmup=1)
+def capture_window_dual_5k(ctx: Context):
+    return _capture_window(ctx, 10240, 2880)
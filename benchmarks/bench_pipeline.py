@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import os
+from contextlib import ExitStack
+from unittest import mock
+
+from benchmarks.fixtures import (
+    fake_mss,
+    japanese_font,
+    japanese_screenshot,
+    qt_app,
+    reset_services,
+    synthetic_frame,
+)
+from benchmarks.harness import Context, Skip, case
+
+
+@case("pipeline.capture_translate_render", repeat=10)
+def capture_translate_render(ctx: Context):
+    """Region capture -> preview window -> translation against the stub -> output render."""
+    qt_app()
+    from jp_assist_ai.adapters.capture.mac_capture import Region, capture_region
+    from jp_assist_ai.app.overlay.floating_capture_window import FloatingCaptureWindow, _TranslateWorker
+
+    reset_services()
+    stack = ExitStack()
+    stack.enter_context(fake_mss(synthetic_frame(2560, 1440)))
+    ctx.defer(stack.close)
+    window = FloatingCaptureWindow()
+    ctx.defer(window.close)
+    region = Region(200, 150, 1200, 700)
+
+    def run() -> None:
+        image = capture_region(region)
+        window.open_with_image(image, None)
+        frame = window._frame
+        worker = _TranslateWorker(frame.crop((0, 0, frame.width, frame.height)), "JP", "VI")
+        worker.finished.connect(window._on_translation_done)
+        worker.failed.connect(window._on_translation_error)
+        worker.run()
+
+    return run
+
+
+def _fake_ocr_lines(width: int, height: int) -> list:
+    from jp_assist_ai.core.models import OcrLine
+
+    # One line per synthetic_frame text row (22 px pitch from y=12), full width
+    return [
+        OcrLine(f"{k}行目の仕様を確認してください。", (16, 12 + 22 * k, width - 32, 22))
+        for k in range((height - 34) // 22 + 1)
+    ]
+
+
+class _FakeOcr:
+    def __init__(self, lines: list):
+        self.lines = lines
+
+    def recognize_lines(self, image) -> list:
+        return self.lines
+
+
+def _highlight(ctx: Context, indexed: bool):
+    """Highlights moving down a 1200x700 capture: vision crop per highlight vs lines from the speculative OCR."""
+    qt_app()
+    from jp_assist_ai.app.overlay import floating_capture_window as fcw
+    from jp_assist_ai.core.pipeline import IncrementalTranslator
+    from jp_assist_ai.core.usecases.translate_screen import TranslateScreen
+    from jp_assist_ai.services.translate_service import get_translator
+
+    reset_services()
+    screen = TranslateScreen(_FakeOcr(_fake_ocr_lines(1200, 700)), IncrementalTranslator(get_translator()))
+    patch = mock.patch.object(fcw, "get_screen_translator", return_value=screen if indexed else None)
+    patch.start()
+    ctx.defer(patch.stop)
+    window = fcw.FloatingCaptureWindow()
+    ctx.defer(window.close)
+    window.open_with_image(synthetic_frame(1200, 700), None)
+    if indexed:
+        window._ocr_future.result(timeout=10)
+    frame = window._frame
+    step = [0]
+
+    def run() -> None:
+        # Each highlight overlaps the previous one by half, like a reader working down the page
+        x, y, w, h = 100, 40 + 66 * (step[0] % 8), 800, 132
+        step[0] += 1
+        before = ctx.stub.requests
+        index = window._line_index()
+        lines = index.query((x, y, w, h)) if index is not None else []
+        if lines:
+            worker = fcw._TranslateWorker(None, "JP", "VI", lines=lines)
+        else:
+            worker = fcw._TranslateWorker(frame.crop((x, y, x + w, y + h)), "JP", "VI")
+        failed = []
+        worker.failed.connect(failed.append)
+        worker.run()
+        assert not failed, failed
+        ctx.extra["backend_requests"] = ctx.extra.get("backend_requests", 0) + ctx.stub.requests - before
+
+    return run
+
+
+@case("pipeline.highlight.crop", repeat=16, warmup=0)
+def highlight_crop(ctx: Context):
+    return _highlight(ctx, indexed=False)
+
+
+@case("pipeline.highlight.indexed", repeat=16, warmup=0)
+def highlight_indexed(ctx: Context):
+    return _highlight(ctx, indexed=True)
+
+
+def _line_query(ctx: Context, indexed: bool):
+    """200 highlight lookups against the 2000 OCR lines of a long scrolled capture."""
+    import random
+
+    from jp_assist_ai.core.line_index import LineIndex
+
+    lines = _fake_ocr_lines(2560, 44_000)
+    index = LineIndex(lines)
+    rng = random.Random(0)
+    rects = [(rng.randint(0, 2000), rng.randint(0, 43_000), rng.randint(100, 800), rng.randint(40, 600)) for _ in range(200)]
+
+    def scan(rect) -> list:
+        x, y, w, h = rect
+        return [
+            line for line in lines
+            if line.box[0] < x + w and x < line.box[0] + line.box[2] and line.box[1] < y + h and y < line.box[1] + line.box[3]
+        ]
+
+    ctx.extra["lines"] = len(lines)
+
+    def run() -> None:
+        for rect in rects:
+            index.query(rect) if indexed else scan(rect)
+
+    return run
+
+
+@case("line_index.query.2000_lines", repeat=20)
+def line_query_indexed(ctx: Context):
+    return _line_query(ctx, indexed=True)
+
+
+@case("line_index.scan.2000_lines", repeat=20)
+def line_query_scan(ctx: Context):
+    return _line_query(ctx, indexed=False)
+
+
+def _ui_during_translation(ctx: Context, worker: bool, ocr: bool):
+    """
+    A 16 ms timer on the GUI thread (what Qt paints by) while a 5K capture is
+    translated on a background thread: how late do the frames come?
+    """
+    import threading
+    import time
+
+    app = qt_app()
+    from PySide6.QtCore import QEventLoop, QTimer
+
+    from jp_assist_ai.app.overlay.floating_capture_window import _TranslateWorker
+    from jp_assist_ai.core.frames import FrameView
+    from jp_assist_ai.services import translate_service
+
+    env = {"JP_ASSIST_WORKER_PROCESS": "1" if worker else "0"}
+    if ocr:
+        font = japanese_font(40)
+        try:
+            import tesserocr  # noqa: F401  (imported on the main thread, as the tray does)
+        except ImportError as exc:
+            raise Skip(f"tesserocr not installed ({exc})")
+        if font is None:
+            raise Skip("no Japanese font found (set JP_ASSIST_BENCH_FONT)")
+        image = japanese_screenshot(5120, 2880, font)[0]
+        env["JP_ASSIST_OCR"] = "tesseract"
+    else:
+        image = synthetic_frame(5120, 2880)
+    patch = mock.patch.dict(os.environ, env)
+    patch.start()
+    ctx.defer(patch.stop)
+    reset_services()
+    ctx.defer(reset_services)
+    pool = translate_service.get_worker()
+    # Process start and model loading happen at app start, not per capture
+    pool.warm_up() if pool is not None else translate_service.warm_up()
+    frame = FrameView.from_image(image)
+    ctx.defer(frame.release)
+    gaps: list[float] = []
+    late = [0]
+
+    def run() -> None:
+        ticks: list[float] = []
+        job = _TranslateWorker(frame.crop((0, 0, frame.width, frame.height)), "JP", "VI")
+        failed: list[str] = []
+        job.failed.connect(failed.append)
+        thread = threading.Thread(target=job.run)
+        loop = QEventLoop()
+        frame_timer = QTimer()
+        frame_timer.setInterval(16)
+        frame_timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+        done_timer = QTimer()
+        done_timer.setInterval(5)
+        done_timer.timeout.connect(lambda: thread.is_alive() or loop.quit())
+        frame_timer.start()
+        done_timer.start()
+        thread.start()
+        loop.exec()
+        frame_timer.stop()
+        done_timer.stop()
+        thread.join()
+        assert not failed, failed
+        run_gaps = [(b - a) * 1000 for a, b in zip(ticks, ticks[1:])]
+        gaps.extend(run_gaps)
+        late[0] += sum(1 for gap in run_gaps if gap > 2 * 16.7)
+        ordered = sorted(gaps)
+        ctx.extra["frame_gap_p95_ms"] = round(ordered[int(len(ordered) * 0.95)], 1) if ordered else 0.0
+        ctx.extra["frame_gap_max_ms"] = round(ordered[-1], 1) if ordered else 0.0
+        ctx.extra["dropped_frames"] = late[0]
+
+    return run
+
+
+@case("ui_frames.translate_5k.in_process", repeat=5, warmup=1)
+def ui_frames_in_process(ctx: Context):
+    return _ui_during_translation(ctx, worker=False, ocr=False)
+
+
+@case("ui_frames.translate_5k.worker_process", repeat=5, warmup=1)
+def ui_frames_worker(ctx: Context):
+    return _ui_during_translation(ctx, worker=True, ocr=False)
+
+
+@case("ui_frames.ocr_5k.in_process", repeat=3, warmup=1)
+def ui_frames_ocr_in_process(ctx: Context):
+    return _ui_during_translation(ctx, worker=False, ocr=True)
+
+
+@case("ui_frames.ocr_5k.worker_process", repeat=3, warmup=1)
+def ui_frames_ocr_worker(ctx: Context):
+    return _ui_during_translation(ctx, worker=True, ocr=True)
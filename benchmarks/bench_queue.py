@@ -0,0 +1,131 @@
+"""
+Durable translation queue against the stub backend.
+
+throughput: a backlog of queued captures drained against a healthy backend.
+recovery:   the backend is down while captures are queued; the sample is the
+            time from the backend coming back to the queue being empty.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+from benchmarks.fixtures import synthetic_frame
+from benchmarks.harness import Context, case
+
+_TEXT_JOBS = 120
+_IMAGE_JOBS = 8
+
+
+def _queue(ctx: Context, name: str):
+    from jp_assist_ai.adapters.llm.openai_llm import OpenAITranslator
+    from jp_assist_ai.adapters.llm.transport import AimdLimiter, AsyncTransport, CircuitBreaker, RetryPolicy
+    from jp_assist_ai.adapters.storage.sqlite_store import SqliteStore
+    from jp_assist_ai.services.job_queue import TranslationQueue
+    from openai import AsyncOpenAI
+
+    base_url = ctx.stub.base_url
+    transport = AsyncTransport(
+        lambda: AsyncOpenAI(api_key="stub", base_url=base_url, max_retries=0),
+        limiter=AimdLimiter(initial=4, maximum=16),
+        breaker=CircuitBreaker(threshold=3, cooldown=0.2),
+        retry=RetryPolicy(max_attempts=2, base_delay=0.02, max_delay=0.1),
+        deadline=5.0,
+    )
+    ctx.defer(transport.close)
+    translator = OpenAITranslator(api_key="stub", transport=transport)
+    store = SqliteStore(os.path.join(ctx.workdir, f"{name}-{time.perf_counter_ns()}.db"))
+    ctx.defer(store.close)
+    queue = TranslationQueue(
+        store,
+        translator.translate_lines,
+        translator.translate_image,
+        batch_size=8,
+        base_delay=0.05,
+        max_delay=0.5,
+    )
+    ctx.defer(queue.close)
+    return queue
+
+
+def _fill(queue, image) -> None:
+    from jp_assist_ai.services.job_queue import BATCH, INTERACTIVE
+
+    for i in range(_TEXT_JOBS):
+        lines = [f"キュー{i}の行{j}" for j in range(3)]
+        queue.submit_lines(lines, "JP", "VI", priority=INTERACTIVE if i % 10 == 0 else BATCH)
+    for _ in range(_IMAGE_JOBS):
+        queue.submit_image(image, "JP", "VI")
+
+
+def _drained(queue, jobs: int):
+    done = threading.Event()
+    finished: list[tuple[int, float]] = []  # (priority, completion time)
+
+    def listener(job, entry, error) -> None:
+        finished.append((job.priority, time.perf_counter()))
+        if len(finished) == jobs:
+            done.set()
+
+    queue.add_listener(listener)
+    return done, finished
+
+
+@case("queue.throughput", repeat=3, warmup=0)
+def queue_throughput(ctx: Context):
+    config = ctx.stub.config
+    latency = config.latency_ms
+    config.latency_ms = 40
+    ctx.defer(lambda: setattr(config, "latency_ms", latency))
+    image = synthetic_frame(800, 600)
+
+    def run() -> float:
+        queue = _queue(ctx, "throughput")
+        _fill(queue, image)
+        jobs = _TEXT_JOBS + _IMAGE_JOBS
+        done, finished = _drained(queue, jobs)
+        before = ctx.stub.requests
+        start = time.perf_counter()
+        queue.start()
+        done.wait(60)
+        elapsed = time.perf_counter() - start
+        ctx.extra["jobs_per_s"] = round(len(finished) / elapsed, 1)
+        ctx.extra["backend_requests"] = ctx.stub.requests - before
+        # Position of the last interactive job among all completions: low means they jumped the batch ones
+        ctx.extra["last_interactive_at"] = max(i for i, (p, _) in enumerate(finished) if p == 0)
+        queue.close()
+        return elapsed * 1000
+
+    return run
+
+
+@case("queue.recovery", repeat=3, warmup=0)
+def queue_recovery(ctx: Context):
+    config = ctx.stub.config
+    latency = config.latency_ms
+    config.latency_ms = 40
+    ctx.defer(lambda: setattr(config, "latency_ms", latency))
+    ctx.defer(lambda: setattr(config, "down", False))
+    image = synthetic_frame(800, 600)
+
+    def run() -> float:
+        queue = _queue(ctx, "recovery")
+        jobs = _TEXT_JOBS + _IMAGE_JOBS
+        done, finished = _drained(queue, jobs)
+        config.down = True
+        before = ctx.stub.connections
+        queue.start()
+        _fill(queue, image)
+        time.sleep(2.0)  # long enough to fail, back off and probe a few times
+        ctx.extra["attempts_while_down"] = ctx.stub.connections - before
+        config.down = False
+        start = time.perf_counter()
+        done.wait(60)
+        elapsed = time.perf_counter() - start
+        ctx.extra["completed"] = len(finished)
+        ctx.extra["first_result_ms"] = round((finished[0][1] - start) * 1000, 1)
+        queue.close()
+        return elapsed * 1000
+
+    return run
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from contextlib import ExitStack
+
+from benchmarks.fixtures import fake_mss, qt_app, synthetic_frame
+from benchmarks.harness import Context, case
+
+_W, _H = 5120, 2880
+
+
+def _drag(ctx: Context, magnifier: bool = False, snapping: bool = False, full_repaint: bool = False):
+    """Time one mouse move of a rubber-band drag, including the repaint it schedules."""
+    app = qt_app()
+    from PySide6.QtCore import QEvent, QPointF, QRect, QRectF, Qt
+    from PySide6.QtGui import QImage, QMouseEvent
+
+    from jp_assist_ai.adapters.capture.mac_capture import Region, grab_desktop
+    from jp_assist_ai.app.overlay.region_frame_selector import _FrameOverlay
+    from jp_assist_ai.app.overlay.selection_aids import ScreenThumbnail
+
+    stack = ExitStack()
+    stack.enter_context(fake_mss(synthetic_frame(_W, _H)))
+    ctx.defer(stack.close)
+    frame = grab_desktop()
+    frozen = QImage(frame.bgra, frame.width, frame.height, frame.width * 4, QImage.Format_RGB32)
+    thumbnail = None
+    if magnifier or snapping:
+        thumbnail = ScreenThumbnail(frame.view(Region(0, 0, _W, _H)), _W, _H)
+
+    overlay = _FrameOverlay(
+        QRect(0, 0, _W, _H),
+        frozen,
+        QRectF(0, 0, _W, _H),
+        thumbnail,
+        magnifier=magnifier,
+        snapping=snapping,
+    )
+    overlay.show()
+    app.processEvents()
+    ctx.defer(overlay.close)
+
+    def send(kind, x: float, y: float, buttons) -> None:
+        pos = QPointF(x, y)
+        app.sendEvent(overlay, QMouseEvent(kind, pos, pos, Qt.LeftButton, buttons, Qt.NoModifier))
+
+    send(QEvent.MouseButtonPress, 400, 300, Qt.LeftButton)
+    app.processEvents()
+    step = [0]
+
+    def run() -> None:
+        # Sweep a diagonal drag back and forth so every sample changes the rect
+        i = step[0] % 200
+        step[0] += 1
+        offset = i if i < 100 else 200 - i
+        send(QEvent.MouseMove, 1600 + offset * 6, 900 + offset * 3, Qt.LeftButton)
+        if full_repaint:
+            overlay.update()
+        app.processEvents()
+
+    return run
+
+
+@case("selector.move.5k", repeat=100, warmup=5)
+def move_damage(ctx: Context):
+    return _drag(ctx)
+
+
+@case("selector.move.5k.full_repaint", repeat=30, warmup=2)
+def move_full(ctx: Context):
+    return _drag(ctx, full_repaint=True)
+
+
+@case("selector.move.5k.magnifier_snapping", repeat=100, warmup=5)
+def move_aids(ctx: Context):
+    return _drag(ctx, magnifier=True, snapping=True)
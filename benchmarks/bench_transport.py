@@ -0,0 +1,150 @@
+"""
+Resilience checks for the asyncio LLM transport against the stub server.
+
+Each scenario starts its own stub with failures injected (a concurrency cap
+answered with 429, random 429s with Retry-After, a dead backend, a slow
+backend) and drives the real OpenAITranslator from many threads.
+
+    python -m benchmarks.bench_transport        # run all scenarios, exit 1 on a failed expectation
+"""
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from benchmarks.harness import Context, case
+from benchmarks.stub_llm import StubConfig, StubLLMServer
+
+
+@dataclass
+class Outcome:
+    ok: int = 0
+    errors: dict[str, int] = field(default_factory=dict)
+    elapsed_s: float = 0.0
+    backend_requests: int = 0
+    backend_throttled: int = 0
+    retries: int = 0
+    final_limit: float = 0.0
+    breaker: str = ""
+
+
+def _run(config: StubConfig, calls: int, callers: int, **transport_args) -> Outcome:
+    from jp_assist_ai.adapters.llm.openai_llm import OpenAITranslator
+    from jp_assist_ai.adapters.llm.transport import (
+        AimdLimiter,
+        AsyncTransport,
+        CircuitBreaker,
+        RetryPolicy,
+    )
+    from openai import AsyncOpenAI
+
+    outcome = Outcome()
+    lock = threading.Lock()
+    with StubLLMServer(config) as stub:
+        transport = AsyncTransport(
+            lambda: AsyncOpenAI(api_key="stub", base_url=stub.base_url, max_retries=0),
+            limiter=AimdLimiter(initial=4, maximum=32),
+            breaker=CircuitBreaker(threshold=5, cooldown=transport_args.get("cooldown", 30.0)),
+            retry=RetryPolicy(max_attempts=8, base_delay=0.05, max_delay=1.0),
+            deadline=transport_args.get("deadline", 30.0),
+        )
+        translator = OpenAITranslator(api_key="stub", transport=transport)
+
+        def one(i: int) -> None:
+            try:
+                translator.translate_text(f"テスト{i}", "JP", "VI")
+                with lock:
+                    outcome.ok += 1
+            except Exception as exc:
+                name = type(exc).__name__
+                with lock:
+                    outcome.errors[name] = outcome.errors.get(name, 0) + 1
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(callers) as pool:
+            list(pool.map(one, range(calls)))
+        outcome.elapsed_s = time.perf_counter() - start
+        outcome.backend_requests = stub.requests
+        outcome.backend_throttled = stub.throttled
+        outcome.retries = transport.retries
+        outcome.final_limit = transport.limiter.limit
+        outcome.breaker = transport.breaker.state
+        transport.close()
+    return outcome
+
+
+def scenario_concurrency_cap() -> tuple[Outcome, list[str]]:
+    # Backend allows 6 in flight and 429s the rest; the limiter should settle near 6 and lose nothing
+    out = _run(StubConfig(latency_ms=50, max_concurrency=6), calls=300, callers=32)
+    return out, _expect(out.ok == 300, "every call succeeds") + _expect(
+        out.final_limit <= 12, f"limit settles near the cap (got {out.final_limit:.1f})"
+    )
+
+
+def scenario_retry_after() -> tuple[Outcome, list[str]]:
+    out = _run(StubConfig(latency_ms=20, throttle_rate=0.3, retry_after_s=0.2), calls=100, callers=16)
+    return out, _expect(out.ok == 100, "every call succeeds despite 30% 429s") + _expect(
+        out.retries >= out.backend_throttled > 0, "each 429 was retried"
+    )
+
+
+def scenario_backend_down() -> tuple[Outcome, list[str]]:
+    out = _run(StubConfig(down=True), calls=50, callers=8, cooldown=60.0)
+    return out, _expect(out.ok == 0, "nothing succeeds") + _expect(
+        out.errors.get("CircuitOpen", 0) > 0, "breaker opens and fails the rest fast"
+    ) + _expect(out.backend_requests < 50, f"backend spared after opening ({out.backend_requests} requests)")
+
+
+def scenario_deadline() -> tuple[Outcome, list[str]]:
+    out = _run(StubConfig(latency_ms=1000), calls=8, callers=8, deadline=0.3)
+    return out, _expect(out.errors.get("DeadlineExceeded", 0) == 8, "every call hits its deadline") + _expect(
+        out.elapsed_s < 1.0, f"callers released at the deadline ({out.elapsed_s:.2f}s)"
+    )
+
+
+SCENARIOS = {
+    "concurrency_cap": scenario_concurrency_cap,
+    "retry_after": scenario_retry_after,
+    "backend_down": scenario_backend_down,
+    "deadline": scenario_deadline,
+}
+
+
+def _expect(ok: bool, what: str) -> list[str]:
+    return [] if ok else [what]
+
+
+@case("transport.throttled_429_cap", repeat=3, warmup=0)
+def throttled(ctx: Context):
+    def run() -> None:
+        out, failures = scenario_concurrency_cap()
+        ctx.extra.update(ok=out.ok, retries=out.retries, final_limit=out.final_limit)
+        if failures:
+            # A fast run that lost requests is not a result to compare against the baseline
+            raise AssertionError("; ".join(failures))
+
+    return run
+
+
+def main() -> int:
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    failed = False
+    for name, scenario in SCENARIOS.items():
+        out, failures = scenario()
+        status = "ok" if not failures else "FAIL: " + "; ".join(failures)
+        failed |= bool(failures)
+        print(
+            f"{name:<16} {status}\n"
+            f"{'':16} {out.ok} ok, errors {out.errors}, {out.elapsed_s:.2f}s, backend {out.backend_requests} "
+            f"requests ({out.backend_throttled} throttled), {out.retries} retries, "
+            f"limit {out.final_limit:.1f}, breaker {out.breaker}"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import os
+import random
+import sys
+import threading
+from contextlib import contextmanager
+from functools import cached_property
+from unittest import mock
+
+from PIL import Image, ImageDraw, ImageFont
+
+
+def qt_app():
+    from PySide6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
+
+
+def synthetic_frame(width: int, height: int, seed: int = 0, dark: bool = False) -> Image.Image:
+    """Screenshot-like frame: flat background with rows of text-sized glyph blocks."""
+    rng = random.Random(seed)
+    bg, fg = ((30, 30, 30), (220, 220, 220)) if dark else ((255, 255, 255), (20, 20, 20))
+    image = Image.new("RGB", (width, height), bg)
+    draw = ImageDraw.Draw(image)
+    line_h = 22
+    y = 12
+    while y + line_h < height:
+        x = 16
+        line_end = rng.randint(width // 3, width - 16)
+        while x < line_end:
+            w = rng.randint(10, 16)
+            draw.rectangle((x, y + 3, x + w, y + 17), fill=fg)
+            x += w + rng.randint(2, 6)
+        y += line_h + (line_h if rng.random() < 0.15 else 0)
+    return image
+
+
+_JP_FONTS = (
+    "/System/Library/Fonts/ヒラギノ角ゴシック W3.ttc",
+    "/System/Library/Fonts/Hiragino Sans GB.ttc",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/truetype/fonts-japanese-gothic.ttf",
+    "C:/Windows/Fonts/meiryo.ttc",
+)
+
+_JP_WORDS = (
+    "仕様書", "確認", "お願いします", "明日", "会議", "資料", "修正", "対応", "完了", "予定",
+    "担当者", "テスト", "環境", "リリース", "レビュー", "お疲れ様です", "よろしく", "問題", "発生", "原因",
+)
+
+
+def japanese_font(size: int):
+    """A Japanese-capable font (JP_ASSIST_BENCH_FONT or a system one), or None when there is none."""
+    for path in filter(None, (os.getenv("JP_ASSIST_BENCH_FONT"), *_JP_FONTS)):
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            continue
+    return None
+
+
+def japanese_screenshot(
+    width: int, height: int, font, seed: int = 0, dark: bool = False
+) -> tuple[Image.Image, list[str]]:
+    """UI-like page of real Japanese sentences; returns the image and its lines as ground truth."""
+    rng = random.Random(seed)
+    bg, fg = ((30, 30, 30), (220, 220, 220)) if dark else ((255, 255, 255), (20, 20, 20))
+    image = Image.new("RGB", (width, height), bg)
+    draw = ImageDraw.Draw(image)
+    line_h = int(font.size * 1.6)
+    lines: list[str] = []
+    y = 16
+    while y + line_h < height:
+        text = ""
+        while True:
+            candidate = text + rng.choice(_JP_WORDS) + rng.choice(("", "、", "。"))
+            if draw.textlength(candidate, font=font) > width - 48:
+                break
+            text = candidate
+            if rng.random() < 0.12:
+                break
+        draw.text((24, y), text, font=font, fill=fg)
+        lines.append(text)
+        y += line_h + (line_h if rng.random() < 0.15 else 0)
+    return image, lines
+
+
+def current_rss() -> int:
+    """Resident set size in bytes (Linux); elsewhere the process peak so far, which is all getrusage offers."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RssSampler:
+    """Peak RSS above the starting level while the block runs, sampled every millisecond."""
+
+    def __init__(self, interval: float = 0.001):
+        self._interval = interval
+        self._stop = threading.Event()
+        self.baseline = 0
+        self.peak = 0
+
+    @property
+    def peak_delta_mb(self) -> float:
+        return (self.peak - self.baseline) / 2**20
+
+    def __enter__(self) -> RssSampler:
+        self.baseline = self.peak = current_rss()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.peak = max(self.peak, current_rss())
+
+
+class _FakeShot:
+    def __init__(self, image: Image.Image):
+        self.size = image.size
+        self.rgb = image.tobytes()
+        self._image = image
+
+    @cached_property
+    def raw(self) -> bytearray:
+        # mss hands out BGRA
+        r, g, b = self._image.split()
+        alpha = Image.new("L", self.size, 255)
+        return bytearray(Image.merge("RGBA", (b, g, r, alpha)).tobytes())
+
+
+class FakeScreen:
+    """Replaces mss.mss() with a grab over an in-memory desktop image."""
+
+    def __init__(self, frame: Image.Image):
+        self._frame = frame
+        self._cache: dict[tuple[int, int, int, int], _FakeShot] = {}
+        self.monitors = [
+            {"left": 0, "top": 0, "width": frame.width, "height": frame.height},
+            {"left": 0, "top": 0, "width": frame.width, "height": frame.height},
+        ]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+    def grab(self, monitor: dict) -> _FakeShot:
+        box = (
+            monitor["left"],
+            monitor["top"],
+            monitor["left"] + monitor["width"],
+            monitor["top"] + monitor["height"],
+        )
+        # The real grab is a memcpy from the compositor; keep the fake out of the timing
+        shot = self._cache.get(box)
+        if shot is None:
+            shot = self._cache[box] = _FakeShot(self._frame.crop(box))
+        return shot
+
+
+@contextmanager
+def fake_mss(frame: Image.Image):
+    from jp_assist_ai.adapters.capture import mac_capture
+
+    screen = FakeScreen(frame)
+    with mock.patch.object(mac_capture.mss, "mss", lambda *a, **k: screen):
+        yield
+
+
+def reset_services() -> None:
+    from jp_assist_ai.services import translate_service
+
+    # Queue first: its drainer may be using the worker
+    for name in ("get_job_queue", "get_worker"):
+        cache = getattr(translate_service, name, None)
+        if cache is not None and cache.cache_info().currsize:
+            service = cache()
+            if service is not None:
+                service.close()
+    names = (
+        "get_translator",
+        "get_store",
+        "get_ocr_engine",
+        "get_screen_translator",
+        "get_clipboard_translator",
+        "get_worker",
+        "get_job_queue",
+        "get_capture_index",
+        "get_history_search",
+    )
+    for name in names:
+        fn = getattr(translate_service, name, None)
+        if fn is not None and hasattr(fn, "cache_clear"):
+            fn.cache_clear()
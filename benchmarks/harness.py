@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable
+
+from benchmarks.stub_llm import StubConfig, StubLLMServer
+
+
+class Skip(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    fn: Callable[[Context], Callable[[], object]]
+    repeat: int
+    warmup: int
+
+
+_CASES: list[Case] = []
+
+
+def case(name: str, repeat: int = 20, warmup: int = 2):
+    """
+    Register a benchmark. The function does its setup and returns the callable to time.
+    A callable that returns a number reports its own sample in ms, for cases
+    whose per-sample setup must stay out of the timing.
+    """
+
+    def decorator(fn):
+        _CASES.append(Case(name=name, fn=fn, repeat=repeat, warmup=warmup))
+        return fn
+
+    return decorator
+
+
+def cases() -> list[Case]:
+    return list(_CASES)
+
+
+@dataclass
+class Context:
+    workdir: str
+    stub: StubLLMServer
+    extra: dict = field(default_factory=dict)
+    _cleanups: list[Callable[[], None]] = field(default_factory=list)
+    _teardown: list[Callable[[], None]] = field(default_factory=list)
+
+    def defer(self, fn: Callable[[], None]) -> None:
+        """Run fn after the current case."""
+        self._cleanups.append(fn)
+
+    def close_case(self) -> None:
+        _drain(self._cleanups)
+
+    def close(self) -> None:
+        _drain(self._cleanups)
+        _drain(self._teardown)
+
+
+def _drain(callbacks: list[Callable[[], None]]) -> None:
+    while callbacks:
+        try:
+            callbacks.pop()()
+        except Exception:
+            pass
+
+
+def open_context() -> Context:
+    workdir = tempfile.mkdtemp(prefix="jp-assist-bench-")
+    stub = StubLLMServer(StubConfig()).start()
+    # Everything that reads configuration from the environment points at local fakes
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ["OPENAI_BASE_URL"] = stub.base_url
+    os.environ["JP_ASSIST_DATA_DIR"] = os.path.join(workdir, "data")
+    # Cases time the pipeline in this process unless they ask for the worker process
+    os.environ.setdefault("JP_ASSIST_WORKER_PROCESS", "0")
+    # ...and translate every capture, rather than answering repeats from history
+    os.environ.setdefault("JP_ASSIST_NEAR_DUPLICATES", "0")
+    ctx = Context(workdir=workdir, stub=stub)
+    ctx._teardown.append(stub.stop)
+    return ctx
+
+
+def run_case(item: Case, ctx: Context, repeat: int | None = None) -> dict:
+    ctx.extra = {}
+    fn = item.fn(ctx)
+    for _ in range(item.warmup):
+        fn()
+    samples: list[float] = []
+    for _ in range(repeat or item.repeat):
+        start = time.perf_counter()
+        own = fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        samples.append(float(own) if isinstance(own, (int, float)) and not isinstance(own, bool) else elapsed)
+    samples.sort()
+    result = {
+        "repeat": len(samples),
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": _percentile(samples, 50),
+        "p95_ms": _percentile(samples, 95),
+        "min_ms": samples[0],
+        "max_ms": samples[-1],
+    }
+    result.update(ctx.extra)
+    return result
+
+
+def _percentile(values: list[float], pct: int) -> float:
+    index = max(0, min(len(values) - 1, -(-pct * len(values) // 100) - 1))
+    return values[index]
+
+
+def metadata() -> dict:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[dict]:
+    """p50 ratios against the baseline; a ratio above 1 + threshold is a regression."""
+    rows: list[dict] = []
+    for name, result in sorted(current.get("results", {}).items()):
+        base = baseline.get("results", {}).get(name)
+        if not base or "p50_ms" not in result or not base.get("p50_ms"):
+            continue
+        ratio = result["p50_ms"] / base["p50_ms"]
+        rows.append(
+            {
+                "name": name,
+                "baseline_p50_ms": base["p50_ms"],
+                "p50_ms": result["p50_ms"],
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold,
+            }
+        )
+    return rows
+
+
+def load_json(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_json(path: str, data: dict) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
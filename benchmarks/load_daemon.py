@@ -0,0 +1,135 @@
+"""
+Load test for the headless daemon against the stub LLM backend.
+
+Starts the stub and a daemon in this process, then hammers
+/v1/translate/text from keep-alive client threads and reports
+throughput, latency percentiles and how many requests were refused.
+
+    python -m benchmarks.load_daemon
+    python -m benchmarks.load_daemon --clients 64 --concurrency 8 --max-queue 16
+    python -m benchmarks.load_daemon --unix --latency-ms 50 --duration 20
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.harness import _percentile
+from benchmarks.stub_llm import StubConfig, StubLLMServer
+
+
+def _client(url: str, stop_at: float, unique: bool, offset: int, out: list, lock: threading.Lock) -> None:
+    from jp_assist_ai.cli.daemon import connect
+
+    conn = connect(url)
+    samples: list[tuple[int, float]] = []
+    i = 0
+    while time.perf_counter() < stop_at:
+        text = f"仕様書の{offset}-{i}行目を確認してください。" if unique else "仕様書を確認してください。"
+        body = json.dumps({"text": text, "src": "JP", "dst": "VI"}).encode("utf-8")
+        start = time.perf_counter()
+        try:
+            conn.request("POST", "/v1/translate/text", body, {"Content-Type": "application/json"})
+            resp = conn.getresponse()
+            resp.read()
+            status = resp.status
+        except OSError:
+            conn.close()
+            conn = connect(url)
+            status = 0
+        samples.append((status, (time.perf_counter() - start) * 1000))
+        if status in (0, 503):
+            time.sleep(0.05)  # a well-behaved client backs off when refused
+        i += 1
+    conn.close()
+    with lock:
+        out.extend(samples)
+
+
+def run(args: argparse.Namespace) -> dict:
+    workdir = tempfile.mkdtemp(prefix="jp-assist-load-")
+    stub = StubLLMServer(StubConfig(latency_ms=args.latency_ms, jitter_ms=args.latency_ms / 5)).start()
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ["OPENAI_BASE_URL"] = stub.base_url
+    os.environ["JP_ASSIST_DATA_DIR"] = os.path.join(workdir, "data")
+
+    from jp_assist_ai.cli.daemon import TranslateDaemon
+
+    listen = f"unix:{os.path.join(workdir, 'daemon.sock')}" if args.unix else "127.0.0.1:0"
+    daemon = TranslateDaemon(listen, args.concurrency, args.max_queue, args.timeout).start()
+    samples: list[tuple[int, float]] = []
+    lock = threading.Lock()
+    try:
+        stop_at = time.perf_counter() + args.duration
+        threads = [
+            threading.Thread(target=_client, args=(daemon.url, stop_at, not args.repeat_text, n, samples, lock))
+            for n in range(args.clients)
+        ]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+        health = daemon.queue.stats()
+    finally:
+        daemon.stop()
+        stub.stop()
+
+    ok = sorted(ms for status, ms in samples if status == 200)
+    by_status: dict[str, int] = {}
+    for status, _ in samples:
+        by_status[str(status)] = by_status.get(str(status), 0) + 1
+    return {
+        "transport": "unix" if args.unix else "tcp",
+        "clients": args.clients,
+        "concurrency": args.concurrency,
+        "max_queue": args.max_queue,
+        "backend_latency_ms": args.latency_ms,
+        "duration_s": elapsed,
+        "requests": len(samples),
+        "ok_per_s": len(ok) / elapsed if elapsed else 0.0,
+        "status": by_status,
+        "p50_ms": _percentile(ok, 50) if ok else None,
+        "p99_ms": _percentile(ok, 99) if ok else None,
+        "max_ms": ok[-1] if ok else None,
+        "backend_requests": stub.requests,
+        "rejected": health["rejected"],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=8, help="daemon --concurrency")
+    parser.add_argument("--max-queue", type=int, default=32, help="daemon --max-queue")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="stub backend latency")
+    parser.add_argument("--unix", action="store_true", help="serve on a Unix socket instead of TCP")
+    parser.add_argument("--repeat-text", action="store_true", help="send the same text (measures the cache path)")
+    parser.add_argument("--json", action="store_true", help="print the raw result")
+    args = parser.parse_args(argv)
+
+    result = run(args)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+    print(
+        f"{result['transport']}: {result['clients']} clients, concurrency {result['concurrency']}, "
+        f"queue {result['max_queue']}, backend {result['backend_latency_ms']:.0f} ms"
+    )
+    print(f"  {result['ok_per_s']:.1f} req/s ok over {result['duration_s']:.1f}s ({result['requests']} sent)")
+    if result["p50_ms"] is not None:
+        print(f"  latency p50 {result['p50_ms']:.1f} ms  p99 {result['p99_ms']:.1f} ms  max {result['max_ms']:.1f} ms")
+    print(f"  status {result['status']}  backend calls {result['backend_requests']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
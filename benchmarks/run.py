@@ -0,0 +1,105 @@
+"""
+Run the hot-path benchmarks headless and compare them with a stored baseline.
+
+    python -m benchmarks.run                       # run all, write benchmarks/results.json
+    python -m benchmarks.run -k capture            # only cases whose name contains "capture"
+    python -m benchmarks.run --save-baseline       # accept the current numbers
+    python -m benchmarks.run --fail-on-regression  # exit 1 if a p50 regressed past --threshold
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+# Must be set before anything imports Qt
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from benchmarks import (  # noqa: E402,F401
+    bench_capture,
+    bench_history_archive,
+    bench_history_search,
+    bench_llm,
+    bench_near_duplicate,
+    bench_ocr,
+    bench_overlay,
+    bench_pipeline,
+    bench_queue,
+    bench_selector,
+    bench_transport,
+    startup,
+)
+from benchmarks.harness import (  # noqa: E402
+    Skip,
+    cases,
+    compare,
+    load_json,
+    metadata,
+    open_context,
+    run_case,
+    save_json,
+)
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", "--filter", default="", help="substring of case names to run")
+    parser.add_argument("--repeat", type=int, default=None, help="override per-case repeat count")
+    parser.add_argument("--out", default=os.path.join(_HERE, "results.json"))
+    parser.add_argument("--baseline", default=os.path.join(_HERE, "baseline.json"))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed p50 slowdown, 0.10 = 10%%")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    from jp_assist_ai.config.logging import disable_tracing, enable_tracing, stage_stats
+
+    ctx = open_context()
+    enable_tracing(os.path.join(ctx.workdir, "trace.jsonl"))
+    results: dict[str, dict] = {}
+    skipped: dict[str, str] = {}
+    try:
+        for item in cases():
+            if args.filter and args.filter not in item.name:
+                continue
+            try:
+                results[item.name] = run_case(item, ctx, args.repeat)
+            except Skip as exc:
+                skipped[item.name] = str(exc)
+                print(f"{item.name:<40} skipped: {exc}")
+                continue
+            finally:
+                ctx.close_case()
+            r = results[item.name]
+            print(f"{item.name:<40} p50 {r['p50_ms']:9.2f} ms   p95 {r['p95_ms']:9.2f} ms   n={r['repeat']}")
+        stages = {name: vars(s) for name, s in stage_stats().items()}
+    finally:
+        disable_tracing()
+        ctx.close()
+
+    report = {"meta": metadata(), "results": results, "skipped": skipped, "stages": stages}
+    save_json(args.out, report)
+    print(f"\nWrote {args.out}")
+
+    if args.save_baseline:
+        save_json(args.baseline, report)
+        print(f"Saved baseline {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        return 0
+
+    rows = compare(report, load_json(args.baseline), args.threshold)
+    if rows:
+        print(f"\nCompared with {args.baseline} (threshold {args.threshold:.0%}):")
+    for row in rows:
+        flag = "  REGRESSION" if row["regression"] else ""
+        print(f"{row['name']:<40} {row['baseline_p50_ms']:9.2f} -> {row['p50_ms']:9.2f} ms  x{row['ratio']:.2f}{flag}")
+    if args.fail_on_regression and any(row["regression"] for row in rows):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Cold-start benchmark: time from interpreter launch to a visible tray icon.
+
+Each run starts a fresh interpreter with `-X importtime`, builds the TrayApp,
+calls show() and exits. The parent measures wall time, parses the import log
+for the slowest modules and checks that none of the heavy modules (loaded in
+the background warm-up instead) were imported on the startup path.
+
+    python -m benchmarks.startup --budget-ms 800
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.harness import Context, case
+
+HEAVY_MODULES = ("openai", "PIL", "PIL.ImageQt", "jinja2", "numpy", "mss", "paddleocr")
+
+_CHILD = """
+import json, sys
+from PySide6.QtWidgets import QApplication, QMessageBox
+QMessageBox.warning = staticmethod(lambda *a, **k: None)  # no modal hotkey warnings headless
+app = QApplication([])
+from jp_assist_ai.app.tray import TrayApp
+TrayApp().show()
+print("TRAY_READY " + json.dumps([m for m in {heavy!r} if m in sys.modules]), flush=True)
+"""
+
+
+def measure_once() -> dict:
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    env["JP_ASSIST_WARM_UP"] = "0"
+    env.setdefault("JP_ASSIST_DATA_DIR", tempfile.mkdtemp(prefix="jp-assist-startup-"))
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD.format(heavy=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=60,
+    )
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    ready = [line for line in proc.stdout.splitlines() if line.startswith("TRAY_READY ")]
+    if proc.returncode != 0 or not ready:
+        raise RuntimeError(f"Startup probe failed:\n{proc.stderr[-2000:]}")
+    return {
+        "time_to_tray_ms": elapsed_ms,
+        "heavy_loaded": json.loads(ready[0].split(" ", 1)[1]),
+        "slowest_imports": _slowest_imports(proc.stderr),
+    }
+
+
+def _slowest_imports(log: str, top: int = 10) -> list[tuple[str, float]]:
+    # "import time: self [us] | cumulative | imported package", nested names are indented
+    rows: list[tuple[str, float]] = []
+    for line in log.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        name = parts[2].rstrip()
+        if name.startswith("  "):
+            continue  # only top-level imports; their cumulative time includes children
+        rows.append((name.strip(), int(parts[1]) / 1000))
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return rows[:top]
+
+
+def measure(runs: int = 5) -> dict:
+    samples = [measure_once() for _ in range(runs)]
+    times = sorted(s["time_to_tray_ms"] for s in samples)
+    return {
+        "runs": runs,
+        "p50_ms": statistics.median(times),
+        "min_ms": times[0],
+        "max_ms": times[-1],
+        "heavy_loaded": sorted({m for s in samples for m in s["heavy_loaded"]}),
+        "slowest_imports": samples[-1]["slowest_imports"],
+    }
+
+
+@case("startup.time_to_tray", repeat=3, warmup=1)
+def time_to_tray(ctx: Context):
+    def run() -> None:
+        result = measure_once()
+        ctx.extra["heavy_loaded"] = result["heavy_loaded"]
+
+    return run
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=float(os.getenv("JP_ASSIST_STARTUP_BUDGET_MS", "1000")),
+    )
+    args = parser.parse_args(argv)
+
+    result = measure(args.runs)
+    print(f"time to tray icon: p50 {result['p50_ms']:.0f} ms (min {result['min_ms']:.0f}, max {result['max_ms']:.0f})")
+    print("slowest top-level imports:")
+    for name, ms in result["slowest_imports"]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    ok = True
+    if result["heavy_loaded"]:
+        print(f"FAIL: heavy modules imported before the tray icon: {', '.join(result['heavy_loaded'])}")
+        ok = False
+    if result["p50_ms"] > args.budget_ms:
+        print(f"FAIL: p50 {result['p50_ms']:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+        ok = False
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
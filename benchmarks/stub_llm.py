@@ -0,0 +1,198 @@
+"""
+Local stand-in for the OpenAI Responses API.
+
+Answers POST /v1/responses with a fixed translation after an optional delay
+(GET /v1/models too, for connection warm-ups) and can inject failures (HTTP 429 with Retry-After, 5xx, dropped connections) so the
+benchmarks and load tests never touch the network.
+"""
+from __future__ import annotations
+
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+_NUMBERED = re.compile(r"^\[(\d+)\] (.*)$", re.MULTILINE)
+
+
+@dataclass
+class StubConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    reply: str = "[stub] translated text"
+    throttle_rate: float = 0.0  # share of requests answered with 429
+    retry_after_s: float = 0.0
+    error_rate: float = 0.0  # share of requests answered with 500
+    down: bool = False  # drop every connection, as if the backend were unreachable
+    max_concurrency: int = 0  # above this many in-flight requests answer 429; 0 = unlimited
+    connect_ms: float = 0.0  # delay on each new connection, standing in for TCP + TLS setup to a remote host
+
+
+class StubLLMServer:
+    def __init__(self, config: StubConfig | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StubConfig()
+        self.requests = 0
+        self.throttled = 0
+        self.connections = 0
+        self._inflight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> StubLLMServer:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> StubLLMServer:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *_args) -> None:
+                return None
+
+            def setup(self) -> None:
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+                if stub.config.connect_ms:
+                    time.sleep(stub.config.connect_ms / 1000)
+
+            def do_GET(self) -> None:
+                if self.path.rstrip("/").endswith("/models"):
+                    model = {"id": "stub", "object": "model", "created": 0, "owned_by": "stub"}
+                    stub._reply(self, 200, {"object": "list", "data": [model]})
+                else:
+                    stub._reply(self, 404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                stub._serve(self, body)
+
+        return Handler
+
+    def _serve(self, handler: BaseHTTPRequestHandler, body: bytes) -> None:
+        config = self.config
+        with self._lock:
+            self.requests += 1
+            self._inflight += 1
+            overloaded = config.max_concurrency and self._inflight > config.max_concurrency
+        try:
+            if config.down:
+                handler.close_connection = True
+                handler.connection.close()
+                return
+            if overloaded or random.random() < config.throttle_rate:
+                with self._lock:
+                    self.throttled += 1
+                headers = {"Retry-After": f"{config.retry_after_s:g}"} if config.retry_after_s else {}
+                self._reply(handler, 429, {"error": {"message": "Rate limit", "type": "rate_limit"}}, headers)
+                return
+            if random.random() < config.error_rate:
+                self._reply(handler, 500, {"error": {"message": "Injected failure", "type": "server_error"}})
+                return
+            delay = config.latency_ms + random.uniform(0, config.jitter_ms)
+            if delay > 0:
+                time.sleep(delay / 1000)
+            self._reply(handler, 200, _response(_reply_text(config.reply, body), len(body)))
+        finally:
+            with self._lock:
+                self._inflight -= 1
+
+    @staticmethod
+    def _reply(handler: BaseHTTPRequestHandler, status: int, payload: dict, headers: dict | None = None) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+
+def _reply_text(reply: str, body: bytes) -> str:
+    """The fixed reply, once per item when the input is a numbered batch ("[1] ...", "[2] ...")."""
+    try:
+        messages = json.loads(body).get("input") or []
+    except ValueError:
+        return reply
+    numbered = []
+    for message in messages:
+        content = message.get("content") if isinstance(message, dict) else None
+        for part in content if isinstance(content, list) else ():
+            if part.get("type") == "input_text":
+                numbered += _NUMBERED.findall(part.get("text", ""))
+    if not numbered:
+        return reply
+    return "\n".join(f"[{n}] {reply}: {source}" for n, source in numbered)
+
+
+def _response(text: str, request_bytes: int) -> dict:
+    input_tokens = max(1, request_bytes // 4)
+    output_tokens = max(1, len(text) // 2)
+    return {
+        "id": "resp_stub",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": "stub",
+        "status": "completed",
+        "output": [
+            {
+                "type": "message",
+                "id": "msg_stub",
+                "status": "completed",
+                "role": "assistant",
+                "content": [{"type": "output_text", "text": text, "annotations": []}],
+            }
+        ],
+        "usage": {
+            "input_tokens": input_tokens,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens": output_tokens,
+            "output_tokens_details": {"reasoning_tokens": 0},
+            "total_tokens": input_tokens + output_tokens,
+        },
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the stub LLM server in the foreground.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = StubLLMServer(StubConfig(latency_ms=args.latency_ms, throttle_rate=args.throttle_rate), port=args.port)
+    print(f"Stub LLM listening on {server.base_url}")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
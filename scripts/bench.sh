@@ -0,0 +1,3 @@
+#!/usr/bin/env bash
+set -euo pipefail
+QT_QPA_PLATFORM=offscreen python -m benchmarks.run "$@"
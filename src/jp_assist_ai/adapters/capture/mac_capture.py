@@ -3,6 +3,10 @@ from __future__ import annotations
 from dataclasses import dataclass
 from PIL import Image
 import mss
+import numpy as np
+
+from jp_assist_ai.config.logging import span
+from jp_assist_ai.core.frames import FrameView, MemoryBudget
 
 
 @dataclass(frozen=True)
@@ -36,5 +40,56 @@ def capture_region(region: Region) -> Image.Image:
         y2 = _clip(y2, top0 + 1, bot0)
 
         monitor = {"left": x1, "top": y1, "width": x2 - x1, "height": y2 - y1}
-        shot = sct.grab(monitor)
-        return Image.frombytes("RGB", shot.size, shot.rgb)
+        with span("capture.grab", width=monitor["width"], height=monitor["height"]):
+            shot = sct.grab(monitor)
+        with span("capture.to_pil"):
+            return Image.frombytes("RGB", shot.size, shot.rgb)
+
+
+class FrozenFrame:
+    """
+    One grab of the whole virtual desktop, taken when the hotkey fires.
+    Regions are cut out of this buffer instead of grabbing the screen again.
+    """
+
+    def __init__(self, bgra: bytearray | bytes, size: tuple[int, int], bounds: Region):
+        self.bgra = bgra
+        self.width, self.height = size
+        self.bounds = bounds  # desktop geometry in screen coordinates
+        self._pixels = np.frombuffer(bgra, dtype=np.uint8).reshape(self.height, self.width, 4)
+
+    @property
+    def scale(self) -> tuple[float, float]:
+        # Retina displays grab more pixels than screen points
+        return self.width / max(1, self.bounds.w), self.height / max(1, self.bounds.h)
+
+    def pixel_box(self, region: Region) -> tuple[int, int, int, int]:
+        sx, sy = self.scale
+        x1 = _clip(int((region.x - self.bounds.x) * sx), 0, self.width - 1)
+        y1 = _clip(int((region.y - self.bounds.y) * sy), 0, self.height - 1)
+        x2 = _clip(int((region.x + region.w - self.bounds.x) * sx), x1 + 1, self.width)
+        y2 = _clip(int((region.y + region.h - self.bounds.y) * sy), y1 + 1, self.height)
+        return x1, y1, x2, y2
+
+    def view(self, region: Region) -> np.ndarray:
+        """Zero-copy BGRA view of the region."""
+        x1, y1, x2, y2 = self.pixel_box(region)
+        return self._pixels[y1:y2, x1:x2]
+
+    def crop(self, region: Region) -> Image.Image:
+        # BGRA -> RGB as a strided view; the only copy is the region itself
+        rgb = self.view(region)[:, :, 2::-1]
+        return Image.fromarray(np.ascontiguousarray(rgb), "RGB")
+
+    def crop_view(self, region: Region, budget: MemoryBudget | None = None) -> FrameView:
+        """The region as a shareable RGBA frame; copying the region out is the only copy."""
+        return FrameView.from_bgra(self.view(region), budget)
+
+
+def grab_desktop() -> FrozenFrame:
+    with mss.mss() as sct:
+        desktop = sct.monitors[0]
+        with span("capture.grab_desktop", width=desktop["width"], height=desktop["height"]):
+            shot = sct.grab(desktop)
+        bounds = Region(desktop["left"], desktop["top"], desktop["width"], desktop["height"])
+        return FrozenFrame(shot.raw, shot.size, bounds)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from PIL import Image
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QImage
+from PySide6.QtPdf import QPdfDocument
+
+
+def _open(path: str) -> QPdfDocument:
+    # QtPdf (pdfium) ships with PySide6 and needs no QApplication, so it works in worker processes
+    doc = QPdfDocument(None)
+    err = doc.load(path)
+    if err != QPdfDocument.Error.None_:
+        raise ValueError(f"Cannot open PDF {path}: {err.name}")
+    return doc
+
+
+def page_count(path: str) -> int:
+    doc = _open(path)
+    try:
+        return doc.pageCount()
+    finally:
+        doc.close()
+
+
+def render_page(path: str, index: int, dpi: int = 200) -> Image.Image:
+    doc = _open(path)
+    try:
+        points = doc.pagePointSize(index)
+        size = QSize(round(points.width() * dpi / 72), round(points.height() * dpi / 72))
+        page = doc.render(index, size)
+    finally:
+        doc.close()
+    page = page.convertToFormat(QImage.Format_ARGB32)
+    rgba = Image.frombuffer(
+        "RGBA", (page.width(), page.height()), bytes(page.constBits()), "raw", "BGRA", page.bytesPerLine(), 1
+    )
+    # Pages without a background render transparent; flatten onto white
+    background = Image.new("RGB", rgba.size, (255, 255, 255))
+    background.paste(rgba, mask=rgba.getchannel("A"))
+    return background
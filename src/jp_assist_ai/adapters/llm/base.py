@@ -1,10 +1,101 @@
 from __future__ import annotations
 
+import logging
+import re
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
 from PIL import Image
 
+_NUMBERED = re.compile(r"^\s*\[?(\d+)[\].:)]\s?(.*)$")
+_log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PromptUsage:
+    prompt_version: str
+    input_tokens: int
+    cached_tokens: int
+    output_tokens: int
+
+    @property
+    def fresh_tokens(self) -> int:
+        return max(0, self.input_tokens - self.cached_tokens)
+
 
 class Translator(ABC):
+    def __init__(self):
+        self._usage_listeners: list[Callable[[PromptUsage], None]] = []
+
+    def add_usage_listener(self, listener: Callable[[PromptUsage], None]) -> None:
+        self._usage_listeners.append(listener)
+
+    def _report_usage(self, usage: PromptUsage) -> None:
+        _log.debug(
+            "%s: %d prompt tokens (%d cached, %d fresh), %d output tokens",
+            usage.prompt_version,
+            usage.input_tokens,
+            usage.cached_tokens,
+            usage.fresh_tokens,
+            usage.output_tokens,
+        )
+        for listener in self._usage_listeners:
+            listener(usage)
+
     @abstractmethod
     def translate_image(self, image: Image.Image, src_lang: str, dst_lang: str) -> str:
         raise NotImplementedError
+
+    @abstractmethod
+    def translate_text(self, text: str, src_lang: str, dst_lang: str) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def rewrite_text(self, text: str, style: str, context: str = "") -> str:
+        raise NotImplementedError
+
+    def warm_up(self) -> None:
+        """Open connections ahead of the first request. Best effort; the default has nothing to prepare."""
+        return None
+
+    def translate_lines(self, lines: Sequence[str], src_lang: str, dst_lang: str) -> list[str]:
+        if not lines:
+            return []
+        if len(lines) == 1:
+            return [self.translate_text(lines[0], src_lang, dst_lang)]
+
+        numbered = "\n".join(f"[{i}] {line}" for i, line in enumerate(lines, start=1))
+        output = self.translate_text(numbered, src_lang, dst_lang)
+        parsed = _parse_numbered(output, len(lines))
+        # Models occasionally merge or drop lines; fall back for the gaps only
+        return [
+            text if text is not None else self.translate_text(lines[i], src_lang, dst_lang)
+            for i, text in enumerate(parsed)
+        ]
+
+
+def _parse_numbered(output: str, count: int) -> list[str | None]:
+    result: list[str | None] = [None] * count
+    current: int | None = None  # item that unnumbered lines continue
+    for raw in output.splitlines():
+        match = _NUMBERED.match(raw)
+        if not match:
+            # The model wrapped a long item onto the next line; text before the first item is preamble
+            text = raw.strip()
+            if text and current is not None:
+                result[current] = _join_wrapped(result[current], text)
+            continue
+        index = int(match.group(1)) - 1
+        current = None
+        if 0 <= index < count and result[index] is None:
+            result[index] = match.group(2).strip()
+            current = index
+    return result
+
+
+def _join_wrapped(head: str, tail: str) -> str:
+    # CJK text has no spaces between words; anything else was broken at one
+    if not head or (ord(head[-1]) >= 0x3000 and ord(tail[0]) >= 0x3000):
+        return head + tail
+    return f"{head} {tail}"
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Sequence, TypeVar
+
+from PIL import Image
+
+from jp_assist_ai.adapters.llm.base import Translator
+from jp_assist_ai.config.logging import span
+from jp_assist_ai.core.budget import BudgetExceeded
+
+T = TypeVar("T")
+
+# Hashing a full desktop capture costs more than the odds of a duplicate are worth
+_MAX_KEYED_PIXELS = 4_000_000
+
+
+@dataclass
+class _Batch:
+    lines: list[str] = field(default_factory=list)
+    requests: list[tuple[int, int, Future]] = field(default_factory=list)  # (start, count, future)
+    chars: int = 0
+    closed: bool = False
+
+
+class CoalescingTranslator(Translator):
+    """
+    Cuts the number of model calls made by many small concurrent requests.
+
+    Single-flight: a request identical to one already in flight waits for
+    that call's result instead of making its own.
+
+    Micro-batching: short single-line texts (and small translate_lines
+    calls) for the same language pair are merged into one numbered
+    translate_lines call and split back per caller. Like Nagle's
+    algorithm, a request goes out at once when nothing else is in flight;
+    only while another call is outstanding does it wait up to `window`
+    seconds for company.
+    """
+
+    def __init__(
+        self,
+        inner: Translator,
+        window: float = 0.01,
+        max_items: int = 16,
+        max_chars: int = 2000,
+    ):
+        super().__init__()
+        self._inner = inner
+        self._window = window
+        self._max_items = max_items
+        self._max_chars = max_chars
+        self._inflight: dict[tuple, Future] = {}
+        self._batches: dict[tuple[str, str], _Batch] = {}
+        self._active = 0
+        self._cond = threading.Condition()
+        self.shared = 0  # requests answered by another caller's call
+        self.batched = 0  # requests that rode in a batch with others
+        self.calls = 0  # calls made to the inner translator
+        inner.add_usage_listener(self._report_usage)
+
+    @property
+    def inner(self) -> Translator:
+        return self._inner
+
+    def warm_up(self) -> None:
+        self._inner.warm_up()
+
+    def translate_text(self, text: str, src_lang: str, dst_lang: str) -> str:
+        key = ("text", src_lang, dst_lang, text)
+        if self._batchable((text,)):
+            return self._single_flight(key, lambda: self._batched((text,), src_lang, dst_lang)[0])
+        return self._single_flight(key, lambda: self._call(self._inner.translate_text, text, src_lang, dst_lang))
+
+    def translate_lines(self, lines: Sequence[str], src_lang: str, dst_lang: str) -> list[str]:
+        if not lines:
+            return []
+        lines = tuple(lines)
+        key = ("lines", src_lang, dst_lang, lines)
+        if self._batchable(lines):
+            return self._single_flight(key, lambda: self._batched(lines, src_lang, dst_lang))
+        return self._single_flight(key, lambda: self._call(self._inner.translate_lines, lines, src_lang, dst_lang))
+
+    def translate_image(self, image: Image.Image, src_lang: str, dst_lang: str) -> str:
+        if image.width * image.height > _MAX_KEYED_PIXELS:
+            return self._call(self._inner.translate_image, image, src_lang, dst_lang)
+        digest = hashlib.blake2b(image.tobytes(), digest_size=16).digest()
+        key = ("image", src_lang, dst_lang, image.mode, image.size, digest)
+        return self._single_flight(key, lambda: self._call(self._inner.translate_image, image, src_lang, dst_lang))
+
+    def rewrite_text(self, text: str, style: str, context: str = "") -> str:
+        key = ("rewrite", style, context, text)
+        return self._single_flight(key, lambda: self._call(self._inner.rewrite_text, text, style, context))
+
+    def _batchable(self, lines: Sequence[str]) -> bool:
+        # Numbered batching needs one line per item; a text with newlines goes on its own
+        return (
+            self._window > 0
+            and len(lines) < self._max_items
+            and sum(len(line) for line in lines) < self._max_chars
+            and not any("\n" in line for line in lines)
+        )
+
+    def _single_flight(self, key: tuple, fn: Callable[[], T]) -> T:
+        with self._cond:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+            else:
+                self.shared += 1
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._cond:
+                self._inflight.pop(key, None)
+
+    def _batched(self, lines: tuple[str, ...], src_lang: str, dst_lang: str) -> list[str]:
+        scope = (src_lang, dst_lang)
+        future: Future = Future()
+        chars = sum(len(line) for line in lines)
+        with self._cond:
+            batch = self._batches.get(scope)
+            leader = (
+                batch is None
+                or batch.closed
+                or len(batch.lines) + len(lines) > self._max_items
+                or batch.chars + chars > self._max_chars
+            )
+            if leader:
+                batch = self._batches[scope] = _Batch()
+            batch.requests.append((len(batch.lines), len(lines), future))
+            batch.lines.extend(lines)
+            batch.chars += chars
+            if self._full(batch):
+                self._cond.notify_all()
+        if leader:
+            self._lead(scope, batch)
+        return future.result()
+
+    def _full(self, batch: _Batch) -> bool:
+        return len(batch.lines) >= self._max_items or batch.chars >= self._max_chars
+
+    def _lead(self, scope: tuple[str, str], batch: _Batch) -> None:
+        with self._cond:
+            # Nothing outstanding: nobody is queueing behind us, so waiting would only add latency
+            if self._active:
+                deadline = time.monotonic() + self._window
+                while not self._full(batch) and (remaining := deadline - time.monotonic()) > 0:
+                    self._cond.wait(remaining)
+            batch.closed = True
+            if self._batches.get(scope) is batch:
+                del self._batches[scope]
+            if len(batch.requests) > 1:
+                self.batched += len(batch.requests)
+
+        src_lang, dst_lang = scope
+        try:
+            with span("llm.batch", requests=len(batch.requests), lines=len(batch.lines)):
+                results = self._call(self._inner.translate_lines, batch.lines, src_lang, dst_lang)
+        except BudgetExceeded as exc:
+            if len(batch.requests) == 1:
+                self._fail(batch, exc)
+                return
+            # Merged, the batch can be over a per-request budget that each part fits in
+            for start, count, future in batch.requests:
+                try:
+                    part = self._call(self._inner.translate_lines, batch.lines[start : start + count], src_lang, dst_lang)
+                except BaseException as exc:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(part)
+            return
+        except BaseException as exc:
+            self._fail(batch, exc)
+            return
+        for start, count, future in batch.requests:
+            future.set_result(results[start : start + count])
+
+    @staticmethod
+    def _fail(batch: _Batch, exc: BaseException) -> None:
+        for _, _, future in batch.requests:
+            future.set_exception(exc)
+
+    def _call(self, fn: Callable[..., T], *args) -> T:
+        with self._cond:
+            self._active += 1
+            self.calls += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._cond:
+                self._active -= 1
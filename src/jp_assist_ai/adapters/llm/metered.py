@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from typing import Callable
+
+from PIL import Image
+
+from jp_assist_ai.adapters.llm.base import PromptUsage, Translator
+from jp_assist_ai.adapters.storage.base import UsageRecord, UsageStore, UsageSummary
+from jp_assist_ai.core.budget import (
+    BudgetExceeded,
+    ImageTokenRates,
+    Pricing,
+    TokenBudget,
+    estimate_image_tokens,
+    estimate_text_tokens,
+    fit_image_scale,
+    start_of_day,
+)
+
+
+class MeteredTranslator(Translator):
+    """
+    Wraps a Translator with token estimation, budget enforcement and usage recording.
+
+    Images over budget are downscaled while the text stays legible
+    (`min_image_scale`); beyond that the OCR text is translated instead.
+    """
+
+    def __init__(
+        self,
+        inner: Translator,
+        store: UsageStore,
+        budget: TokenBudget = TokenBudget(),
+        pricing: Pricing = Pricing(),
+        image_rates: ImageTokenRates = ImageTokenRates(),
+        ocr: Callable[[Image.Image], str] | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        super().__init__()
+        self._inner = inner
+        self._store = store
+        self._budget = budget
+        self._pricing = pricing
+        self._image_rates = image_rates
+        self._ocr = ocr
+        self._clock = clock
+        self._call = threading.local()
+        inner.add_usage_listener(self._on_usage)
+
+    def translate_image(self, image: Image.Image, src_lang: str, dst_lang: str) -> str:
+        allowed = self._allowed_tokens()
+        estimate = estimate_image_tokens(image.width, image.height, self._image_rates)
+        if estimate > allowed:
+            scale = fit_image_scale(image.width, image.height, allowed, self._image_rates)
+            if scale >= self._budget.min_image_scale:
+                size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+                image = image.resize(size, resample=Image.LANCZOS)
+                estimate = estimate_image_tokens(image.width, image.height, self._image_rates)
+            elif self._ocr is not None:
+                text = self._ocr(image)
+                if not text.strip():
+                    # An empty request would still be billed for the prompt
+                    raise BudgetExceeded(
+                        f"Image needs ~{estimate} tokens, budget allows {allowed}, and OCR found no text."
+                    )
+                return self.translate_text(text, src_lang, dst_lang)
+            else:
+                raise BudgetExceeded(f"Image needs ~{estimate} tokens, budget allows {allowed}.")
+        return self._metered(estimate, self._inner.translate_image, image, src_lang, dst_lang)
+
+    def translate_text(self, text: str, src_lang: str, dst_lang: str) -> str:
+        estimate = self._check_text(text)
+        return self._metered(estimate, self._inner.translate_text, text, src_lang, dst_lang)
+
+    def rewrite_text(self, text: str, style: str, context: str = "") -> str:
+        estimate = self._check_text(text + context)
+        return self._metered(estimate, self._inner.rewrite_text, text, style, context)
+
+    def warm_up(self) -> None:
+        self._inner.warm_up()
+
+    def usage_today(self) -> UsageSummary:
+        return self._store.usage_since(start_of_day(self._clock()))
+
+    def _check_text(self, text: str) -> int:
+        allowed = self._allowed_tokens()
+        estimate = estimate_text_tokens(text)
+        if estimate > allowed:
+            raise BudgetExceeded(f"Text needs ~{estimate} tokens, budget allows {allowed}.")
+        return estimate
+
+    def _allowed_tokens(self) -> int:
+        allowed = self._budget.per_request or sys.maxsize
+        if self._budget.per_day:
+            remaining = self._budget.per_day - self.usage_today().total_tokens
+            if remaining <= 0:
+                raise BudgetExceeded("Daily token budget is used up.")
+            allowed = min(allowed, remaining)
+        return allowed
+
+    def _metered(self, estimate: int, fn, *args) -> str:
+        self._call.estimate = estimate
+        try:
+            return fn(*args)
+        finally:
+            self._call.estimate = 0
+
+    def _on_usage(self, usage: PromptUsage) -> None:
+        # Called on the thread that made the request, so the estimate is still set
+        self._store.record_usage(
+            UsageRecord(
+                created_at=self._clock(),
+                prompt_version=usage.prompt_version,
+                estimated_tokens=getattr(self._call, "estimate", 0),
+                input_tokens=usage.input_tokens,
+                cached_tokens=usage.cached_tokens,
+                output_tokens=usage.output_tokens,
+                cost=self._pricing.cost(usage.input_tokens, usage.cached_tokens, usage.output_tokens),
+            )
+        )
+        self._report_usage(usage)
@@ -5,40 +5,103 @@ import io
 import os
 
 from PIL import Image
-from openai import OpenAI
+from openai import AsyncOpenAI
 
-from jp_assist_ai.adapters.llm.base import Translator
+from jp_assist_ai.adapters.llm.base import PromptUsage, Translator
+from jp_assist_ai.adapters.llm.transport import AimdLimiter, AsyncTransport, CircuitBreaker, RetryPolicy
+from jp_assist_ai.config.logging import span
+from jp_assist_ai.core.budget import estimate_image_tokens
+from jp_assist_ai.core.prompts.templates import RenderedPrompt, get_prompts
 
 
 class OpenAITranslator(Translator):
-    def __init__(self, api_key: str | None = None, model: str | None = None):
+    def __init__(self, api_key: str | None = None, model: str | None = None, transport: AsyncTransport | None = None):
+        super().__init__()
         api_key = api_key or os.getenv("OPENAI_API_KEY", "")
         if not api_key:
             raise ValueError("OPENAI_API_KEY is required.")
-        self._client = OpenAI(api_key=api_key)
+        self._transport = transport or default_transport(api_key)
         self._model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+        self._prompts = get_prompts()
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    @property
+    def transport(self) -> AsyncTransport:
+        return self._transport
+
+    def warm_up(self) -> None:
+        self._transport.warm()
 
     def translate_image(self, image: Image.Image, src_lang: str, dst_lang: str) -> str:
-        buffer = io.BytesIO()
-        image.save(buffer, format="PNG")
-        b64 = base64.b64encode(buffer.getvalue()).decode("ascii")
-
-        prompt = (
-            "You are a professional translator. Extract all readable text from the image, "
-            f"then translate from {src_lang} to {dst_lang}. "
-            "Return concise output with clear separation between original and translation."
-        )
+        with span("llm.encode_png", width=image.width, height=image.height):
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG")
+        with span("llm.base64", size=buffer.tell()):
+            b64 = base64.b64encode(buffer.getvalue()).decode("ascii")
 
-        resp = self._client.responses.create(
-            model=self._model,
-            input=[
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "input_text", "text": prompt},
-                        {"type": "input_image", "image_url": f"data:image/png;base64,{b64}"},
-                    ],
-                }
-            ],
+        prompt = self._prompts.render("translate", src_lang=src_lang, dst_lang=dst_lang, image=True)
+        return self._create(
+            prompt,
+            [{"type": "input_image", "image_url": f"data:image/png;base64,{b64}"}],
+            _request_class("image", estimate_image_tokens(image.width, image.height)),
         )
+
+    def translate_text(self, text: str, src_lang: str, dst_lang: str) -> str:
+        prompt = self._prompts.render("translate", src_lang=src_lang, dst_lang=dst_lang, image=False)
+        return self._create(prompt, [{"type": "input_text", "text": text}], _request_class("text", len(text)))
+
+    def rewrite_text(self, text: str, style: str, context: str = "") -> str:
+        prompt = self._prompts.render("rewrite", style=style, context=context)
+        return self._create(prompt, [{"type": "input_text", "text": text}], _request_class("rewrite", len(text)))
+
+    def _create(self, prompt: RenderedPrompt, payload: list[dict], kind: str) -> str:
+        # Static instructions go first: every request of a prompt version starts the same way
+        messages = [
+            {"role": "system", "content": prompt.instructions},
+            {
+                "role": "user",
+                "content": [{"type": "input_text", "text": prompt.request}, *payload],
+            },
+        ]
+        with span("llm.request", prompt=prompt.version):
+            resp = self._transport.call(
+                lambda client: client.responses.create(model=self._model, input=messages), kind=kind
+            )
+        self._report_usage(_usage(prompt.version, resp))
         return resp.output_text.strip()
+
+
+def _request_class(kind: str, size: int) -> str:
+    # Size buckets a factor of two apart: a full page is not compared with a tile or one line
+    return f"{kind}/{max(1, size).bit_length()}"
+
+
+def default_transport(api_key: str) -> AsyncTransport:
+    # Retries are the transport's job; the SDK's own retry loop would multiply them
+    return AsyncTransport(
+        lambda: AsyncOpenAI(api_key=api_key, max_retries=0),
+        limiter=AimdLimiter(
+            initial=int(os.getenv("JP_ASSIST_LLM_CONCURRENCY", "4")),
+            maximum=int(os.getenv("JP_ASSIST_LLM_MAX_CONCURRENCY", "32")),
+        ),
+        breaker=CircuitBreaker(
+            threshold=int(os.getenv("JP_ASSIST_LLM_BREAKER_FAILURES", "5")),
+            cooldown=float(os.getenv("JP_ASSIST_LLM_BREAKER_COOLDOWN", "30")),
+        ),
+        retry=RetryPolicy(max_attempts=int(os.getenv("JP_ASSIST_LLM_MAX_ATTEMPTS", "5"))),
+        deadline=float(os.getenv("JP_ASSIST_LLM_TIMEOUT", "60")),
+    )
+
+
+def _usage(version: str, resp) -> PromptUsage:
+    usage = getattr(resp, "usage", None)
+    details = getattr(usage, "input_tokens_details", None)
+    return PromptUsage(
+        prompt_version=version,
+        input_tokens=int(getattr(usage, "input_tokens", 0) or 0),
+        cached_tokens=int(getattr(details, "cached_tokens", 0) or 0),
+        output_tokens=int(getattr(usage, "output_tokens", 0) or 0),
+    )
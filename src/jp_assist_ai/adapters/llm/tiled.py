@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence
+
+from PIL import Image
+
+from jp_assist_ai.adapters.llm.base import Translator
+from jp_assist_ai.config.logging import span
+from jp_assist_ai.core.tiling import merge_tile_texts, plan_tiles
+
+
+class TiledTranslator(Translator):
+    """
+    Splits images larger than one tile into text-aware tiles and translates
+    them in parallel, so a full-desktop or long scrolling capture costs about
+    one tile's latency instead of being downsampled into illegibility.
+    """
+
+    def __init__(
+        self,
+        inner: Translator,
+        max_width: int = 1536,
+        max_height: int = 1024,
+        overlap: int = 48,
+        max_workers: int = 4,
+    ):
+        super().__init__()
+        self._inner = inner
+        self._max_width = max_width
+        self._max_height = max_height
+        self._overlap = overlap
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="tile")
+        inner.add_usage_listener(self._report_usage)
+
+    @property
+    def inner(self) -> Translator:
+        return self._inner
+
+    def translate_image(self, image: Image.Image, src_lang: str, dst_lang: str) -> str:
+        with span("tiles.plan", width=image.width, height=image.height):
+            tiles = plan_tiles(image, self._max_width, self._max_height, self._overlap)
+        if len(tiles) == 1:
+            return self._inner.translate_image(image, src_lang, dst_lang)
+
+        def one(tile) -> str:
+            with span("tiles.translate", column=tile.column, row=tile.row):
+                return self._inner.translate_image(image.crop(tile.box), src_lang, dst_lang)
+
+        with span("tiles.all", count=len(tiles)):
+            texts = list(self._executor.map(one, tiles))
+        return merge_tile_texts(tiles, texts)
+
+    def warm_up(self) -> None:
+        self._inner.warm_up()
+
+    def translate_text(self, text: str, src_lang: str, dst_lang: str) -> str:
+        return self._inner.translate_text(text, src_lang, dst_lang)
+
+    def translate_lines(self, lines: Sequence[str], src_lang: str, dst_lang: str) -> list[str]:
+        return self._inner.translate_lines(lines, src_lang, dst_lang)
+
+    def rewrite_text(self, text: str, style: str, context: str = "") -> str:
+        return self._inner.rewrite_text(text, style, context)
@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, TypeVar
+
+import openai
+
+T = TypeVar("T")
+
+_log = logging.getLogger(__name__)
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+class CircuitOpen(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+
+    def delay(self, attempt: int, retry_after: float | None) -> float:
+        # Full jitter: spreads the retries of requests that failed together
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        if retry_after is not None:
+            return max(retry_after, backoff)
+        return backoff
+
+
+class AimdLimiter:
+    """
+    Adaptive concurrency limit: +1 per limit's worth of fast successes,
+    multiplicative decrease on 429s or when latency climbs well above the
+    best seen recently. Decreases are spaced an RTT apart so one burst of
+    throttled replies halves the limit once, not once per request.
+
+    Latency is compared per request class (`kind`, e.g. short text vs. a
+    full-page image): a slow image call after fast text calls is expected,
+    not a sign of congestion.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        minimum: int = 1,
+        maximum: int = 32,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self._backoff = backoff
+        self._tolerance = latency_tolerance
+        self._clock = clock
+        self._inflight = 0
+        self._min_latency: dict[str, float] = {}
+        self._last_decrease = float("-inf")
+        self._cond: asyncio.Condition | None = None
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    async def acquire(self) -> None:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._inflight < int(self.limit))
+            self._inflight += 1
+
+    async def release(self, latency: float | None, throttled: bool = False, kind: str = "") -> None:
+        if throttled:
+            self._decrease(self._backoff, kind)
+        elif latency is not None:
+            self._observe(latency, kind)
+        async with self._cond:
+            self._inflight -= 1
+            self._cond.notify_all()
+
+    def _observe(self, latency: float, kind: str) -> None:
+        # Let the baseline drift up slowly so a permanently slower backend is not punished forever
+        best = self._min_latency.get(kind)
+        if best is None or latency < best:
+            best = latency
+        else:
+            best *= 1.01
+        self._min_latency[kind] = best
+        if latency > self._tolerance * best:
+            self._decrease(0.9, kind)
+        else:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def _decrease(self, factor: float, kind: str) -> None:
+        now = self._clock()
+        if now - self._last_decrease < self._min_latency.get(kind, 0.1):
+            return
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit * factor)
+
+
+class CircuitBreaker:
+    """Closed -> open after `threshold` consecutive failures -> half-open after `cooldown`, one trial call."""
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self._threshold = threshold
+        self._cooldown = cooldown
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "half-open" if self._clock() - self._opened_at >= self._cooldown else "open"
+
+    def check(self) -> None:
+        state = self.state
+        if state == "open" or (state == "half-open" and self._trial):
+            remaining = self._cooldown - (self._clock() - self._opened_at)
+            raise CircuitOpen(f"LLM backend unavailable, retrying in {max(0.0, remaining):.0f}s")
+        if state == "half-open":
+            self._trial = True
+
+    def abandon(self) -> None:
+        """The call finished without a verdict; let another one try."""
+        self._trial = False
+
+    def record(self, ok: bool) -> None:
+        self._trial = False
+        if ok:
+            self._failures = 0
+            self._opened_at = None
+            return
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self._threshold:
+            self._opened_at = self._clock()
+
+
+class AsyncTransport:
+    """
+    Runs every LLM request on one asyncio loop in a background thread, so
+    callers on any thread share one limiter, one breaker and one pooled
+    AsyncOpenAI client.
+
+    A request is retried on 429, 5xx, timeouts and connection errors with
+    jittered exponential backoff (Retry-After wins when the server sends
+    it) until it succeeds, runs out of attempts or hits its deadline.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], openai.AsyncOpenAI],
+        limiter: AimdLimiter | None = None,
+        breaker: CircuitBreaker | None = None,
+        retry: RetryPolicy | None = None,
+        deadline: float = 60.0,
+    ):
+        self._client_factory = client_factory
+        self._client: openai.AsyncOpenAI | None = None
+        self.limiter = limiter or AimdLimiter()
+        self.breaker = breaker or CircuitBreaker()
+        self.retry = retry or RetryPolicy()
+        self.deadline = deadline
+        self.retries = 0
+        self.throttled = 0
+        self.warm_ups = 0
+        self._last_response: float | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+
+    def call(
+        self, fn: Callable[[openai.AsyncOpenAI], Awaitable[T]], deadline: float | None = None, kind: str = ""
+    ) -> T:
+        """Blocking entry point for synchronous code; safe from any thread except the loop's own."""
+        future = asyncio.run_coroutine_threadsafe(self.request(fn, deadline, kind), self._ensure_loop())
+        return future.result()
+
+    async def request(
+        self, fn: Callable[[openai.AsyncOpenAI], Awaitable[T]], deadline: float | None = None, kind: str = ""
+    ) -> T:
+        """`kind` groups requests of similar size, whose latencies the limiter compares."""
+        loop = asyncio.get_running_loop()
+        expires = loop.time() + (deadline or self.deadline)
+        if self._client is None:
+            self._client = self._client_factory()
+        attempt = 0
+        while True:
+            remaining = expires - loop.time()
+            if remaining <= 0:
+                raise DeadlineExceeded("LLM request deadline exceeded")
+            try:
+                await asyncio.wait_for(self.limiter.acquire(), remaining)
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded("LLM request deadline exceeded while queued") from None
+
+            latency: float | None = None
+            throttled = False
+            try:
+                self.breaker.check()
+                start = loop.time()
+                result = await asyncio.wait_for(fn(self._client), expires - start)
+                latency = loop.time() - start
+                self._last_response = loop.time()
+                self.breaker.record(True)
+                return result
+            except CircuitOpen:
+                raise
+            except asyncio.TimeoutError:
+                # The caller's budget ran out; that says nothing about the backend's health
+                self.breaker.abandon()
+                raise DeadlineExceeded("LLM request deadline exceeded") from None
+            except Exception as exc:
+                retryable, throttled, retry_after = _classify(exc)
+                # 429s and 4xx mean the backend is up; only 5xx and connection failures open the circuit
+                self.breaker.record(throttled or not retryable)
+                if throttled:
+                    self.throttled += 1
+                attempt += 1
+                if not retryable or attempt >= self.retry.max_attempts:
+                    raise
+                delay = self.retry.delay(attempt - 1, retry_after)
+                if loop.time() + delay >= expires:
+                    raise
+                _log.debug("LLM request failed (%s), retry %d in %.2fs", type(exc).__name__, attempt, delay)
+                self.retries += 1
+            finally:
+                await self.limiter.release(latency, throttled, kind)
+            await asyncio.sleep(delay)
+
+    def warm(self, idle: float = 4.0, timeout: float = 5.0) -> bool:
+        """
+        Build the client and open a pooled connection (TCP + TLS) with a
+        cheap GET, unless a response arrived in the last `idle` seconds and
+        the connection is still kept alive. Failures are left to the real
+        request to report; returns whether the backend answered.
+        """
+        loop = self._ensure_loop()
+        try:
+            return asyncio.run_coroutine_threadsafe(self._warm(idle, timeout), loop).result()
+        except Exception as exc:
+            _log.debug("LLM warm-up failed: %s", exc)
+            return False
+
+    async def _warm(self, idle: float, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        if self._client is None:
+            self._client = self._client_factory()
+        if self._last_response is not None and loop.time() - self._last_response < idle:
+            return True
+        if self.breaker.state != "closed":
+            return False
+        # Any HTTP answer leaves a warm connection in the pool, even an error status
+        try:
+            await asyncio.wait_for(self._client.models.list(), timeout)
+        except openai.APIStatusError:
+            pass
+        self._last_response = loop.time()
+        self.warm_ups += 1
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.close(), loop).result(timeout=5)
+            self._client = None
+        loop.call_soon_threadsafe(loop.stop)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-transport", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+
+def is_transient(exc: BaseException) -> bool:
+    """True when the request may succeed later unchanged (backend down, throttled, timed out)."""
+    if isinstance(exc, (CircuitOpen, DeadlineExceeded)):
+        return True
+    return isinstance(exc, Exception) and _classify(exc)[0]
+
+
+def _classify(exc: Exception) -> tuple[bool, bool, float | None]:
+    """(retryable, throttled, retry_after seconds)"""
+    if isinstance(exc, openai.APIStatusError):
+        status = exc.status_code
+        retry_after = _retry_after(exc.response.headers if exc.response is not None else {})
+        if status == 429:
+            return True, True, retry_after
+        return status >= 500 or status == 408, False, retry_after
+    if isinstance(exc, (openai.APIConnectionError, ConnectionError)):
+        return True, False, None
+    return False, False, None
+
+
+def _retry_after(headers: Any) -> float | None:
+    ms = headers.get("retry-after-ms")
+    if ms:
+        try:
+            return float(ms) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+
+from PIL import Image
+
+from jp_assist_ai.core.models import OcrLine
+
+
+class OcrEngine(ABC):
+    """
+    Text lines of a capture, in reading order, with boxes in image pixels.
+    Engines are expensive to build; keep one instance and share it across threads.
+    """
+
+    @abstractmethod
+    def recognize_lines(self, image: Image.Image) -> list[OcrLine]:
+        raise NotImplementedError
+
+    def recognize(self, image: Image.Image) -> str:
+        return "\n".join(line.text for line in self.recognize_lines(image))
+
+    def warm_up(self) -> None:
+        """Load models ahead of the first capture. Best effort; the default has nothing to prepare."""
+        return None
+
+    def close(self) -> None:
+        return None
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
+import threading
 from typing import List
 from PIL import Image
 import numpy as np
 from paddleocr import PaddleOCR
 
+from jp_assist_ai.adapters.ocr.base import OcrEngine
+from jp_assist_ai.adapters.ocr.preprocess import prepare
+from jp_assist_ai.config.logging import span
+from jp_assist_ai.core.models import OcrLine
 
-class PaddleOcrEngine:
+
+# Line height the capture is rescaled to: oversized (Retina) text only costs detection time
+_TEXT_HEIGHT = 32
+
+
+class PaddleOcrEngine(OcrEngine):
     """
     OCR engine for Japanese/English.
     Note: Initialization is heavy; keep one instance for reuse.
@@ -17,20 +27,47 @@ class PaddleOcrEngine:
             lang="japan",   # Japanese model (includes kanji/kana)
             show_log=False,
         )
+        self._warm = False
+        # One predictor, not safe to share: speculative OCR and a translation can overlap
+        self._lock = threading.Lock()
+
+    def warm_up(self) -> None:
+        # The first inference allocates the predictor's buffers; pay that before a real capture
+        with self._lock:
+            if not self._warm:
+                self._ocr.ocr(np.full((32, 128, 3), 255, dtype=np.uint8), cls=True)
+                self._warm = True
 
-    def recognize(self, image: Image.Image) -> str:
-        # PaddleOCR expects numpy array (BGR/RGB both OK in many cases)
-        img = np.array(image.convert("RGB"))
-        result = self._ocr.ocr(img, cls=True)
+    def recognize_lines(self, image: Image.Image) -> List[OcrLine]:
+        lines: List[OcrLine] = []
+        with span("ocr.prepare", width=image.width, height=image.height):
+            prepared = prepare(image, text_height=_TEXT_HEIGHT)
+        if prepared.empty:
+            return lines
+        # PaddleOCR wants three channels; the prepared capture is grey
+        img = np.repeat(prepared.pixels[..., None], 3, axis=2)
+        with self._lock:
+            result = self._ocr.ocr(img, cls=True)
 
-        lines: List[str] = []
         if not result:
-            return ""
+            return lines
 
         # result format: [[(box, (text, score)), ...]]
         for block in result:
-            for _box, (text, _score) in block:
-                if text and text.strip():
-                    lines.append(text.strip())
+            if not block:
+                continue
+            for box, (text, score) in block:
+                if not (text and text.strip()):
+                    continue
+                xs = [int(p[0]) for p in box]
+                ys = [int(p[1]) for p in box]
+                x, y = min(xs), min(ys)
+                lines.append(
+                    OcrLine(
+                        text=text.strip(),
+                        box=prepared.to_source((x, y, max(xs) - x, max(ys) - y)),
+                        score=float(score),
+                    )
+                )
 
-        return "\n".join(lines)
+        return lines
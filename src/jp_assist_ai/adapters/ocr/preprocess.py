@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image
+
+# Grey levels a pixel must differ from the background by to count as ink
+_INK_CONTRAST = 40
+# Kept around the text when cropping margins; OCR misreads glyphs touching the edge
+_MARGIN = 8
+# Smallest scale applied: text is never shrunk below a quarter of its size
+_MIN_RESCALE = 0.25
+# Columns (rows for vertical text) inked over more than this share of their length are
+# borders, scrollbars, rules or dark panels, not text
+_DENSE_LINE = 0.5
+_SKEW_LIMIT = 5.0  # degrees; screenshots are straight, phone photos of screens are a few degrees off
+_SKEW_STEP = 0.25
+_MIN_SKEW = 0.5
+
+
+@dataclass(frozen=True)
+class Prepared:
+    """A capture ready for OCR (grey, dark text on light) and how to map its boxes back to the original."""
+
+    pixels: np.ndarray
+    offset: tuple[int, int] = (0, 0)  # margin crop origin in the original
+    angle: float = 0.0  # degrees the crop was rotated by, counter-clockwise, canvas expanded
+    scale: float = 1.0  # applied after the rotation
+    text_height: int = 0  # estimated, in original pixels; 0 when no text was found or it was implausible
+    crop_size: tuple[int, int] = (0, 0)  # (width, height) before the rotation
+    rotated_size: tuple[int, int] = (0, 0)  # and after it
+
+    @property
+    def empty(self) -> bool:
+        return self.pixels.size == 0
+
+    def image(self) -> Image.Image:
+        return Image.fromarray(self.pixels)
+
+    def to_source(self, box: tuple[int, int, int, int]) -> tuple[int, int, int, int]:
+        """An (x, y, w, h) box on `pixels` as a box on the original image."""
+        x, y, w, h = box
+        corners = [(px / self.scale, py / self.scale) for px in (x, x + w) for py in (y, y + h)]
+        if self.angle:
+            theta = math.radians(self.angle)
+            cos, sin = math.cos(theta), math.sin(theta)
+            cx, cy = self.rotated_size[0] / 2, self.rotated_size[1] / 2
+            sx, sy = self.crop_size[0] / 2, self.crop_size[1] / 2
+            corners = [
+                (sx + (px - cx) * cos - (py - cy) * sin, sy + (px - cx) * sin + (py - cy) * cos)
+                for px, py in corners
+            ]
+        xs = [px + self.offset[0] for px, _ in corners]
+        ys = [py + self.offset[1] for _, py in corners]
+        left, top = int(min(xs)), int(min(ys))
+        return left, top, int(math.ceil(max(xs))) - left, int(math.ceil(max(ys))) - top
+
+
+def prepare(
+    image: Image.Image,
+    text_height: int = 32,
+    binarize: bool = False,
+    deskew: bool = True,
+    vertical: bool = False,
+) -> Prepared:
+    """
+    Normalize a capture for OCR: dark themes are inverted, empty margins
+    cropped, the image rescaled so text is about `text_height` pixels tall
+    (across the lines when `vertical`), straightened when it is a few
+    degrees off, and optionally binarized with a local-mean threshold.
+    """
+    grey = np.asarray(image.convert("L"))
+    # The most common level is the background; sampling is plenty to find it
+    background = int(np.bincount(grey[::4, ::4].ravel(), minlength=256).argmax())
+    if background < 128:
+        grey = 255 - grey
+        background = 255 - background
+    ink = grey < background - _INK_CONTRAST
+
+    rows = np.flatnonzero(ink.any(axis=1))
+    if not rows.size:
+        return Prepared(np.empty((0, 0), np.uint8))
+    cols = np.flatnonzero(ink.any(axis=0))
+    top, bottom = max(0, rows[0] - _MARGIN), min(grey.shape[0], rows[-1] + 1 + _MARGIN)
+    left, right = max(0, cols[0] - _MARGIN), min(grey.shape[1], cols[-1] + 1 + _MARGIN)
+    grey, ink = grey[top:bottom, left:right], ink[top:bottom, left:right]
+
+    crop = Image.fromarray(grey)
+    crop_size = crop.size
+    angle = _skew(ink, vertical) if deskew else 0.0
+    if angle:
+        # Straighten first: tilted lines run into each other and would read as one tall line
+        crop = crop.rotate(angle, Image.Resampling.BILINEAR, expand=True, fillcolor=background)
+        grey = np.asarray(crop)
+        ink = grey < background - _INK_CONTRAST
+    rotated_size = crop.size
+
+    measured = _text_height(ink, vertical)
+    extent = ink.shape[1 if vertical else 0]
+    if measured > extent / 4 and extent > 8 * text_height:
+        # A "line" a quarter of a tall capture is something the estimate missed, not text: leave the size alone
+        measured = 0
+    scale = text_height / measured if measured else 1.0
+    scale = min(3.0, max(_MIN_RESCALE, scale))
+    if 0.8 <= scale <= 1.25:
+        scale = 1.0
+    if scale != 1.0:
+        size = (max(1, round(crop.width * scale)), max(1, round(crop.height * scale)))
+        crop = crop.resize(size, Image.Resampling.BOX if scale < 1 else Image.Resampling.BICUBIC)
+        grey = np.asarray(crop)
+
+    if binarize:
+        grey = _adaptive_threshold(grey, window=2 * text_height + 1)
+    return Prepared(grey, (int(left), int(top)), angle, scale, measured, crop_size, rotated_size)
+
+
+def _text_height(ink: np.ndarray, vertical: bool) -> int:
+    """
+    Median length of the runs of inked rows (columns for vertical text):
+    roughly one line of text. Columns inked most of the way down are left
+    out first, or one window border, scrollbar or sidebar would join every
+    line into a single run.
+    """
+    if vertical:
+        ink = ink.T
+    # Every eighth row is plenty to tell a border from text
+    dense = np.count_nonzero(ink[::8], axis=0) > _DENSE_LINE * len(ink[::8])
+    if dense.any():
+        ink = ink[:, ~dense]
+    profile = ink.any(axis=1).astype(np.int8)
+    edges = np.diff(np.concatenate(([0], profile, [0])))
+    lengths = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+    lengths = lengths[lengths >= 4]  # rules, underlines and specks are not text
+    return int(np.median(lengths)) if lengths.size else 0
+
+
+def _skew(ink: np.ndarray, vertical: bool) -> float:
+    """
+    Angle (degrees, counter-clockwise) that straightens the text lines:
+    the shear under which the ink's row profile is sharpest. Coarse
+    search, then a fine one around the best coarse angle.
+    """
+    # Every other pixel keeps lines of text well apart and quarters the work
+    ys, xs = np.nonzero(ink[::2, ::2])
+    if vertical:
+        ys, xs = xs, ys
+    if ys.size < 500:
+        return 0.0
+    step = max(1, ys.size // 50_000)
+    ys, xs = ys[::step].astype(np.float32), xs[::step].astype(np.float32)
+
+    def sharpness(angle: float) -> float:
+        rows = np.rint(ys - xs * math.tan(math.radians(angle))).astype(np.int32)
+        counts = np.bincount(rows - rows.min())
+        return float(np.dot(counts, counts))
+
+    coarse = max(np.arange(-_SKEW_LIMIT, _SKEW_LIMIT + 0.5, 1.0), key=sharpness)
+    best = max(np.arange(coarse - 0.75, coarse + 0.8, _SKEW_STEP), key=sharpness)
+    if abs(best) < _MIN_SKEW:
+        return 0.0
+    # A row-profile shear of `best` is a clockwise tilt of the text; rotate it back
+    return float(-best if vertical else best)
+
+
+def _adaptive_threshold(grey: np.ndarray, window: int, offset: int = 12) -> np.ndarray:
+    """
+    Ink where a pixel is `offset` darker than the mean of the window around it.
+    The local mean changes slowly, so it is computed on a reduced image and
+    scaled back up instead of summed per pixel.
+    """
+    factor = max(1, window // 4)
+    image = Image.fromarray(grey)
+    small = np.asarray(image.reduce(factor), dtype=np.int32)
+    k = 5  # the window, in reduced pixels
+    padded = np.pad(small, k // 2, mode="edge")
+    integral = np.zeros((padded.shape[0] + 1, padded.shape[1] + 1), np.int32)
+    integral[1:, 1:] = padded.cumsum(axis=0).cumsum(axis=1)
+    h, w = small.shape
+    sums = integral[k : k + h, k : k + w] - integral[:h, k : k + w] - integral[k : k + h, :w] + integral[:h, :w]
+    threshold = np.clip(sums // (k * k) - offset, 0, 255).astype(np.uint8)
+    threshold = np.asarray(Image.fromarray(threshold).resize(image.size, Image.Resampling.BILINEAR))
+    return (grey >= threshold).view(np.uint8) * np.uint8(255)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Sequence
+
+
+@dataclass(frozen=True)
+class UsageRecord:
+    created_at: float
+    prompt_version: str
+    estimated_tokens: int
+    input_tokens: int
+    cached_tokens: int
+    output_tokens: int
+    cost: float
+
+
+@dataclass(frozen=True)
+class UsageSummary:
+    calls: int = 0
+    estimated_tokens: int = 0
+    input_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+
+class UsageStore(ABC):
+    @abstractmethod
+    def record_usage(self, record: UsageRecord) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def usage_since(self, since: float) -> UsageSummary:
+        raise NotImplementedError
+
+
+@dataclass(frozen=True)
+class QueuedJob:
+    """A translation waiting for the backend: newline-separated source lines, or a stored image."""
+
+    id: int
+    created_at: float
+    priority: int  # lower runs first
+    src_lang: str
+    dst_lang: str
+    text: str | None
+    image: str | None  # digest of the PNG in the image table
+    attempts: int = 0
+
+
+@dataclass(frozen=True)
+class HistoryEntry:
+    id: int
+    created_at: float
+    src_lang: str
+    dst_lang: str
+    source: str | None  # recognized text, when known
+    translation: str
+    image: str | None
+
+    @property
+    def translated_text(self) -> str:
+        """The translation alone, without the "Original:" section it is usually stored with."""
+        from jp_assist_ai.core.tiling import split_sections
+
+        return "\n".join(split_sections(self.translation)[1])
+
+
+class JobStore(ABC):
+    @abstractmethod
+    def enqueue_job(
+        self,
+        priority: int,
+        src_lang: str,
+        dst_lang: str,
+        text: str | None = None,
+        image: bytes | None = None,
+    ) -> QueuedJob:
+        raise NotImplementedError
+
+    @abstractmethod
+    def claim_jobs(self, limit: int, now: float) -> list[QueuedJob]:
+        """Due jobs by priority, marked running so a second drainer would not take them too."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def complete_job(self, job: QueuedJob, translation: str, source: str | None = None) -> HistoryEntry:
+        raise NotImplementedError
+
+    @abstractmethod
+    def retry_job(self, job: QueuedJob, not_before: float, error: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def fail_job(self, job: QueuedJob, error: str) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def requeue_running(self) -> int:
+        """Jobs left running by a process that exited; back to pending."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def pending_jobs(self) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def next_job_due(self) -> float | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_image(self, digest: str) -> bytes | None:
+        raise NotImplementedError
+
+
+class HistoryStore(ABC):
+    @abstractmethod
+    def add_history(
+        self,
+        src_lang: str,
+        dst_lang: str,
+        translation: str,
+        source: str | None = None,
+        image: bytes | None = None,
+    ) -> HistoryEntry:
+        raise NotImplementedError
+
+    @abstractmethod
+    def history(self, limit: int = 50, offset: int = 0) -> list[HistoryEntry]:
+        """Newest first."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def history_after(self, history_id: int, limit: int) -> list[HistoryEntry]:
+        """Oldest first: entries added since `history_id`, for incremental indexing."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_history(self, history_id: int) -> HistoryEntry | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_image(self, digest: str) -> bytes | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def prune_history_images(self, max_bytes: int) -> int:
+        """
+        Drop the capture images of the oldest history entries (the entries
+        stay, without their image) until the rest fit in `max_bytes`; images a
+        queued job still needs are kept. Returns how many were dropped.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def history_images_after(self, digest: str, limit: int) -> list[tuple[str, bytes]]:
+        """(digest, PNG) of images referenced by history, in digest order after `digest`."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def import_history(self, entries: Sequence[HistoryEntry], images: Sequence[bytes] = ()) -> int:
+        """
+        Add entries with their own timestamps (their ids are ignored) and the
+        images they reference; returns how many were new. An entry already in
+        history (same time, languages and translation) is skipped.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_capture_hash(self, history_id: int, dhash: int, phash: int, grid: bytes, rows: int, cols: int) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def capture_hashes(self) -> list[tuple[int, str, str, int, int]]:
+        """(history id, src_lang, dst_lang, dhash, phash) of every hashed capture, oldest first."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def capture_grid(self, history_id: int) -> tuple[bytes, int, int] | None:
+        """(grid, rows, cols) of a hashed capture."""
+        raise NotImplementedError
@@ -0,0 +1,329 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Sequence
+
+from jp_assist_ai.adapters.storage.base import (
+    HistoryEntry,
+    HistoryStore,
+    JobStore,
+    QueuedJob,
+    UsageRecord,
+    UsageStore,
+    UsageSummary,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    prompt_version TEXT NOT NULL,
+    estimated_tokens INTEGER NOT NULL,
+    input_tokens INTEGER NOT NULL,
+    cached_tokens INTEGER NOT NULL,
+    output_tokens INTEGER NOT NULL,
+    cost REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS usage_created_at ON usage (created_at);
+
+-- PNGs keyed by content hash: a capture queued, retried and kept in history is stored once
+CREATE TABLE IF NOT EXISTS images (
+    digest TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    src_lang TEXT NOT NULL,
+    dst_lang TEXT NOT NULL,
+    source TEXT,
+    translation TEXT NOT NULL,
+    image TEXT REFERENCES images (digest)
+);
+CREATE INDEX IF NOT EXISTS history_created_at ON history (created_at);
+CREATE INDEX IF NOT EXISTS history_image ON history (image);
+
+-- Perceptual hashes of captures in history (hashes as signed 64-bit, SQLite's INTEGER)
+CREATE TABLE IF NOT EXISTS capture_hashes (
+    history_id INTEGER PRIMARY KEY REFERENCES history (id),
+    dhash INTEGER NOT NULL,
+    phash INTEGER NOT NULL,
+    grid BLOB NOT NULL,
+    grid_rows INTEGER NOT NULL,
+    grid_cols INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    priority INTEGER NOT NULL,
+    src_lang TEXT NOT NULL,
+    dst_lang TEXT NOT NULL,
+    text TEXT,
+    image TEXT REFERENCES images (digest),
+    state TEXT NOT NULL DEFAULT 'pending',  -- pending | running | failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_due ON jobs (state, priority, id);
+"""
+
+_JOB_COLUMNS = "id, created_at, priority, src_lang, dst_lang, text, image, attempts"
+_HISTORY_COLUMNS = "id, created_at, src_lang, dst_lang, source, translation, image"
+
+
+def default_db_path() -> str:
+    base = os.getenv("JP_ASSIST_DATA_DIR") or os.path.join(
+        os.path.expanduser("~"), ".local", "share", "jp-assist-ai"
+    )
+    return os.path.join(base, "jp_assist.db")
+
+
+class SqliteStore(UsageStore, JobStore, HistoryStore):
+    """
+    Local storage for history, caches and usage stats.
+    One connection shared across threads, serialized by a lock.
+    """
+
+    def __init__(self, path: str | None = None):
+        path = path or default_db_path()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def record_usage(self, record: UsageRecord) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO usage (created_at, prompt_version, estimated_tokens, input_tokens,"
+                " cached_tokens, output_tokens, cost) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    record.created_at,
+                    record.prompt_version,
+                    record.estimated_tokens,
+                    record.input_tokens,
+                    record.cached_tokens,
+                    record.output_tokens,
+                    record.cost,
+                ),
+            )
+            self._conn.commit()
+
+    def usage_since(self, since: float) -> UsageSummary:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(estimated_tokens), 0), COALESCE(SUM(input_tokens), 0),"
+                " COALESCE(SUM(cached_tokens), 0), COALESCE(SUM(output_tokens), 0), COALESCE(SUM(cost), 0)"
+                " FROM usage WHERE created_at >= ?",
+                (since,),
+            ).fetchone()
+        return UsageSummary(
+            calls=row[0],
+            estimated_tokens=row[1],
+            input_tokens=row[2],
+            cached_tokens=row[3],
+            output_tokens=row[4],
+            cost=float(row[5]),
+        )
+
+    def enqueue_job(
+        self,
+        priority: int,
+        src_lang: str,
+        dst_lang: str,
+        text: str | None = None,
+        image: bytes | None = None,
+    ) -> QueuedJob:
+        now = time.time()
+        with self._lock, self._conn:
+            digest = self._put_image(image) if image is not None else None
+            cur = self._conn.execute(
+                "INSERT INTO jobs (created_at, priority, src_lang, dst_lang, text, image) VALUES (?, ?, ?, ?, ?, ?)",
+                (now, priority, src_lang, dst_lang, text, digest),
+            )
+        return QueuedJob(cur.lastrowid, now, priority, src_lang, dst_lang, text, digest)
+
+    def claim_jobs(self, limit: int, now: float) -> list[QueuedJob]:
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                f"SELECT {_JOB_COLUMNS} FROM jobs WHERE state = 'pending' AND next_attempt_at <= ?"
+                " ORDER BY priority, id LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE jobs SET state = 'running', attempts = attempts + 1 WHERE id = ?",
+                [(row[0],) for row in rows],
+            )
+        return [QueuedJob(*row[:7], attempts=row[7] + 1) for row in rows]
+
+    def complete_job(self, job: QueuedJob, translation: str, source: str | None = None) -> HistoryEntry:
+        # One transaction: a crash leaves either the job or its history entry, never both or neither
+        now = time.time()
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO history (created_at, src_lang, dst_lang, source, translation, image)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (now, job.src_lang, job.dst_lang, source, translation, job.image),
+            )
+            self._conn.execute("DELETE FROM jobs WHERE id = ?", (job.id,))
+        return HistoryEntry(cur.lastrowid, now, job.src_lang, job.dst_lang, source, translation, job.image)
+
+    def retry_job(self, job: QueuedJob, not_before: float, error: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET state = 'pending', next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (not_before, error, job.id),
+            )
+
+    def fail_job(self, job: QueuedJob, error: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE jobs SET state = 'failed', last_error = ? WHERE id = ?", (error, job.id))
+
+    def requeue_running(self) -> int:
+        with self._lock, self._conn:
+            return self._conn.execute("UPDATE jobs SET state = 'pending' WHERE state = 'running'").rowcount
+
+    def pending_jobs(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE state != 'failed'").fetchone()[0]
+
+    def next_job_due(self) -> float | None:
+        with self._lock:
+            return self._conn.execute("SELECT MIN(next_attempt_at) FROM jobs WHERE state = 'pending'").fetchone()[0]
+
+    def add_history(
+        self,
+        src_lang: str,
+        dst_lang: str,
+        translation: str,
+        source: str | None = None,
+        image: bytes | None = None,
+    ) -> HistoryEntry:
+        now = time.time()
+        with self._lock, self._conn:
+            digest = self._put_image(image) if image is not None else None
+            cur = self._conn.execute(
+                "INSERT INTO history (created_at, src_lang, dst_lang, source, translation, image)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (now, src_lang, dst_lang, source, translation, digest),
+            )
+        return HistoryEntry(cur.lastrowid, now, src_lang, dst_lang, source, translation, digest)
+
+    def history(self, limit: int = 50, offset: int = 0) -> list[HistoryEntry]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_HISTORY_COLUMNS} FROM history ORDER BY id DESC LIMIT ? OFFSET ?", (limit, offset)
+            ).fetchall()
+        return [HistoryEntry(*row) for row in rows]
+
+    def history_after(self, history_id: int, limit: int) -> list[HistoryEntry]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_HISTORY_COLUMNS} FROM history WHERE id > ? ORDER BY id LIMIT ?", (history_id, limit)
+            ).fetchall()
+        return [HistoryEntry(*row) for row in rows]
+
+    def get_history(self, history_id: int) -> HistoryEntry | None:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_HISTORY_COLUMNS} FROM history WHERE id = ?", (history_id,)).fetchone()
+        return HistoryEntry(*row) if row else None
+
+    def prune_history_images(self, max_bytes: int) -> int:
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT images.digest, length(images.data), MAX(history.id) AS newest"
+                " FROM images JOIN history ON history.image = images.digest"
+                " WHERE NOT EXISTS (SELECT 1 FROM jobs WHERE jobs.image = images.digest)"
+                " GROUP BY images.digest ORDER BY newest DESC"
+            ).fetchall()
+            kept, dropped = 0, []
+            for digest, size, _ in rows:
+                kept += size
+                if kept > max_bytes:
+                    dropped.append((digest,))
+            self._conn.executemany("UPDATE history SET image = NULL WHERE image = ?", dropped)
+            self._conn.executemany("DELETE FROM images WHERE digest = ?", dropped)
+        return len(dropped)
+
+    def history_images_after(self, digest: str, limit: int) -> list[tuple[str, bytes]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT digest, data FROM images"
+                " WHERE digest > ? AND EXISTS (SELECT 1 FROM history WHERE history.image = images.digest)"
+                " ORDER BY digest LIMIT ?",
+                (digest, limit),
+            ).fetchall()
+
+    def import_history(self, entries: Sequence[HistoryEntry], images: Sequence[bytes] = ()) -> int:
+        added = 0
+        with self._lock, self._conn:
+            for data in images:
+                self._put_image(data)
+            for entry in entries:
+                if self._conn.execute(
+                    "SELECT 1 FROM history WHERE created_at = ? AND src_lang = ? AND dst_lang = ? AND translation = ?",
+                    (entry.created_at, entry.src_lang, entry.dst_lang, entry.translation),
+                ).fetchone():
+                    continue
+                self._conn.execute(
+                    "INSERT INTO history (created_at, src_lang, dst_lang, source, translation, image)"
+                    " VALUES (?, ?, ?, ?, ?, ?)",
+                    (entry.created_at, entry.src_lang, entry.dst_lang, entry.source, entry.translation, entry.image),
+                )
+                added += 1
+        return added
+
+    def add_capture_hash(self, history_id: int, dhash: int, phash: int, grid: bytes, rows: int, cols: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO capture_hashes (history_id, dhash, phash, grid, grid_rows, grid_cols)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (history_id, _signed(dhash), _signed(phash), grid, rows, cols),
+            )
+
+    def capture_hashes(self) -> list[tuple[int, str, str, int, int]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT h.history_id, e.src_lang, e.dst_lang, h.dhash, h.phash"
+                " FROM capture_hashes h JOIN history e ON e.id = h.history_id ORDER BY h.history_id"
+            ).fetchall()
+        return [(hid, src, dst, _unsigned(dhash), _unsigned(phash)) for hid, src, dst, dhash, phash in rows]
+
+    def capture_grid(self, history_id: int) -> tuple[bytes, int, int] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT grid, grid_rows, grid_cols FROM capture_hashes WHERE history_id = ?", (history_id,)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def get_image(self, digest: str) -> bytes | None:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM images WHERE digest = ?", (digest,)).fetchone()
+        return row[0] if row else None
+
+    def _put_image(self, data: bytes) -> str:
+        digest = hashlib.sha256(data).hexdigest()
+        self._conn.execute("INSERT OR IGNORE INTO images (digest, data) VALUES (?, ?)", (digest, data))
+        return digest
+
+
+def _signed(value: int) -> int:
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
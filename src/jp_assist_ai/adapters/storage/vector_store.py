@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+
+import numpy as np
+
+_META = np.dtype([("id", "<i8"), ("scale", "<f4")])
+# Rows scored per step: bounds the float32 working copy to BLOCK x dim, whatever the matrix size
+_BLOCK = 8192
+_FORMAT = 1
+
+
+class VectorStore:
+    """
+    Append-only matrix of unit vectors on disk, read through np.memmap.
+
+    Rows are int8 with a per-row scale (a quarter of float32's size), so
+    100k x 256 is 25 MB of file that the OS pages in and out; RAM held by a
+    search is one block of rows plus the top-k. Appends go straight to the
+    files; the map is renewed when a search sees new rows.
+
+    An optional IVF index (k-means lists over the rows, `build_ivf`) lets
+    a search score only the rows of the lists nearest the query, plus any
+    rows appended since the index was built.
+    """
+
+    def __init__(self, directory: str, dim: int, tag: str = ""):
+        self.dim = dim
+        self._dir = directory
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._vectors_path = os.path.join(directory, "vectors.i8")
+        self._meta_path = os.path.join(directory, "vectors.meta")
+        self._sum_path = os.path.join(directory, "vectors.sum.npy")
+        self._ivf_path = os.path.join(directory, "ivf.npz")
+        self._check_format(tag)
+        self._vectors: np.memmap | None = None
+        self._meta: np.memmap | None = None
+        self._mapped = 0
+        self._sum = np.load(self._sum_path) if os.path.exists(self._sum_path) else np.zeros(dim, np.float64)
+        self._ivf = self._load_ivf()
+
+    def __len__(self) -> int:
+        # A crash between the two writes leaves one file a row ahead; the shorter one counts
+        vectors = os.path.getsize(self._vectors_path) // self.dim if os.path.exists(self._vectors_path) else 0
+        meta = os.path.getsize(self._meta_path) // _META.itemsize if os.path.exists(self._meta_path) else 0
+        return min(vectors, meta)
+
+    @property
+    def ivf_rows(self) -> int:
+        """Rows covered by the IVF index; 0 when there is none."""
+        return self._ivf["count"] if self._ivf else 0
+
+    def last_id(self) -> int:
+        n = len(self)
+        if n == 0:
+            return 0
+        with open(self._meta_path, "rb") as f:
+            f.seek((n - 1) * _META.itemsize)
+            return int(np.frombuffer(f.read(_META.itemsize), _META)[0]["id"])
+
+    def mean(self) -> np.ndarray:
+        n = len(self)
+        return (self._sum / n).astype(np.float32) if n else np.zeros(self.dim, np.float32)
+
+    def append(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        """Rows for `ids` (increasing, after last_id()); vectors are unit rows, float32."""
+        if not len(ids):
+            return
+        peak = np.abs(vectors).max(axis=1)
+        scale = np.where(peak > 0, 127 / np.maximum(peak, 1e-12), 1.0).astype(np.float32)
+        quantized = np.rint(vectors * scale[:, None]).astype(np.int8)
+        meta = np.empty(len(ids), _META)
+        meta["id"] = ids
+        meta["scale"] = scale
+        with self._lock:
+            n = len(self)
+            self._truncate(n)
+            with open(self._vectors_path, "ab") as f:
+                f.write(quantized.tobytes())
+            with open(self._meta_path, "ab") as f:
+                f.write(meta.tobytes())
+            self._sum += vectors.sum(axis=0, dtype=np.float64)
+            np.save(self._sum_path, self._sum)
+
+    def search(self, query: np.ndarray, k: int = 20, nprobe: int = 16) -> list[tuple[int, float]]:
+        """(id, score) of the k rows with the highest dot product with `query`, best first."""
+        vectors, meta, n = self._map()
+        if n == 0:
+            return []
+        query = query.astype(np.float32)
+        best_scores = np.empty(0, np.float32)
+        best_rows = np.empty(0, np.int64)
+        ivf = self._ivf
+        if ivf and ivf["count"] <= n:
+            lists = np.argsort(ivf["centroids"] @ query)[::-1][:nprobe]
+            rows = np.sort(np.concatenate([ivf["rows"][ivf["offsets"][c] : ivf["offsets"][c + 1]] for c in lists]))
+            for start in range(0, len(rows), _BLOCK):
+                chunk = rows[start : start + _BLOCK]
+                scores = (vectors[chunk].astype(np.float32) @ query) / meta["scale"][chunk]
+                best_scores, best_rows = _top(best_scores, best_rows, scores, chunk, k)
+            tail = ivf["count"]
+        else:
+            tail = 0
+        for start in range(tail, n, _BLOCK):
+            end = min(n, start + _BLOCK)
+            scores = (vectors[start:end].astype(np.float32) @ query) / meta["scale"][start:end]
+            best_scores, best_rows = _top(best_scores, best_rows, scores, np.arange(start, end), k)
+        order = np.argsort(best_scores)[::-1]
+        return [(int(meta["id"][best_rows[i]]), float(best_scores[i])) for i in order]
+
+    def build_ivf(self, lists: int | None = None, iterations: int = 8, sample: int = 16384, seed: int = 0) -> None:
+        """k-means lists over the current rows (about sqrt(n) of them), trained on a sample."""
+        vectors, meta, n = self._map()
+        if n == 0:
+            return
+        lists = min(n, lists or max(1, int(np.sqrt(n))))
+        rng = np.random.default_rng(seed)
+        picked = np.sort(rng.choice(n, size=min(n, sample), replace=False))
+        train = vectors[picked].astype(np.float32) / meta["scale"][picked][:, None]
+        centroids = train[rng.choice(len(train), size=lists, replace=False)]
+        for _ in range(iterations):
+            assign = np.argmax(train @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, train)
+            counts = np.bincount(assign, minlength=lists)
+            # An empty list keeps its old centroid rather than collapsing to zero
+            centroids = np.where(counts[:, None] > 0, sums, centroids)
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        assign = np.empty(n, np.int32)
+        for start in range(0, n, _BLOCK):
+            end = min(n, start + _BLOCK)
+            assign[start:end] = np.argmax(vectors[start:end].astype(np.float32) @ centroids.T, axis=1)
+        rows = np.argsort(assign, kind="stable").astype(np.int32)
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=lists))]).astype(np.int64)
+        tmp = self._ivf_path + ".tmp.npz"
+        np.savez(tmp, centroids=centroids.astype(np.float32), rows=rows, offsets=offsets, count=np.int64(n))
+        os.replace(tmp, self._ivf_path)
+        self._ivf = self._load_ivf()
+
+    def _map(self) -> tuple[np.ndarray, np.ndarray, int]:
+        with self._lock:
+            n = len(self)
+            if n != self._mapped:
+                self._vectors = np.memmap(self._vectors_path, np.int8, "r", shape=(n, self.dim)) if n else None
+                self._meta = np.memmap(self._meta_path, _META, "r", shape=(n,)) if n else None
+                self._mapped = n
+            return self._vectors, self._meta, n
+
+    def _truncate(self, n: int) -> None:
+        # Drop a half-written row from an interrupted append before adding more
+        for path, width in ((self._vectors_path, self.dim), (self._meta_path, _META.itemsize)):
+            if os.path.exists(path) and os.path.getsize(path) != n * width:
+                with open(path, "r+b") as f:
+                    f.truncate(n * width)
+
+    def _load_ivf(self) -> dict | None:
+        if not os.path.exists(self._ivf_path):
+            return None
+        with np.load(self._ivf_path) as data:
+            return {
+                "centroids": data["centroids"],
+                "rows": data["rows"],
+                "offsets": data["offsets"],
+                "count": int(data["count"]),
+            }
+
+    def _check_format(self, tag: str) -> None:
+        # Vectors from another embedder (or dimension) are meaningless here: start over
+        path = os.path.join(self._dir, "format.json")
+        expected = {"format": _FORMAT, "dim": self.dim, "tag": tag}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                if json.load(f) == expected:
+                    return
+        except (OSError, ValueError):
+            pass
+        for stale in (self._vectors_path, self._meta_path, self._sum_path, self._ivf_path):
+            if os.path.exists(stale):
+                os.remove(stale)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(expected, f)
+
+
+def _top(scores: np.ndarray, rows: np.ndarray, new_scores: np.ndarray, new_rows: np.ndarray, k: int):
+    scores = np.concatenate([scores, new_scores.astype(np.float32)])
+    rows = np.concatenate([rows, new_rows.astype(np.int64)])
+    if len(scores) > k:
+        keep = np.argpartition(scores, -k)[-k:]
+        scores, rows = scores[keep], rows[keep]
+    return scores, rows
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtWidgets import QApplication
+
+if TYPE_CHECKING:
+    from jp_assist_ai.core.usecases.translate_clipboard import ClipboardTranslation, TranslateClipboard
+
+_RETRY_FIRST_S = 5.0
+_RETRY_MAX_S = 300.0
+
+
+class ClipboardWatcher(QObject):
+    translationReady = Signal(object)  # emits ClipboardTranslation
+    failed = Signal(str)
+
+    def __init__(self, debounce_ms: int = 400, parent: QObject | None = None):
+        super().__init__(parent)
+        self._usecase = None  # type: TranslateClipboard | None
+        # Building the translator failed (e.g. no API key yet): try again after a growing pause
+        self._retry_at = 0.0
+        self._retry_delay = _RETRY_FIRST_S
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._prefetch)
+        QApplication.clipboard().dataChanged.connect(self._timer.start)
+
+    def request_current(self) -> None:
+        # Asked for explicitly: worth another try even while backing off
+        usecase = self._get_usecase(retry_now=True)
+        if usecase is None:
+            self.failed.emit("Translator is not configured.")
+            return
+        text = QApplication.clipboard().text()
+        hit = usecase.cached(text)
+        if hit is not None:
+            self.translationReady.emit(hit)
+            return
+        future = usecase.request(text)
+        if future is None:
+            self.failed.emit("Clipboard has no text.")
+            return
+        future.add_done_callback(self._on_request_done)
+
+    def _prefetch(self) -> None:
+        usecase = self._get_usecase()
+        if usecase is not None:
+            usecase.prefetch(QApplication.clipboard().text())
+
+    def _on_request_done(self, future: Future) -> None:
+        # Runs on the worker thread; signals are queued back to the GUI thread
+        try:
+            result: ClipboardTranslation = future.result()
+        except Exception as exc:
+            self.failed.emit(str(exc))
+            return
+        self.translationReady.emit(result)
+
+    def _get_usecase(self, retry_now: bool = False) -> TranslateClipboard | None:
+        if self._usecase is None and (retry_now or time.monotonic() >= self._retry_at):
+            from jp_assist_ai.services.translate_service import get_clipboard_translator
+
+            try:
+                self._usecase = get_clipboard_translator()
+            except Exception:
+                self._retry_at = time.monotonic() + self._retry_delay
+                self._retry_delay = min(_RETRY_MAX_S, self._retry_delay * 2)
+        return self._usecase
@@ -3,9 +3,11 @@ from __future__ import annotations
 from PySide6.QtWidgets import QApplication
 
 from jp_assist_ai.app.tray import TrayApp
+from jp_assist_ai.config.logging import setup_logging
 
 
 def main():
+    setup_logging()
     app = QApplication([])
     app.setQuitOnLastWindowClosed(False)
     tray = TrayApp()
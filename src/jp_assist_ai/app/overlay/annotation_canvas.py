@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from PySide6.QtCore import Qt, QRect, QPoint
+from PySide6.QtCore import Qt, QRect, QPoint, QSize
 from PySide6.QtGui import QColor, QImage, QPainter, QPen
 from PySide6.QtWidgets import QWidget
 
@@ -20,8 +20,9 @@ class AnnotationCanvas(QWidget):
         self._brush_alpha = 80
         self._pen_width = 14
         self._background = None  # type: QImage | None
-        self._image = QImage(self.size(), QImage.Format_ARGB32_Premultiplied)
-        self._image.fill(Qt.transparent)
+        self._display_size = QSize()
+        # The annotation layer is allocated on the first stroke; most captures are never marked up
+        self._image = None  # type: QImage | None
         self._start = None  # type: QPoint | None
         self._end = None  # type: QPoint | None
         self._last = None  # type: QPoint | None
@@ -56,24 +57,41 @@ class AnnotationCanvas(QWidget):
         return color
 
     def clear(self) -> None:
-        self._image.fill(Qt.transparent)
+        self._image = None
         self.update()
 
-    def set_background(self, image: QImage) -> None:
+    def set_background(self, image: QImage, size: QSize | None = None) -> None:
+        """Show `image` at `size` (its own size by default) and start a fresh annotation layer."""
         self._background = image
-        if not image.isNull():
-            self._image = QImage(image.size(), QImage.Format_ARGB32_Premultiplied)
-            self._image.fill(Qt.transparent)
-            self.resize(image.size())
+        self._display_size = QSize(size) if size is not None else image.size()
+        self._image = None
+        if not self._display_size.isEmpty():
+            self.resize(self._display_size)
+        self.update()
+
+    def swap_background(self, image: QImage) -> None:
+        """Replace the background with another rendering of the same picture, keeping the annotations."""
+        self._background = image
+        self.update()
+
+    def clear_background(self) -> None:
+        self._background = None
+        self._image = None
         self.update()
 
     def background_size(self) -> tuple[int, int]:
         if self._background is None:
             return (0, 0)
-        return (self._background.width(), self._background.height())
+        return (self._display_size.width(), self._display_size.height())
+
+    def _layer(self) -> QImage:
+        if self._image is None:
+            self._image = QImage(self.size(), QImage.Format_ARGB32_Premultiplied)
+            self._image.fill(Qt.transparent)
+        return self._image
 
     def annotation_bounds(self) -> QRect | None:
-        if self._image.isNull():
+        if self._image is None or self._image.isNull():
             return None
         rect = self._image.rect()
         min_x, min_y = rect.right(), rect.bottom()
@@ -92,7 +110,7 @@ class AnnotationCanvas(QWidget):
         return QRect(min_x, min_y, max_x - min_x + 1, max_y - min_y + 1)
 
     def resizeEvent(self, event):
-        if self.width() <= 0 or self.height() <= 0:
+        if self.width() <= 0 or self.height() <= 0 or self._image is None:
             return
         if self._image.size() == event.size():
             return
@@ -137,7 +155,7 @@ class AnnotationCanvas(QWidget):
 
     def _draw_rect(self, start: QPoint, end: QPoint) -> None:
         rect = QRect(start, end).normalized()
-        painter = QPainter(self._image)
+        painter = QPainter(self._layer())
         painter.setRenderHint(QPainter.Antialiasing, True)
         pen = QPen(self._stroke_color())
         pen.setWidth(2)
@@ -149,7 +167,7 @@ class AnnotationCanvas(QWidget):
     def _draw_line(self, start: QPoint | None, end: QPoint) -> None:
         if start is None:
             return
-        painter = QPainter(self._image)
+        painter = QPainter(self._layer())
         painter.setRenderHint(QPainter.Antialiasing, True)
         if self._mode == self.MODE_ERASER:
             painter.setCompositionMode(QPainter.CompositionMode_Clear)
@@ -167,10 +185,16 @@ class AnnotationCanvas(QWidget):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing, True)
         if self._background is not None:
-            painter.drawImage(0, 0, self._background)
+            if self._background.size() == self._display_size:
+                painter.drawImage(0, 0, self._background)
+            else:
+                # Full-resolution frame whose scaled preview was evicted: scale while painting
+                painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+                painter.drawImage(QRect(QPoint(0, 0), self._display_size), self._background)
         painter.setPen(QPen(QColor(0, 180, 255, 200), 2))
         painter.drawRect(self.rect().adjusted(1, 1, -2, -2))
-        painter.drawImage(0, 0, self._image)
+        if self._image is not None:
+            painter.drawImage(0, 0, self._image)
         if self._mode == self.MODE_RECT and self._start and self._end:
             rect = QRect(self._start, self._end).normalized()
             pen = QPen(self._stroke_color())
@@ -180,5 +204,6 @@ class AnnotationCanvas(QWidget):
             painter.drawRect(rect)
         painter.end()
 
-    def export_annotation(self) -> QImage:
-        return self._image.copy()
+    def export_annotation(self) -> QImage | None:
+        """The annotation layer at display size, or None when nothing was drawn."""
+        return self._image.copy() if self._image is not None else None
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import logging
 import os
+import threading
+from concurrent.futures import Future
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Sequence
 
 from PIL import ImageQt, Image
-from PySide6.QtCore import Qt, QPoint, QThread, Signal, QObject, QTimer
-from PySide6.QtGui import QGuiApplication, QScreen
-from PySide6.QtGui import QGuiApplication
+from PySide6.QtCore import Qt, QPoint, QSize, QThread, Signal, QObject, QTimer
+from PySide6.QtGui import QGuiApplication, QImage, QScreen
 from PySide6.QtWidgets import (
     QWidget,
     QHBoxLayout,
@@ -21,8 +24,26 @@ from PySide6.QtWidgets import (
 )
 
 from jp_assist_ai.adapters.capture.mac_capture import capture_region, Region as CapRegion
+from jp_assist_ai.adapters.storage.base import HistoryEntry
 from jp_assist_ai.app.overlay.annotation_canvas import AnnotationCanvas
-from jp_assist_ai.services.translate_service import get_translator
+from jp_assist_ai.config.logging import span
+from jp_assist_ai.core.frames import FrameView, default_budget
+from jp_assist_ai.core.line_index import LineIndex
+from jp_assist_ai.core.models import OcrLine
+from jp_assist_ai.core.near_duplicate import CaptureSignature, signature as capture_signature
+from jp_assist_ai.services.job_queue import INTERACTIVE, encode_png, is_retryable
+from jp_assist_ai.services.translate_service import (
+    get_capture_index,
+    get_job_queue,
+    get_screen_translator,
+    get_store,
+    get_translator,
+    get_worker,
+    history_image_budget,
+    ocr_configured,
+)
+
+_log = logging.getLogger(__name__)
 
 
 @dataclass(frozen=True)
@@ -36,19 +57,136 @@ class _TranslateWorker(QObject):
     finished = Signal(str)
     failed = Signal(str)
 
-    def __init__(self, image: Image.Image, src_lang: str, dst_lang: str):
+    def __init__(
+        self,
+        frame: FrameView | None,
+        src_lang: str,
+        dst_lang: str,
+        lines: Sequence[OcrLine] | None = None,
+        ocr: Future | None = None,
+    ):
         super().__init__()
-        self._image = image
+        self._frame = frame  # owned: released when the translation is done
         self._src = src_lang
         self._dst = dst_lang
+        self._lines = lines  # already recognized: translate these instead of the image
+        self._ocr = ocr  # speculative OCR of the frame still running: wait for it rather than OCR again
 
     def run(self) -> None:
+        lines = self._lines
         try:
-            translator = get_translator()
-            result = translator.translate_image(self._image, self._src, self._dst)
+            signature = self._signature()
+            earlier = self._earlier(signature, image=True)
+            if earlier is not None:
+                # The very same screen: no OCR, no LLM call
+                self.finished.emit(earlier.translation)
+                return
+            if lines is None and self._ocr is not None:
+                try:
+                    index = self._ocr.result()
+                except Exception:
+                    # OCR is only a shortcut here: without it the image goes to the model as before
+                    _log.exception("Speculative OCR failed; translating the image")
+                    index = None
+                lines = index.lines if index else None
+                earlier = self._earlier(signature, text="\n".join(line.text for line in lines)) if lines else None
+                if earlier is not None:
+                    # Same text as an earlier capture, read by OCR: no LLM call
+                    self.finished.emit(earlier.translation)
+                    return
+            worker = get_worker()
+            if lines:
+                with span("translate.lines", lines=len(lines)):
+                    if worker is not None:
+                        result = worker.translate_lines(lines, self._src, self._dst)
+                    else:
+                        result = get_screen_translator().translate_lines(lines, self._src, self._dst).format()
+            elif worker is not None:
+                with span("translate", width=self._frame.width, height=self._frame.height):
+                    result = worker.translate(self._frame, self._src, self._dst)
+            else:
+                image = self._frame.image()
+                with span("translate", width=image.width, height=image.height):
+                    screen = get_screen_translator()
+                    if screen is not None:
+                        result = screen.execute(image, self._src, self._dst).format()
+                    else:
+                        translator = get_translator()
+                        result = translator.translate_image(image, self._src, self._dst)
             self.finished.emit(result)
+            self._record(result, lines, signature)
         except Exception as exc:
-            self.failed.emit(str(exc))
+            self.failed.emit(self._queue(exc, lines))
+        finally:
+            if self._frame is not None:
+                self._frame.release()
+
+    def _signature(self) -> CaptureSignature | None:
+        if self._frame is None or self._lines is not None or get_capture_index() is None:
+            return None
+        with span("near_duplicate.signature", width=self._frame.width, height=self._frame.height):
+            return capture_signature(self._frame.image())
+
+    def _earlier(
+        self, signature: CaptureSignature | None, image: bool = False, text: str | None = None
+    ) -> HistoryEntry | None:
+        if signature is None:
+            return None
+        with span("near_duplicate.lookup"):
+            return get_capture_index().find(
+                signature, self._src, self._dst, image=self._frame.image() if image else None, text=text
+            )
+
+    def _record(self, result: str, lines: Sequence[OcrLine] | None, signature: CaptureSignature | None) -> None:
+        source = "\n".join(line.text for line in lines) if lines else None
+        try:
+            with span("history.record"):
+                budget = history_image_budget()
+                image = encode_png(self._frame.image()) if self._frame is not None and budget > 0 else None
+                entry = get_store().add_history(self._src, self._dst, result, source=source, image=image)
+                if image is not None:
+                    get_store().prune_history_images(budget)
+                if signature is not None:
+                    get_capture_index().add(entry, signature)
+        except Exception:
+            _log.exception("Could not record the translation in history")
+
+    def _queue(self, exc: Exception, lines: Sequence[OcrLine] | None) -> str:
+        """Keep a capture the backend could not take right now; the message to show instead."""
+        queue = get_job_queue()
+        if queue is None or not is_retryable(exc):
+            return str(exc)
+        try:
+            if lines:
+                queue.submit_lines([line.text for line in lines], self._src, self._dst, priority=INTERACTIVE)
+            elif self._frame is not None:
+                queue.submit_image(self._frame.image(), self._src, self._dst, priority=INTERACTIVE)
+            else:
+                return str(exc)
+        except Exception:
+            _log.exception("Could not queue the translation")
+            return str(exc)
+        return f"{exc}\n\nQueued: it will be translated when the backend is back, and show up in history."
+
+
+def _speculative_ocr(frame: FrameView, future: Future) -> None:
+    """OCR a capture while the user is still looking at it, so highlights can be answered from its lines."""
+    try:
+        if not ocr_configured():
+            future.set_result(None)
+            return
+        worker = get_worker()
+        with span("ocr.speculative", width=frame.width, height=frame.height):
+            if worker is not None:
+                lines = worker.recognize(frame)
+            else:
+                screen = get_screen_translator()
+                lines = screen.recognize(frame.image()) if screen is not None else None
+        future.set_result(LineIndex(lines) if lines is not None else None)
+    except Exception as exc:
+        future.set_exception(exc)
+    finally:
+        frame.release()
 
 
 class _DragHandle(QLabel):
@@ -76,6 +214,8 @@ class _DragHandle(QLabel):
 
 
 class FloatingCaptureWindow(QWidget):
+    _previewEvicted = Signal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("JP Assist AI")
@@ -86,8 +226,14 @@ class FloatingCaptureWindow(QWidget):
 
         self._thread = None
         self._worker = None
-        self._base_image = None  # type: Image.Image | None
+        # Pixels are shared with translation workers; the scaled preview is the window's only copy
+        self._frame = None  # type: FrameView | None
+        self._full_image = None  # type: QImage | None
+        self._preview_key = None  # type: int | None
+        self._budget = default_budget()
+        self._ocr_future = None  # type: Future | None
         self._scale_factor = 1.0
+        self._previewEvicted.connect(self._on_preview_evicted)
 
         self._canvas = AnnotationCanvas()
         self._canvas.setAttribute(Qt.WA_TranslucentBackground, True)
@@ -228,10 +374,11 @@ class FloatingCaptureWindow(QWidget):
         self._btn_screen2.setEnabled(count >= 2)
 
     def _capture_images(self) -> CaptureResult | None:
-        if self._base_image is None:
+        if self._frame is None:
             return None
 
-        raw = self._base_image.copy()
+        # Files stay RGB; this conversion is the only copy and is marked up in place below
+        raw = self._frame.image().convert("RGB")
 
         os.makedirs("tmp", exist_ok=True)
         stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -240,23 +387,16 @@ class FloatingCaptureWindow(QWidget):
 
         marked_path = None
         chat_path = None
-        if self._save_mode.currentIndex() == 1:
-            marked = raw.copy()
-            overlay = ImageQt.fromqimage(self._canvas.export_annotation())
-            if self._scale_factor != 1.0:
-                overlay = overlay.resize(raw.size, resample=Image.BILINEAR)
-            marked.paste(overlay, (0, 0), overlay)
-            marked_path = os.path.join("tmp", f"capture_{stamp}_marked.png")
-            marked.save(marked_path)
-        elif self._save_mode.currentIndex() == 2:
-            marked = raw.copy()
-            overlay = ImageQt.fromqimage(self._canvas.export_annotation())
-            if self._scale_factor != 1.0:
-                overlay = overlay.resize(raw.size, resample=Image.BILINEAR)
-            marked.paste(overlay, (0, 0), overlay)
+        if self._save_mode.currentIndex() in (1, 2):
+            annotation = self._canvas.export_annotation()
+            if annotation is not None:
+                overlay = ImageQt.fromqimage(annotation)
+                if overlay.size != raw.size:
+                    overlay = overlay.resize(raw.size, resample=Image.BILINEAR)
+                raw.paste(overlay, (0, 0), overlay)
             marked_path = os.path.join("tmp", f"capture_{stamp}_marked.png")
-            marked.save(marked_path)
-
+            raw.save(marked_path)
+        if self._save_mode.currentIndex() == 2:
             pixmap = self.grab()
             chat_path = os.path.join("tmp", f"capture_{stamp}_chat.png")
             pixmap.save(chat_path, "PNG")
@@ -264,24 +404,41 @@ class FloatingCaptureWindow(QWidget):
         return CaptureResult(raw_path=raw_path, marked_path=marked_path, chat_path=chat_path)
 
     def _translate_all(self) -> None:
-        if self._base_image is None:
+        if self._frame is None:
             return
-        self._run_translate(self._base_image.copy())
+        self._run_translate(self._frame.crop((0, 0, self._frame.width, self._frame.height)), ocr=self._ocr_future)
 
     def _translate_highlight(self) -> None:
         bounds = self._canvas.annotation_bounds()
         if bounds is None:
             self._output.setPlainText("No highlighted area to translate.")
             return
-        if self._base_image is None:
+        if self._frame is None:
             return
         if bounds.width() < 5 or bounds.height() < 5:
             return
         x, y, w, h = self._scale_bounds(bounds.x(), bounds.y(), bounds.width(), bounds.height())
-        crop = self._base_image.crop((x, y, x + w, y + h))
-        self._run_translate(crop)
-
-    def _run_translate(self, image: Image.Image) -> None:
+        index = self._line_index()
+        lines = index.query((x, y, w, h)) if index is not None else []
+        if lines:
+            # Text under the highlight is already known: a text request, or none at all if it was translated before
+            self._run_translate(None, lines=lines)
+        else:
+            # OCR not done (or found nothing there): let the vision model read the crop
+            self._run_translate(self._frame.crop((x, y, x + w, y + h)))
+
+    def _line_index(self) -> LineIndex | None:
+        future = self._ocr_future
+        if future is None or not future.done() or future.exception() is not None:
+            return None
+        return future.result()
+
+    def _run_translate(
+        self,
+        frame: FrameView | None,
+        lines: Sequence[OcrLine] | None = None,
+        ocr: Future | None = None,
+    ) -> None:
         self._output.setPlainText("Translating...")
 
         if self._thread is not None:
@@ -290,9 +447,11 @@ class FloatingCaptureWindow(QWidget):
 
         self._thread = QThread()
         self._worker = _TranslateWorker(
-            image=image,
+            frame=frame,
             src_lang=self._src_lang.currentText(),
             dst_lang=self._dst_lang.currentText(),
+            lines=lines,
+            ocr=ocr,
         )
         self._worker.moveToThread(self._thread)
         self._thread.started.connect(self._worker.run)
@@ -303,13 +462,15 @@ class FloatingCaptureWindow(QWidget):
         self._thread.start()
 
     def _on_translation_done(self, text: str) -> None:
-        self._output.setPlainText(text)
+        with span("render.output", chars=len(text)):
+            self._output.setPlainText(text)
 
     def _on_translation_error(self, msg: str) -> None:
         self._output.setPlainText(f"Translation failed: {msg}")
 
-    def open_with_image(self, image: Image.Image, screen: QScreen | None) -> None:
-        self._base_image = image
+    def open_with_image(self, image: Image.Image | FrameView, screen: QScreen | None) -> None:
+        """Show a capture. A FrameView is taken over (the window releases it); a PIL image is copied once."""
+        frame = image if isinstance(image, FrameView) else FrameView.from_image(image, self._budget)
         if screen is None:
             screen = QGuiApplication.primaryScreen()
         geo = screen.availableGeometry()
@@ -321,12 +482,30 @@ class FloatingCaptureWindow(QWidget):
         )
         max_canvas_w = max(200, geo.width() - 40)
         max_canvas_h = max(200, geo.height() - controls_height)
-        scale = min(1.0, max_canvas_w / image.width, max_canvas_h / image.height)
+        scale = min(1.0, max_canvas_w / frame.width, max_canvas_h / frame.height)
         self._scale_factor = 1.0 / scale if scale > 0 else 1.0
-        disp_w = int(image.width * scale)
-        disp_h = int(image.height * scale)
-        qt_image = ImageQt.ImageQt(image).scaled(disp_w, disp_h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        self._canvas.set_background(qt_image)
+        disp_w = int(frame.width * scale)
+        disp_h = int(frame.height * scale)
+        with span("preview.scale", width=frame.width, height=frame.height):
+            # Wraps the shared pixels; only the scaled preview is new memory
+            full = QImage(frame.memory(), frame.width, frame.height, frame.stride, QImage.Format_RGBA8888)
+            preview = full
+            if (disp_w, disp_h) != frame.size:
+                preview = full.scaled(disp_w, disp_h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        old = self._release_frame()
+        self._frame, self._full_image = frame, full
+        self._canvas.set_background(preview, QSize(disp_w, disp_h))
+        if preview is not full:
+            self._preview_key = self._budget.add_preview(preview.sizeInBytes(), self._previewEvicted.emit)
+        if old is not None:
+            old.release()
+        self._ocr_future = Future()
+        threading.Thread(
+            target=_speculative_ocr,
+            args=(frame.crop((0, 0, frame.width, frame.height)), self._ocr_future),
+            name="speculative-ocr",
+            daemon=True,
+        ).start()
         self._canvas.setMinimumSize(disp_w, disp_h)
         self.resize(self.sizeHint())
         x = geo.x() + (geo.width() - self.width()) // 2
@@ -342,11 +521,33 @@ class FloatingCaptureWindow(QWidget):
         sy = int(y * self._scale_factor)
         sw = int(w * self._scale_factor)
         sh = int(h * self._scale_factor)
-        if self._base_image is None:
+        if self._frame is None:
             return sx, sy, sw, sh
-        max_w, max_h = self._base_image.size
+        max_w, max_h = self._frame.size
         sx = max(0, min(sx, max_w - 1))
         sy = max(0, min(sy, max_h - 1))
         sw = max(1, min(sw, max_w - sx))
         sh = max(1, min(sh, max_h - sy))
         return sx, sy, sw, sh
+
+    def _on_preview_evicted(self) -> None:
+        # Over the memory budget: paint straight from the shared frame instead of a scaled copy
+        if self._full_image is not None:
+            self._preview_key = None
+            self._canvas.swap_background(self._full_image)
+
+    def _release_frame(self) -> FrameView | None:
+        """Forget the current frame and hand it back for the caller to release once nothing paints it."""
+        if self._preview_key is not None:
+            self._budget.remove_preview(self._preview_key)
+            self._preview_key = None
+        frame, self._frame, self._full_image = self._frame, None, None
+        return frame
+
+    def closeEvent(self, event):
+        self._ocr_future = None
+        frame = self._release_frame()
+        self._canvas.clear_background()
+        if frame is not None:
+            frame.release()
+        super().closeEvent(event)
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-from PySide6.QtCore import Qt, QRect, Signal
-from PySide6.QtGui import QColor, QPainter, QPen
+from PySide6.QtCore import Qt, QPoint, QRect, QRectF, Signal
+from PySide6.QtGui import QColor, QImage, QPainter, QPen, QRegion
 from PySide6.QtWidgets import QWidget
 from PySide6.QtGui import QGuiApplication
 
+if TYPE_CHECKING:
+    from jp_assist_ai.adapters.capture.mac_capture import FrozenFrame
+    from jp_assist_ai.app.overlay.selection_aids import ScreenThumbnail
+
 
 @dataclass(frozen=True)
 class Region:
@@ -16,37 +21,72 @@ class Region:
     h: int
 
 
+def _lens_rect(x: int, y: int, size: int, bounds: QRect) -> QRect:
+    # Below-right of the cursor, flipped at screen edges
+    offset = 24
+    lx = x + offset if x + offset + size <= bounds.width() else x - offset - size
+    ly = y + offset if y + offset + size <= bounds.height() else y - offset - size
+    return QRect(lx, ly, size, size)
+
+
 class _FrameOverlay(QWidget):
     regionSelected = Signal(object)
     cancelled = Signal()
 
-    def __init__(self, screen_geo: QRect):
+    _LENS_SIZE = 128
+    _LENS_ZOOM = 4
+
+    def __init__(
+        self,
+        screen_geo: QRect,
+        frozen: QImage | None = None,
+        source: QRectF | None = None,
+        thumbnail: ScreenThumbnail | None = None,
+        magnifier: bool = False,
+        snapping: bool = False,
+    ):
         super().__init__()
         self.setWindowFlags(
             Qt.WindowStaysOnTopHint
             | Qt.FramelessWindowHint
             | Qt.Tool
         )
-        self.setAttribute(Qt.WA_TranslucentBackground, True)
+        # Over a frozen frame the overlay is opaque and paints the grabbed pixels itself
+        self._frozen = frozen
+        self._source = source
+        self._thumbnail = thumbnail
+        self._magnifier = magnifier and thumbnail is not None
+        self._snapping = snapping and thumbnail is not None
+        self.setAttribute(Qt.WA_TranslucentBackground, frozen is None)
+        self.setAttribute(Qt.WA_OpaquePaintEvent, frozen is not None)
         self.setAttribute(Qt.WA_MacAlwaysShowToolWindow, True)
+        self.setMouseTracking(self._magnifier)
         self.setCursor(Qt.CrossCursor)
         self.setGeometry(screen_geo)
 
         self._start = None  # type: tuple[int, int] | None
         self._end = None  # type: tuple[int, int] | None
+        self._snapped = (False, False)
+        self._cursor = None  # type: QPoint | None
+        # What was painted last time; a move only repaints old + new
+        self._painted_rect = QRect()
+        self._painted_lens = QRect()
 
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             p = event.globalPosition()
             self._start = (int(p.x()), int(p.y()))
             self._end = self._start
-            self.update()
+            self._snapped = (False, False)
+            self._cursor = event.position().toPoint()
+            self._invalidate()
 
     def mouseMoveEvent(self, event):
+        self._cursor = event.position().toPoint()
         if self._start is not None:
             p = event.globalPosition()
-            self._end = (int(p.x()), int(p.y()))
-            self.update()
+            self._end = self._snap(int(p.x()), int(p.y()))
+        self._invalidate()
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.LeftButton and self._start and self._end:
@@ -66,6 +106,31 @@ class _FrameOverlay(QWidget):
         if event.key() == Qt.Key_Escape:
             self.cancelled.emit()
 
+    def _snap(self, x: int, y: int) -> tuple[int, int]:
+        if not self._snapping or QGuiApplication.keyboardModifiers() & Qt.AltModifier:
+            self._snapped = (False, False)
+            return x, y
+        gx, gy = self.geometry().left(), self.geometry().top()
+        sx, sy, snap_x, snap_y = self._thumbnail.snap(x - gx, y - gy, (self._start[0] - gx, self._start[1] - gy))
+        self._snapped = (snap_x, snap_y)
+        return sx + gx, sy + gy
+
+    def _invalidate(self) -> None:
+        rect = self._rect() or QRect()
+        lens = self._lens_rect()
+        dirty = QRegion()
+        for r in (self._painted_rect, rect):
+            if not r.isNull():
+                # The pen straddles the edge
+                dirty += r.adjusted(-2, -2, 2, 2)
+        for r in (self._painted_lens, lens):
+            if not r.isNull():
+                dirty += r.adjusted(-1, -1, 1, 1)
+        self._painted_rect = rect
+        self._painted_lens = lens
+        if not dirty.isEmpty():
+            self.update(dirty)
+
     def _rect(self) -> QRect | None:
         if not (self._start and self._end):
             return None
@@ -87,35 +152,120 @@ class _FrameOverlay(QWidget):
             int(abs(y2 - y1)),
         )
 
-    def paintEvent(self, _event):
+    def _lens_rect(self) -> QRect:
+        if not self._magnifier or self._cursor is None:
+            return QRect()
+        return _lens_rect(self._cursor.x(), self._cursor.y(), self._LENS_SIZE, self.rect())
+
+    def _source_rect(self, rect: QRect) -> QRectF:
+        sx = self._source.width() / max(1, self.width())
+        sy = self._source.height() / max(1, self.height())
+        return QRectF(
+            self._source.x() + rect.x() * sx,
+            self._source.y() + rect.y() * sy,
+            rect.width() * sx,
+            rect.height() * sy,
+        )
+
+    def paintEvent(self, event):
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing, True)
+        dirty = event.rect()
         rect = self._rect()
+        if self._frozen is not None:
+            painter.drawImage(QRectF(dirty), self._frozen, self._source_rect(dirty))
+            painter.fillRect(dirty, QColor(0, 0, 0, 80))
+            if rect:
+                # Selection shows the frozen pixels undimmed
+                visible = rect.intersected(dirty)
+                if not visible.isEmpty():
+                    painter.drawImage(QRectF(visible), self._frozen, self._source_rect(visible))
+        painter.setRenderHint(QPainter.Antialiasing, True)
         if rect:
             pen = QPen(QColor(0, 180, 255, 230))
             pen.setWidth(2)
             painter.setPen(pen)
             painter.drawRect(rect)
+            self._paint_snapped_edges(painter, rect)
+        lens = self._lens_rect()
+        if not lens.isNull() and lens.intersects(dirty):
+            self._paint_lens(painter, lens)
+
+    def _paint_snapped_edges(self, painter: QPainter, rect: QRect) -> None:
+        snap_x, snap_y = self._snapped
+        if not (snap_x or snap_y):
+            return
+        pen = QPen(QColor(255, 170, 0, 240))
+        pen.setWidth(2)
+        painter.setPen(pen)
+        end_x = self._end[0] - self.geometry().left()
+        end_y = self._end[1] - self.geometry().top()
+        if snap_x:
+            painter.drawLine(end_x, rect.top(), end_x, rect.bottom())
+        if snap_y:
+            painter.drawLine(rect.left(), end_y, rect.right(), end_y)
+
+    def _paint_lens(self, painter: QPainter, lens: QRect) -> None:
+        span_pts = self._LENS_SIZE // self._LENS_ZOOM
+        source = QRect(self._cursor.x() - span_pts // 2, self._cursor.y() - span_pts // 2, span_pts, span_pts)
+        painter.save()
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, False)
+        painter.fillRect(lens, QColor(0, 0, 0))
+        painter.drawImage(lens, self._thumbnail.image, source)
+        pen = QPen(QColor(255, 255, 255, 220))
+        pen.setWidth(1)
+        painter.setPen(pen)
+        painter.drawRect(lens)
+        c = lens.center()
+        painter.setPen(QPen(QColor(0, 180, 255, 230)))
+        painter.drawLine(c.x() - 6, c.y(), c.x() + 6, c.y())
+        painter.drawLine(c.x(), c.y() - 6, c.x(), c.y() + 6)
+        painter.restore()
 
 
 class RegionFrameSelector(QWidget):
     regionSelected = Signal(object)
 
-    def __init__(self):
+    def __init__(self, frame: FrozenFrame | None = None, magnifier: bool = False, snapping: bool = False):
         super().__init__()
         self.setAttribute(Qt.WA_DeleteOnClose, True)
         self._overlays: list[_FrameOverlay] = []
+        self._frame = frame
+        self._magnifier = magnifier
+        self._snapping = snapping
+        self._frozen = None  # type: QImage | None
+        if frame is not None:
+            # Wraps the grabbed BGRA buffer without copying; self._frame keeps it alive
+            self._frozen = QImage(frame.bgra, frame.width, frame.height, frame.width * 4, QImage.Format_RGB32)
 
         screens = QGuiApplication.screens()
         if not screens:
-            ov = _FrameOverlay(QGuiApplication.primaryScreen().geometry())
+            ov = self._make_overlay(QGuiApplication.primaryScreen().geometry())
             self._attach_overlay(ov)
             return
 
         for s in screens:
-            ov = _FrameOverlay(s.geometry())
+            ov = self._make_overlay(s.geometry())
             self._attach_overlay(ov)
 
+    def _make_overlay(self, geo: QRect) -> _FrameOverlay:
+        if self._frame is None:
+            return _FrameOverlay(geo)
+        screen = Region(geo.x(), geo.y(), geo.width(), geo.height())
+        x1, y1, x2, y2 = self._frame.pixel_box(screen)
+        thumbnail = None
+        if self._magnifier or self._snapping:
+            from jp_assist_ai.app.overlay.selection_aids import ScreenThumbnail
+
+            thumbnail = ScreenThumbnail(self._frame.view(screen), geo.width(), geo.height())
+        return _FrameOverlay(
+            geo,
+            self._frozen,
+            QRectF(x1, y1, x2 - x1, y2 - y1),
+            thumbnail,
+            magnifier=self._magnifier,
+            snapping=self._snapping,
+        )
+
     def _attach_overlay(self, ov: _FrameOverlay) -> None:
         ov.regionSelected.connect(self._on_region_selected)
         ov.cancelled.connect(self.close)
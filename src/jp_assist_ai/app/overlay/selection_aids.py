@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import numpy as np
+from PySide6.QtGui import QImage
+
+_INK_THRESHOLD = 40
+
+
+class ScreenThumbnail:
+    """
+    One screen's slice of a frozen frame, resampled to screen points.
+
+    Magnifier and snapping both work in the coordinates the selection uses,
+    so they share this one downscaled copy instead of touching the full
+    Retina-resolution grab on every mouse move.
+    """
+
+    def __init__(self, pixels: np.ndarray, width: int, height: int):
+        rows = ((np.arange(height) + 0.5) * pixels.shape[0] / height).astype(np.intp)
+        cols = ((np.arange(width) + 0.5) * pixels.shape[1] / width).astype(np.intp)
+        self.bgra = np.ascontiguousarray(pixels[rows][:, cols])
+        self.image = QImage(self.bgra.data, width, height, width * 4, QImage.Format_RGB32)
+
+        b, g, r = (self.bgra[:, :, i].astype(np.int32) for i in range(3))
+        luma = (r * 77 + g * 150 + b * 29) >> 8
+        background = int(np.median(luma[:: max(1, height // 64), :: max(1, width // 64)]))
+        self.ink = np.abs(luma - background) > _INK_THRESHOLD
+
+    def snap(self, x: int, y: int, anchor: tuple[int, int], radius: int = 8) -> tuple[int, int, bool, bool]:
+        """Move (x, y) onto the nearest content edge within radius; returns which axes snapped."""
+        ax, ay = anchor
+        h, w = self.ink.shape
+        y1, y2 = sorted((_clip(ay, 0, h - 1), _clip(y, 0, h - 1)))
+        x1, x2 = sorted((_clip(ax, 0, w - 1), _clip(x, 0, w - 1)))
+        sx = _snap_axis(self.ink[y1 : y2 + 1].any(axis=0), x, x > ax, radius)
+        sy = _snap_axis(self.ink[:, x1 : x2 + 1].any(axis=1), y, y > ay, radius)
+        return (
+            x if sx is None else sx,
+            y if sy is None else sy,
+            sx is not None,
+            sy is not None,
+        )
+
+
+def _snap_axis(profile: np.ndarray, pos: int, forward: bool, radius: int) -> int | None:
+    n = len(profile)
+    lo = _clip(pos - radius, 1, n - 1)
+    hi = _clip(pos + radius + 1, 1, n - 1)
+    if lo >= hi:
+        return None
+    blank = ~profile[lo:hi]
+    # Dragging forward, the edge is the first blank line after content; backwards, the last one before it
+    inside = profile[lo - 1 : hi - 1] if forward else profile[lo + 1 : hi + 1]
+    if len(inside) != len(blank):
+        return None
+    edges = np.flatnonzero(blank & inside) + lo
+    if not len(edges):
+        return None
+    return int(edges[np.argmin(np.abs(edges - pos))])
+
+
+def _clip(val: int, lo: int, hi: int) -> int:
+    return max(lo, min(val, hi))
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from PySide6.QtCore import Qt, QThread, QTimer, Signal, QObject
+from PySide6.QtWidgets import (
+    QLabel,
+    QLineEdit,
+    QListWidget,
+    QListWidgetItem,
+    QSplitter,
+    QTextEdit,
+    QVBoxLayout,
+    QWidget,
+)
+
+from jp_assist_ai.adapters.storage.base import HistoryEntry
+from jp_assist_ai.services.history_search import searchable_text
+from jp_assist_ai.services.translate_service import get_history_search, get_store
+
+_RECENT = 100
+_RESULTS = 50
+_DEBOUNCE_MS = 250
+
+
+class _SearchWorker(QObject):
+    finished = Signal(str, object)
+    failed = Signal(str)
+
+    def __init__(self, query: str):
+        super().__init__()
+        self._query = query
+
+    def run(self) -> None:
+        try:
+            if not self._query.strip():
+                self.finished.emit(self._query, get_store().history(limit=_RECENT))
+                return
+            search = get_history_search()
+            search.sync()
+            self.finished.emit(self._query, [entry for entry, _ in search.search(self._query, _RESULTS)])
+        except Exception as exc:
+            self.failed.emit(str(exc))
+
+
+class HistoryWindow(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Translation history")
+        self.setWindowFlag(Qt.WindowStaysOnTopHint, True)
+        self.setMinimumSize(720, 480)
+
+        self._thread = None
+        self._worker = None
+        self._pending: str | None = None
+
+        root = QVBoxLayout(self)
+
+        self._query = QLineEdit()
+        self._query.setPlaceholderText("Search past translations, e.g. where did I see the spec about batch retries?")
+        self._query.setClearButtonEnabled(True)
+        root.addWidget(self._query)
+
+        self._status = QLabel("")
+        root.addWidget(self._status)
+
+        splitter = QSplitter(Qt.Horizontal)
+        self._results = QListWidget()
+        self._detail = QTextEdit()
+        self._detail.setReadOnly(True)
+        splitter.addWidget(self._results)
+        splitter.addWidget(self._detail)
+        splitter.setStretchFactor(1, 1)
+        root.addWidget(splitter, 1)
+
+        # Search once typing pauses, not on every key
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._search)
+        self._query.textChanged.connect(self._debounce.start)
+        self._query.returnPressed.connect(self._search)
+        self._results.currentItemChanged.connect(self._show_entry)
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self._search()
+
+    def _search(self) -> None:
+        self._debounce.stop()
+        query = self._query.text()
+        if self._thread is not None and self._thread.isRunning():
+            # One search at a time; the latest query runs when this one is done
+            self._pending = query
+            return
+        self._pending = None
+        self._status.setText("Searching..." if query.strip() else "Loading recent translations...")
+
+        self._thread = QThread()
+        self._worker = _SearchWorker(query)
+        self._worker.moveToThread(self._thread)
+        self._thread.started.connect(self._worker.run)
+        self._worker.finished.connect(self._on_done)
+        self._worker.failed.connect(self._on_error)
+        self._worker.finished.connect(self._thread.quit)
+        self._worker.failed.connect(self._thread.quit)
+        self._thread.finished.connect(self._run_pending)
+        self._thread.start()
+
+    def _run_pending(self) -> None:
+        if self._pending is not None:
+            self._search()
+
+    def _on_done(self, query: str, results: list[HistoryEntry]) -> None:
+        if self._pending is not None:
+            return
+        self._results.clear()
+        self._detail.clear()
+        for entry in results:
+            item = QListWidgetItem(_summary(entry))
+            item.setData(Qt.UserRole, entry)
+            self._results.addItem(item)
+        if query.strip():
+            self._status.setText(f"{len(results)} matches" if results else "No matches")
+        else:
+            self._status.setText(f"{len(results)} most recent")
+        if results:
+            self._results.setCurrentRow(0)
+
+    def _on_error(self, msg: str) -> None:
+        self._status.setText(f"Search failed: {msg}")
+
+    def _show_entry(self, item: QListWidgetItem | None) -> None:
+        if item is None:
+            self._detail.clear()
+            return
+        entry: HistoryEntry = item.data(Qt.UserRole)
+        when = datetime.fromtimestamp(entry.created_at).strftime("%Y-%m-%d %H:%M")
+        self._detail.setPlainText(f"{when}  {entry.src_lang} -> {entry.dst_lang}\n\n{entry.translation}")
+
+
+def _summary(entry: HistoryEntry) -> str:
+    when = datetime.fromtimestamp(entry.created_at).strftime("%m-%d %H:%M")
+    text = " ".join(searchable_text(entry).split())
+    if len(text) > 60:
+        text = text[:59] + "…"
+    return f"{when}  {text}"
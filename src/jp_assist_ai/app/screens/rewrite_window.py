@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import html
+
+from PySide6.QtCore import Qt, QThread, Signal, QObject
+from PySide6.QtWidgets import (
+    QComboBox,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QTabWidget,
+    QTextEdit,
+    QVBoxLayout,
+    QWidget,
+)
+
+from jp_assist_ai.core.usecases.rewrite_japanese import STYLES, RewriteResult
+from jp_assist_ai.services.rewrite_service import get_rewriter
+
+
+class _RewriteWorker(QObject):
+    finished = Signal(object)
+    failed = Signal(str)
+
+    def __init__(self, text: str, style: str):
+        super().__init__()
+        self._text = text
+        self._style = style
+
+    def run(self) -> None:
+        try:
+            self.finished.emit(get_rewriter().execute(self._text, self._style))
+        except Exception as exc:
+            self.failed.emit(str(exc))
+
+
+class RewriteWindow(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Rewrite Japanese")
+        self.setWindowFlag(Qt.WindowStaysOnTopHint, True)
+        self.setMinimumSize(640, 480)
+
+        self._thread = None
+        self._worker = None
+
+        root = QVBoxLayout(self)
+
+        top = QHBoxLayout()
+        top.addWidget(QLabel("Style:"))
+        self._style = QComboBox()
+        self._style.addItems(list(STYLES))
+        top.addWidget(self._style)
+        top.addStretch(1)
+        self._btn_rewrite = QPushButton("Rewrite")
+        top.addWidget(self._btn_rewrite)
+        root.addLayout(top)
+
+        self._input = QTextEdit()
+        self._input.setAcceptRichText(False)
+        self._input.setPlaceholderText("Paste a Japanese draft here.")
+        root.addWidget(self._input, 1)
+
+        self._tabs = QTabWidget()
+        self._output = QTextEdit()
+        self._output.setReadOnly(True)
+        self._diff = QTextEdit()
+        self._diff.setReadOnly(True)
+        self._tabs.addTab(self._output, "Rewrite")
+        self._tabs.addTab(self._diff, "Diff")
+        root.addWidget(self._tabs, 1)
+
+        self._btn_rewrite.clicked.connect(self._rewrite)
+
+    def _rewrite(self) -> None:
+        text = self._input.toPlainText()
+        if not text.strip():
+            return
+        self._btn_rewrite.setEnabled(False)
+        self._output.setPlainText("Rewriting...")
+        self._diff.clear()
+
+        self._thread = QThread()
+        self._worker = _RewriteWorker(text, self._style.currentText())
+        self._worker.moveToThread(self._thread)
+        self._thread.started.connect(self._worker.run)
+        self._worker.finished.connect(self._on_done)
+        self._worker.failed.connect(self._on_error)
+        self._worker.finished.connect(self._thread.quit)
+        self._worker.failed.connect(self._thread.quit)
+        self._thread.start()
+
+    def _on_done(self, result: RewriteResult) -> None:
+        self._btn_rewrite.setEnabled(True)
+        self._output.setPlainText(result.text)
+        self._diff.setHtml(_diff_html(result))
+
+    def _on_error(self, msg: str) -> None:
+        self._btn_rewrite.setEnabled(True)
+        self._output.setPlainText(f"Rewrite failed: {msg}")
+
+
+def _diff_html(result: RewriteResult) -> str:
+    parts: list[str] = []
+    for tag, a1, a2, b1, b2 in result.opcodes():
+        if tag == "equal":
+            parts.append(html.escape(result.source[a1:a2]))
+            continue
+        if a2 > a1:
+            parts.append(f'<span style="background:#ffd7d5;text-decoration:line-through">{html.escape(result.source[a1:a2])}</span>')
+        if b2 > b1:
+            parts.append(f'<span style="background:#ccffd8">{html.escape(result.text[b1:b2])}</span>')
+    body = "".join(parts).replace("\n", "<br>")
+    return f"<div style='white-space:pre-wrap'>{body}</div>"
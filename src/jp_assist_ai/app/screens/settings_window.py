@@ -13,7 +13,7 @@ from PySide6.QtWidgets import (
 
 
 class SettingsWindow(QDialog):
-    def __init__(self, hotkey: str):
+    def __init__(self, hotkey: str, clipboard_hotkey: str = ""):
         super().__init__()
         self.setWindowTitle("Settings")
         self.setMinimumWidth(360)
@@ -30,6 +30,14 @@ class SettingsWindow(QDialog):
         row.addWidget(self._edit)
         root.addLayout(row)
 
+        clip_row = QHBoxLayout()
+        clip_row.addWidget(QLabel("Clipboard hotkey:"))
+        self._clip_edit = QKeySequenceEdit()
+        if clipboard_hotkey:
+            self._clip_edit.setKeySequence(QKeySequence(clipboard_hotkey))
+        clip_row.addWidget(self._clip_edit)
+        root.addLayout(clip_row)
+
         buttons = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Cancel)
         buttons.accepted.connect(self.accept)
         buttons.rejected.connect(self.reject)
@@ -37,3 +45,6 @@ class SettingsWindow(QDialog):
 
     def selected_hotkey(self) -> str:
         return self._edit.keySequence().toString()
+
+    def selected_clipboard_hotkey(self) -> str:
+        return self._clip_edit.keySequence().toString()
@@ -1,6 +1,14 @@
 from __future__ import annotations
 
-from PySide6.QtCore import QObject, QPoint
+import importlib
+import logging
+import os
+import threading
+import time
+from dataclasses import replace
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QObject, QPoint, Signal
 from PySide6.QtGui import QIcon, QAction, QGuiApplication
 from PySide6.QtCore import QTimer
 from PySide6.QtWidgets import (
@@ -12,25 +20,141 @@ from PySide6.QtWidgets import (
     QMessageBox,
 )
 
-from jp_assist_ai.app.overlay.floating_capture_window import FloatingCaptureWindow
+from jp_assist_ai.app.clipboard_watcher import ClipboardWatcher
+from jp_assist_ai.app.overlay.overlay_window import OverlayWindow
 from jp_assist_ai.app.overlay.region_frame_selector import RegionFrameSelector, Region as UiRegion
-from jp_assist_ai.adapters.capture.mac_capture import capture_region, Region as CapRegion
 from jp_assist_ai.app.screens.settings_window import SettingsWindow
 from jp_assist_ai.app.startup import set_start_at_login
-from jp_assist_ai.config.settings import AppSettings, load_settings, save_settings
+from jp_assist_ai.config.settings import load_settings, save_settings
 from jp_assist_ai.adapters.hotkeys.mac_hotkeys import GlobalHotkey
+from jp_assist_ai.config.logging import record_span, span, stage_stats, tracing_enabled
+from jp_assist_ai.core.budget import start_of_day
 
+# Everything below pulls in PIL / openai / jinja2 (and paddleocr when enabled).
+# It is imported on first use or by the warm-up thread once the tray icon is up.
+if TYPE_CHECKING:
+    from jp_assist_ai.adapters.capture.mac_capture import FrozenFrame
+    from jp_assist_ai.app.overlay.floating_capture_window import FloatingCaptureWindow
+    from jp_assist_ai.app.screens.history_window import HistoryWindow
+    from jp_assist_ai.app.screens.rewrite_window import RewriteWindow
+
+_WARM_UP_MODULES = (
+    "jp_assist_ai.adapters.capture.mac_capture",
+    "jp_assist_ai.app.overlay.floating_capture_window",
+    "jp_assist_ai.app.screens.rewrite_window",
+    "jp_assist_ai.services.translate_service",
+    "jp_assist_ai.core.usecases.translate_clipboard",
+)
+_WARM_UP_DELAY_MS = 500
+
+_log = logging.getLogger(__name__)
+
+
+def _warm_up() -> None:
+    with span("startup.warm_up"):
+        try:
+            for name in _WARM_UP_MODULES:
+                importlib.import_module(name)
+            from jp_assist_ai.core.prompts.templates import get_prompts
+            from jp_assist_ai.services.translate_service import get_ocr_engine, get_worker
+
+            get_prompts()
+            worker = get_worker()
+            # With a worker process the OCR model is loaded there, not here
+            if worker is not None:
+                worker.start()
+            else:
+                get_ocr_engine()
+        except Exception:
+            _log.exception("Background warm-up failed")
+
+
+def _import_main_thread_modules() -> None:
+    # tesserocr installs signal handlers on import, which only the main thread may do;
+    # with the worker process it is loaded there instead
+    if os.getenv("JP_ASSIST_OCR", "").lower() == "tesseract" and os.getenv("JP_ASSIST_WORKER_PROCESS", "1") == "0":
+        importlib.import_module("tesserocr")
+
+
+class _SpeculativeWarmUp:
+    """
+    Warms the backend on a worker thread while the user drags a selection,
+    then records how much of the warm-up the drag hid (capture.warm_up.hidden)
+    and how much the first request still had to wait for (capture.warm_up.exposed).
+    """
 
-class _CaptureController(QObject):
     def __init__(self):
+        self._started = time.perf_counter_ns()
+        self._finished: int | None = None
+        self._selected: int | None = None
+        self._cancelled = False
+        self._reported = False
+        self._lock = threading.Lock()
+        threading.Thread(target=self._run, name="capture-warm-up", daemon=True).start()
+
+    @property
+    def done(self) -> bool:
+        return self._finished is not None
+
+    def selected(self) -> None:
+        with self._lock:
+            self._selected = time.perf_counter_ns()
+        self._report()
+
+    def cancelled(self) -> None:
+        with self._lock:
+            if self._selected is None:
+                self._cancelled = True
+
+    def _run(self) -> None:
+        try:
+            with span("capture.warm_up"):
+                for name in _WARM_UP_MODULES:
+                    importlib.import_module(name)
+                from jp_assist_ai.services.translate_service import get_worker, warm_up
+
+                worker = get_worker()
+                if worker is not None:
+                    worker.warm_up()
+                else:
+                    warm_up()
+        except Exception:
+            _log.exception("Capture warm-up failed")
+        with self._lock:
+            self._finished = time.perf_counter_ns()
+        self._report()
+
+    def _report(self) -> None:
+        with self._lock:
+            if self._finished is None or self._selected is None or self._cancelled or self._reported:
+                return
+            self._reported = True
+            finished, selected = self._finished, self._selected
+        hidden_end = min(finished, selected)
+        record_span("capture.warm_up.hidden", self._started, hidden_end - self._started)
+        record_span("capture.warm_up.exposed", selected, finished - selected)
+
+
+class _CaptureController(QObject):
+    def __init__(self, frozen: bool = True, magnifier: bool = False, snapping: bool = False, warm_up: bool = True):
         super().__init__()
+        self.frozen = frozen
+        self.magnifier = magnifier
+        self.snapping = snapping
+        self.warm_up = warm_up
         self._window: FloatingCaptureWindow | None = None
         self._selector: RegionFrameSelector | None = None
+        self._frame: FrozenFrame | None = None
+        self._warm: _SpeculativeWarmUp | None = None
 
     def start_capture(self) -> None:
         if self._selector is not None:
             return
-        selector = RegionFrameSelector()
+        # The user needs a second or more to drag a selection; use it to get the backend ready
+        if self.warm_up and (self._warm is None or self._warm.done):
+            self._warm = _SpeculativeWarmUp()
+        self._frame = self._grab_frame() if self.frozen else None
+        selector = RegionFrameSelector(self._frame, magnifier=self.magnifier, snapping=self.snapping)
         selector.regionSelected.connect(self._on_region)
         selector.destroyed.connect(self._on_selector_destroyed)
         self._selector = selector
@@ -41,54 +165,166 @@ class _CaptureController(QObject):
 
     def _on_selector_destroyed(self) -> None:
         self._selector = None
+        self._frame = None
+        if self._warm is not None:
+            self._warm.cancelled()
+
+    def _grab_frame(self) -> FrozenFrame | None:
+        from jp_assist_ai.adapters.capture.mac_capture import grab_desktop
+
+        try:
+            return grab_desktop()
+        except Exception:
+            _log.exception("Desktop grab failed, selecting over the live screen")
+            return None
 
     def _on_region(self, region: UiRegion) -> None:
+        if self._warm is not None:
+            self._warm.selected()
+        from jp_assist_ai.adapters.capture.mac_capture import capture_region, Region as CapRegion
+        from jp_assist_ai.app.overlay.floating_capture_window import FloatingCaptureWindow
+        from jp_assist_ai.core.frames import default_budget
+
         if self._window is None:
             self._window = FloatingCaptureWindow()
             self._window.destroyed.connect(self._on_window_destroyed)
-        img = capture_region(CapRegion(region.x, region.y, region.w, region.h))
-        screen = QGuiApplication.screenAt(QPoint(region.x, region.y))
-        self._window.open_with_image(img, screen)
+        frame, self._frame = self._frame, None
+        with span("capture_to_preview"):
+            cap_region = CapRegion(region.x, region.y, region.w, region.h)
+            if frame is not None:
+                with span("capture.crop"):
+                    img = frame.crop_view(cap_region, default_budget())
+            else:
+                img = capture_region(cap_region)
+            screen = QGuiApplication.screenAt(QPoint(region.x, region.y))
+            self._window.open_with_image(img, screen)
 
 
 class TrayApp(QObject):
+    # (title, message) from the queue's drainer thread
+    queuedTranslationDone = Signal(str, str)
+
     def __init__(self):
         super().__init__()
         self._settings = load_settings()
-        self._capture = _CaptureController()
+        self._capture = _CaptureController(
+            frozen=self._settings.frozen_selection,
+            magnifier=self._settings.selection_magnifier,
+            snapping=self._settings.selection_snapping,
+            warm_up=os.getenv("JP_ASSIST_WARM_UP", "1") != "0",
+        )
         self._hotkey = GlobalHotkey(self._settings.hotkey, parent=self)
         self._hotkey.activated.connect(self._capture.start_capture)
+        self._clipboard = ClipboardWatcher(parent=self)
+        self._clipboard.translationReady.connect(self._show_clipboard_translation)
+        self._clipboard.failed.connect(self._on_clipboard_failed)
+        self._clipboard_hotkey = GlobalHotkey(self._settings.clipboard_hotkey, parent=self)
+        self._clipboard_hotkey.activated.connect(self._clipboard.request_current)
+        self._overlay: OverlayWindow | None = None
+        self._rewrite_window: RewriteWindow | None = None
+        self._history_window: HistoryWindow | None = None
 
         self._tray = QSystemTrayIcon(self._tray_icon())
         self._tray.setToolTip("JP Assist AI")
 
         menu = QMenu()
         self._action_capture = QAction("Capture region")
+        self._action_clipboard = QAction("Translate clipboard")
+        self._action_rewrite = QAction("Rewrite Japanese...")
+        self._action_history = QAction("Search history...")
         self._action_settings = QAction("Set hotkey...")
         self._action_startup = QAction("Start at login")
         self._action_startup.setCheckable(True)
         self._action_startup.setChecked(self._settings.start_at_login)
+        self._selection_menu = QMenu("Selection")
+        self._action_frozen = QAction("Freeze screen")
+        self._action_frozen.setCheckable(True)
+        self._action_frozen.setChecked(self._settings.frozen_selection)
+        self._action_magnifier = QAction("Magnifier")
+        self._action_magnifier.setCheckable(True)
+        self._action_magnifier.setChecked(self._settings.selection_magnifier)
+        self._action_snapping = QAction("Snap to text")
+        self._action_snapping.setCheckable(True)
+        self._action_snapping.setChecked(self._settings.selection_snapping)
+        # Magnifier and snapping read the frozen pixels
+        self._action_magnifier.setEnabled(self._settings.frozen_selection)
+        self._action_snapping.setEnabled(self._settings.frozen_selection)
+        self._action_usage = QAction("Usage today: -")
+        self._action_usage.setEnabled(False)
+        self._latency_menu = QMenu("Latency (p50 / p95)")
         self._action_quit = QAction("Quit")
 
         self._action_capture.triggered.connect(self._capture.start_capture)
+        self._action_clipboard.triggered.connect(self._clipboard.request_current)
+        self._action_rewrite.triggered.connect(self._open_rewrite)
+        self._action_history.triggered.connect(self._open_history)
         self._action_settings.triggered.connect(self._open_settings)
         self._action_startup.toggled.connect(self._toggle_startup)
+        self._action_frozen.toggled.connect(self._toggle_frozen)
+        self._action_magnifier.toggled.connect(self._toggle_magnifier)
+        self._action_snapping.toggled.connect(self._toggle_snapping)
         self._action_quit.triggered.connect(QApplication.quit)
 
         menu.addAction(self._action_capture)
+        menu.addAction(self._action_clipboard)
+        menu.addAction(self._action_rewrite)
+        menu.addAction(self._action_history)
         menu.addSeparator()
         menu.addAction(self._action_settings)
         menu.addAction(self._action_startup)
+        self._selection_menu.addAction(self._action_frozen)
+        self._selection_menu.addAction(self._action_magnifier)
+        self._selection_menu.addAction(self._action_snapping)
+        menu.addMenu(self._selection_menu)
+        menu.addSeparator()
+        menu.addAction(self._action_usage)
+        self._latency_action = menu.addMenu(self._latency_menu)
+        self._latency_action.setVisible(tracing_enabled())
         menu.addSeparator()
         menu.addAction(self._action_quit)
 
+        menu.aboutToShow.connect(self._refresh_usage)
+        menu.aboutToShow.connect(self._refresh_latency)
+
         self._tray.setContextMenu(menu)
+        self.queuedTranslationDone.connect(self._tray.showMessage)
 
     def show(self) -> None:
         self._tray.show()
         self._ensure_hotkey_registered()
         if self._settings.start_at_login:
             set_start_at_login(True)
+        if os.getenv("JP_ASSIST_WARM_UP", "1") != "0":
+            QTimer.singleShot(_WARM_UP_DELAY_MS, self._start_warm_up)
+        # Translations queued by an earlier run resume without waiting for a capture
+        QTimer.singleShot(_WARM_UP_DELAY_MS, self._start_queue)
+
+    def _start_queue(self) -> None:
+        _import_main_thread_modules()
+        threading.Thread(target=self._resume_queue, name="queue-start", daemon=True).start()
+
+    def _resume_queue(self) -> None:
+        from jp_assist_ai.services.translate_service import get_job_queue
+
+        try:
+            queue = get_job_queue()
+            if queue is None:
+                return
+            queue.add_listener(self._on_queued_done)
+            queue.start()
+        except Exception:
+            _log.exception("Could not start the translation queue")
+
+    def _on_queued_done(self, job, entry, error: str | None) -> None:
+        if error is not None:
+            self.queuedTranslationDone.emit("Queued translation failed", error)
+            return
+        preview = entry.translated_text
+        self.queuedTranslationDone.emit("Queued translation done", preview[:200] or "Saved to history.")
+
+    def _start_warm_up(self) -> None:
+        _import_main_thread_modules()
+        threading.Thread(target=_warm_up, name="warm-up", daemon=True).start()
 
     def _tray_icon(self) -> QIcon:
         icon = QIcon.fromTheme("camera")
@@ -96,22 +332,78 @@ class TrayApp(QObject):
             icon = QApplication.style().standardIcon(QStyle.SP_DesktopIcon)
         return icon
 
+    def _refresh_usage(self) -> None:
+        from jp_assist_ai.services.translate_service import get_store
+
+        try:
+            usage = get_store().usage_since(start_of_day(time.time()))
+        except Exception:
+            return
+        self._action_usage.setText(
+            f"Usage today: {usage.calls} calls, {usage.total_tokens} tokens "
+            f"({usage.cached_tokens} cached), ${usage.cost:.4f}"
+        )
+
+    def _refresh_latency(self) -> None:
+        self._latency_action.setVisible(tracing_enabled())
+        self._latency_menu.clear()
+        stats = stage_stats()
+        if not stats:
+            self._latency_menu.addAction("No samples yet").setEnabled(False)
+            return
+        for name, stage in sorted(stats.items()):
+            action = self._latency_menu.addAction(
+                f"{name}: {stage.p50_ms:.1f} / {stage.p95_ms:.1f} ms (n={stage.count})"
+            )
+            action.setEnabled(False)
+
+    def _open_rewrite(self) -> None:
+        from jp_assist_ai.app.screens.rewrite_window import RewriteWindow
+
+        if self._rewrite_window is None:
+            self._rewrite_window = RewriteWindow()
+        self._rewrite_window.show()
+        self._rewrite_window.raise_()
+        self._rewrite_window.activateWindow()
+
+    def _open_history(self) -> None:
+        from jp_assist_ai.app.screens.history_window import HistoryWindow
+
+        if self._history_window is None:
+            self._history_window = HistoryWindow()
+        self._history_window.show()
+        self._history_window.raise_()
+        self._history_window.activateWindow()
+
     def _open_settings(self) -> None:
-        dialog = SettingsWindow(self._settings.hotkey)
+        dialog = SettingsWindow(self._settings.hotkey, self._settings.clipboard_hotkey)
         QTimer.singleShot(0, dialog.raise_)
         QTimer.singleShot(0, dialog.activateWindow)
         if dialog.exec() != QDialog.Accepted:
             return
 
         new_hotkey = dialog.selected_hotkey()
-        if new_hotkey == self._settings.hotkey:
+        new_clipboard_hotkey = dialog.selected_clipboard_hotkey()
+        if (new_hotkey, new_clipboard_hotkey) == (self._settings.hotkey, self._settings.clipboard_hotkey):
             return
 
-        self._settings = AppSettings(hotkey=new_hotkey)
+        self._settings = replace(self._settings, hotkey=new_hotkey, clipboard_hotkey=new_clipboard_hotkey)
         save_settings(self._settings)
         self._hotkey.set_sequence(new_hotkey)
+        self._clipboard_hotkey.set_sequence(new_clipboard_hotkey)
         self._ensure_hotkey_registered()
 
+    def _show_clipboard_translation(self, result) -> None:
+        if self._overlay is not None:
+            self._overlay.close()
+        self._overlay = OverlayWindow(f"{result.src_lang} -> {result.dst_lang}", result.text)
+        self._overlay.show()
+        self._overlay.raise_()
+        self._overlay.activateWindow()
+
+    def _on_clipboard_failed(self, msg: str) -> None:
+        self._tray.showMessage("Translate clipboard", msg)
+
     def _ensure_hotkey_registered(self) -> None:
         if not self._settings.hotkey:
             return
@@ -131,12 +423,26 @@ class TrayApp(QObject):
                 f"Could not register hotkey: {self._settings.hotkey}",
             )
 
+    def _toggle_frozen(self, enabled: bool) -> None:
+        self._capture.frozen = enabled
+        self._action_magnifier.setEnabled(enabled)
+        self._action_snapping.setEnabled(enabled)
+        self._settings = replace(self._settings, frozen_selection=enabled)
+        save_settings(self._settings)
+
+    def _toggle_magnifier(self, enabled: bool) -> None:
+        self._capture.magnifier = enabled
+        self._settings = replace(self._settings, selection_magnifier=enabled)
+        save_settings(self._settings)
+
+    def _toggle_snapping(self, enabled: bool) -> None:
+        self._capture.snapping = enabled
+        self._settings = replace(self._settings, selection_snapping=enabled)
+        save_settings(self._settings)
+
     def _toggle_startup(self, enabled: bool) -> None:
         if set_start_at_login(enabled):
-            self._settings = AppSettings(
-                hotkey=self._settings.hotkey,
-                start_at_login=enabled,
-            )
+            self._settings = replace(self._settings, start_at_login=enabled)
             save_settings(self._settings)
             self._tray.showMessage(
                 "Start at login",
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, TextIO
+
+from PIL import Image
+
+from jp_assist_ai.core.models import OcrLine
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tif", ".tiff", ".webp")
+PDF_EXTS = (".pdf",)
+# Vision models downscale anything larger; shipping the full page only costs pickling and upload time
+_MAX_IMAGE_SIDE = 2048
+
+_log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    path: str
+    page: int | None  # 0-based PDF page, None for images
+    key: str  # content hash + page + languages; what the manifest records
+
+    @property
+    def label(self) -> str:
+        return self.path if self.page is None else f"{self.path} (page {self.page + 1})"
+
+
+@dataclass(frozen=True)
+class PreparedPage:
+    """What a worker process hands back: OCR lines, or the page itself when OCR is off."""
+
+    lines: tuple[OcrLine, ...] | None
+    size: tuple[int, int]
+    rgb: bytes | None = None
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    item: BatchItem
+    src_lang: str
+    dst_lang: str
+    text: str
+    lines: tuple[dict, ...] = ()
+
+    def to_json(self) -> dict:
+        return {
+            "key": self.item.key,
+            "path": self.item.path,
+            "page": None if self.item.page is None else self.item.page + 1,
+            "src_lang": self.src_lang,
+            "dst_lang": self.dst_lang,
+            "text": self.text,
+            "lines": list(self.lines),
+        }
+
+
+@dataclass
+class BatchStats:
+    done: int = 0
+    skipped: int = 0
+    failed: list[tuple[str, str]] = field(default_factory=list)
+
+
+def file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def discover(root: str, src_lang: str, dst_lang: str, salt: str = "") -> Iterator[BatchItem]:
+    """Images and PDF pages under root (or root itself), in a stable order."""
+    if os.path.isfile(root):
+        paths = [root]
+    else:
+        paths = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            paths.extend(os.path.join(dirpath, name) for name in sorted(filenames))
+
+    for path in paths:
+        ext = os.path.splitext(path)[1].lower()
+        if ext not in IMAGE_EXTS and ext not in PDF_EXTS:
+            continue
+        digest = file_digest(path)
+        if ext in IMAGE_EXTS:
+            yield BatchItem(path, None, _item_key(digest, None, src_lang, dst_lang, salt))
+            continue
+        from jp_assist_ai.adapters.documents.pdf_render import page_count
+
+        try:
+            pages = page_count(path)
+        except ValueError as exc:
+            _log.warning("%s", exc)
+            continue
+        for page in range(pages):
+            yield BatchItem(path, page, _item_key(digest, page, src_lang, dst_lang, salt))
+
+
+def _item_key(digest: str, page: int | None, src_lang: str, dst_lang: str, salt: str) -> str:
+    raw = f"{digest}\0{page}\0{src_lang}\0{dst_lang}\0{salt}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+class Manifest:
+    """Append-only list of finished item keys; lets an interrupted run pick up where it stopped."""
+
+    def __init__(self, path: str):
+        self._path = path
+        self._done: set[str] = set()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._done.update(line.strip() for line in f if line.strip())
+        self._file: TextIO | None = None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._done
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def add(self, key: str) -> None:
+        if self._file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+            self._file = open(self._path, "a", encoding="utf-8")
+        self._done.add(key)
+        self._file.write(key + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class JsonlSink:
+    def __init__(self, path: str, append: bool = True):
+        self._file = _open_output(path, append)
+
+    def write(self, result: BatchResult) -> None:
+        self._file.write(json.dumps(result.to_json(), ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class MarkdownSink:
+    def __init__(self, path: str, append: bool = True):
+        self._file = _open_output(path, append)
+
+    def write(self, result: BatchResult) -> None:
+        self._file.write(f"## {result.item.label}\n\n{result.text.strip()}\n\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _open_output(path: str, append: bool) -> TextIO:
+    # Appending continues a resumed run; a fresh run replaces the results of an earlier one
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return open(path, "a" if append else "w", encoding="utf-8")
+
+
+def _init_worker() -> None:
+    # One process per core already; keep OCR libraries from also spawning a thread per core each
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "JP_ASSIST_OCR_WORKERS"):
+        os.environ.setdefault(var, "1")
+
+
+def prepare_page(path: str, page: int | None, dpi: int, use_ocr: bool) -> PreparedPage:
+    """Worker-process side: decode or rasterize, then OCR when enabled."""
+    if page is None:
+        with Image.open(path) as src:
+            image = src.convert("RGB")
+    else:
+        from jp_assist_ai.adapters.documents.pdf_render import render_page
+
+        image = render_page(path, page, dpi)
+
+    if use_ocr:
+        from jp_assist_ai.services.translate_service import get_ocr_engine
+
+        return PreparedPage(lines=tuple(get_ocr_engine().recognize_lines(image)), size=image.size)
+
+    image.thumbnail((_MAX_IMAGE_SIDE, _MAX_IMAGE_SIDE))
+    return PreparedPage(lines=None, size=image.size, rgb=image.tobytes())
+
+
+class BatchTranslate:
+    """
+    Two-stage pipeline: decode/rasterize/OCR in a process pool (scales with
+    cores), translation in a thread pool of `concurrency` (bounds in-flight
+    LLM requests). The number of items between the stages is capped so
+    memory stays flat however large the input set is.
+    """
+
+    def __init__(
+        self,
+        translate_lines: Callable[[list[str], str, str], list[str]],
+        translate_image: Callable[[Image.Image, str, str], str],
+        src_lang: str = "JP",
+        dst_lang: str = "VI",
+        jobs: int | None = None,
+        concurrency: int = 4,
+        dpi: int = 200,
+        use_ocr: bool = False,
+    ):
+        self._translate_lines = translate_lines
+        self._translate_image = translate_image
+        self._src = src_lang
+        self._dst = dst_lang
+        self._jobs = max(1, jobs or os.cpu_count() or 1)
+        self._concurrency = max(1, concurrency)
+        self._dpi = dpi
+        self._use_ocr = use_ocr
+
+    def run(
+        self,
+        items: Iterable[BatchItem],
+        sink: JsonlSink | MarkdownSink,
+        manifest: Manifest,
+        on_progress: Callable[[BatchItem, str | None], None] | None = None,
+    ) -> BatchStats:
+        stats = BatchStats()
+        window = 2 * (self._jobs + self._concurrency)
+        pending: dict[Future, tuple[str, BatchItem]] = {}
+        source = iter(items)
+
+        with ProcessPoolExecutor(self._jobs, initializer=_init_worker) as pool, ThreadPoolExecutor(
+            self._concurrency, thread_name_prefix="batch-llm"
+        ) as llm:
+
+            def refill() -> None:
+                while len(pending) < window:
+                    item = next(source, None)
+                    if item is None:
+                        return
+                    if item.key in manifest:
+                        stats.skipped += 1
+                        continue
+                    future = pool.submit(prepare_page, item.path, item.page, self._dpi, self._use_ocr)
+                    pending[future] = ("prepare", item)
+
+            refill()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, item = pending.pop(future)
+                    try:
+                        value = future.result()
+                    except Exception as exc:
+                        _log.warning("%s failed: %s", item.label, exc)
+                        stats.failed.append((item.label, str(exc)))
+                        if on_progress:
+                            on_progress(item, str(exc))
+                        continue
+                    if stage == "prepare":
+                        pending[llm.submit(self._translate, item, value)] = ("translate", item)
+                        continue
+                    sink.write(value)
+                    manifest.add(item.key)
+                    stats.done += 1
+                    if on_progress:
+                        on_progress(item, None)
+                refill()
+        return stats
+
+    def _translate(self, item: BatchItem, page: PreparedPage) -> BatchResult:
+        if page.lines is None:
+            image = Image.frombytes("RGB", page.size, page.rgb)
+            text = self._translate_image(image, self._src, self._dst)
+            return BatchResult(item, self._src, self._dst, text)
+
+        sources = [line.text for line in page.lines]
+        translations = self._translate_lines(sources, self._src, self._dst) if sources else []
+        lines = tuple(
+            {"source": line.text, "translation": translation, "box": list(line.box), "score": line.score}
+            for line, translation in zip(page.lines, translations)
+        )
+        return BatchResult(item, self._src, self._dst, "\n".join(translations), lines)
+
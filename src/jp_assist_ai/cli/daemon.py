@@ -0,0 +1,401 @@
+"""
+Headless translation daemon.
+
+Keeps the translator client, OCR engine, prompt templates and line memory
+warm in one process and serves them as JSON over HTTP, either on localhost
+or on a Unix socket (same protocol, `curl --unix-socket` works):
+
+    POST /v1/translate/text   {"text", "src", "dst"}          -> {"text"}
+    POST /v1/translate/lines  {"lines", "src", "dst"}         -> {"lines"}
+    POST /v1/translate/image  {"image": base64, "src", "dst"} -> {"text", "lines"}
+    POST /v1/ocr              {"image": base64}               -> {"lines"}
+    POST /v1/rewrite          {"text", "style"}               -> {"text"}
+    GET  /v1/health                                           -> queue stats
+
+At most `concurrency` requests run at once and up to `max_queue` more wait;
+beyond that the daemon answers 503 with Retry-After instead of piling up
+work. A request that waits or runs past its deadline (X-Deadline-Ms header,
+default `timeout`) gets 504.
+
+POST bodies must be sent as `Content-Type: application/json`, which a web
+page cannot do without a CORS preflight the daemon never answers. With a
+token set (JP_ASSIST_DAEMON_TOKEN), every request also needs
+`Authorization: Bearer <token>`; listening on anything but a loopback
+address or a Unix socket requires one.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import hmac
+import http.client
+import io
+import ipaddress
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor, TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+from jp_assist_ai.core.usecases.rewrite_japanese import STYLES
+
+_MAX_BODY = 32 * 1024 * 1024
+
+_log = logging.getLogger(__name__)
+
+
+class Overloaded(Exception):
+    pass
+
+
+class BadRequest(Exception):
+    pass
+
+
+class AdmissionQueue:
+    """Runs at most `concurrency` jobs, lets `max_queue` more wait and refuses the rest."""
+
+    def __init__(self, concurrency: int = 4, max_queue: int = 32):
+        self.concurrency = max(1, concurrency)
+        self.max_queue = max(0, max_queue)
+        self._executor = ThreadPoolExecutor(self.concurrency, thread_name_prefix="daemon")
+        self._lock = threading.Lock()
+        self._outstanding = 0
+        self._running = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def submit(self, fn: Callable[..., Any], *args) -> Future:
+        with self._lock:
+            if self._outstanding >= self.concurrency + self.max_queue:
+                self.rejected += 1
+                raise Overloaded()
+            self._outstanding += 1
+        future = self._executor.submit(self._run, fn, *args)
+        # Also fires when a queued job is cancelled, so the slot is never leaked
+        future.add_done_callback(self._release)
+        return future
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._outstanding - self._running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, fn: Callable[..., Any], *args):
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def _release(self, future: Future) -> None:
+        with self._lock:
+            self._outstanding -= 1
+            if not future.cancelled():
+                self.completed += 1
+
+
+class _Backend:
+    """The translate stack, built once and shared by every request."""
+
+    def __init__(self):
+        from jp_assist_ai.core.pipeline import IncrementalTranslator
+        from jp_assist_ai.core.prompts.templates import get_prompts
+        from jp_assist_ai.services.rewrite_service import get_rewriter
+        from jp_assist_ai.services.translate_service import get_ocr_engine, get_translator
+
+        get_prompts()
+        self._translator = get_translator()
+        self._ocr = get_ocr_engine()
+        self._rewriter = get_rewriter()
+        # One line memory for all clients; identical lines are translated once
+        self._lines = IncrementalTranslator(self._translator)
+
+    def translate_text(self, body: dict) -> dict:
+        lines = _field(body, "text", str).splitlines()
+        result = self._lines.translate_lines(lines, *_langs(body))
+        # Blank lines are not sent for translation; put them back so paragraphs survive
+        translated = iter(result.lines)
+        text = "\n".join(next(translated).translation if line.strip() else "" for line in lines)
+        return {"text": text, "reused": result.reused_count}
+
+    def translate_lines(self, body: dict) -> dict:
+        lines = _field(body, "lines", list)
+        return {"lines": self._translator.translate_lines([str(line) for line in lines], *_langs(body))}
+
+    def translate_image(self, body: dict) -> dict:
+        image = _image(body)
+        src, dst = _langs(body)
+        if self._ocr is None:
+            return {"text": self._translator.translate_image(image, src, dst), "lines": []}
+        ocr_lines = self._ocr.recognize_lines(image)
+        result = self._lines.translate_lines([line.text for line in ocr_lines], src, dst)
+        return {
+            "text": "\n".join(line.translation for line in result.lines),
+            "lines": [
+                {"source": line.source, "translation": line.translation, "reused": line.reused}
+                for line in result.lines
+            ],
+        }
+
+    def ocr(self, body: dict) -> dict:
+        if self._ocr is None:
+            raise BadRequest("OCR is not configured (set JP_ASSIST_OCR)")
+        lines = self._ocr.recognize_lines(_image(body))
+        return {"lines": [{"text": line.text, "box": list(line.box), "score": line.score} for line in lines]}
+
+    def rewrite(self, body: dict) -> dict:
+        style = str(body.get("style", "business"))
+        if style not in STYLES:
+            raise BadRequest(f"'style' must be one of {', '.join(STYLES)}")
+        result = self._rewriter.execute(_field(body, "text", str), style)
+        return {"text": result.text}
+
+
+def _field(body: dict, name: str, kind: type):
+    value = body.get(name)
+    if not isinstance(value, kind):
+        raise BadRequest(f"'{name}' must be a {kind.__name__}")
+    return value
+
+
+def _langs(body: dict) -> tuple[str, str]:
+    return str(body.get("src", "JP")).upper(), str(body.get("dst", "VI")).upper()
+
+
+def _image(body: dict):
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        data = base64.b64decode(_field(body, "image", str), validate=True)
+        return Image.open(io.BytesIO(data)).convert("RGB")
+    except (binascii.Error, UnidentifiedImageError) as exc:
+        raise BadRequest(f"'image' is not a base64-encoded image: {exc}") from exc
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: _DaemonHTTPServer | _DaemonUnixServer
+
+    def log_message(self, fmt: str, *args) -> None:
+        _log.debug(fmt, *args)
+
+    def do_GET(self) -> None:
+        if not self._authorized():
+            return
+        if self.path.rstrip("/") != "/v1/health":
+            self._reply(404, {"error": "not found"})
+            return
+        self._reply(200, {"status": "ok", **self.server.daemon.queue.stats()})
+
+    def do_POST(self) -> None:
+        daemon = self.server.daemon
+        route = daemon.routes.get(self.path.rstrip("/"))
+        if not self._authorized():
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            deadline = daemon.timeout
+            if self.headers.get("X-Deadline-Ms"):
+                deadline = min(deadline, int(self.headers["X-Deadline-Ms"]) / 1000)
+        except ValueError:
+            self.close_connection = True
+            self._reply(400, {"error": "Content-Length and X-Deadline-Ms must be integers"})
+            return
+        if length > _MAX_BODY:
+            self.close_connection = True
+            self._reply(413, {"error": "request too large"})
+            return
+        raw = self.rfile.read(length) if length else b""
+        if route is None:
+            self._reply(404, {"error": "not found"})
+            return
+        if self.headers.get_content_type() != "application/json":
+            self._reply(415, {"error": "Content-Type must be application/json"})
+            return
+        try:
+            body = json.loads(raw or b"{}")
+            if not isinstance(body, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as exc:
+            self._reply(400, {"error": f"invalid JSON: {exc}"})
+            return
+
+        try:
+            future = daemon.queue.submit(route, body)
+        except Overloaded:
+            self._reply(503, {"error": "busy"}, {"Retry-After": "1"})
+            return
+        try:
+            self._reply(200, future.result(timeout=deadline))
+        except TimeoutError:
+            future.cancel()
+            self._reply(504, {"error": "deadline exceeded"})
+        except CancelledError:
+            self._reply(503, {"error": "shutting down"})
+        except BadRequest as exc:
+            self._reply(400, {"error": str(exc)})
+        except Exception as exc:
+            _log.exception("%s failed", self.path)
+            self._reply(500, {"error": str(exc)})
+
+    def _authorized(self) -> bool:
+        token = self.server.daemon.token
+        if not token:
+            return True
+        given = self.headers.get("Authorization", "").removeprefix("Bearer ").encode()
+        if hmac.compare_digest(given, token.encode()):
+            return True
+        self.close_connection = True
+        self._reply(401, {"error": "missing or wrong token"}, {"WWW-Authenticate": "Bearer"})
+        return False
+
+    def _reply(self, status: int, payload: dict, headers: dict | None = None) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _DaemonHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+    daemon: TranslateDaemon
+
+
+class _DaemonUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128
+    daemon: TranslateDaemon
+
+    def get_request(self):
+        conn, _ = super().get_request()
+        # BaseHTTPRequestHandler expects a (host, port)-like client address
+        return conn, ("unix", 0)
+
+
+class TranslateDaemon:
+    def __init__(
+        self,
+        address: str = "127.0.0.1:8787",
+        concurrency: int = 4,
+        max_queue: int = 32,
+        timeout: float = 60.0,
+        backend: _Backend | None = None,
+        token: str | None = None,
+    ):
+        self.address = address
+        self.timeout = timeout
+        self.token = token or None
+        if not address.startswith("unix:") and not self.token and not _is_loopback(address):
+            raise ValueError(
+                f"refusing to listen on {address} without a token: anyone who can reach it could use your "
+                "API key (set JP_ASSIST_DAEMON_TOKEN, or listen on 127.0.0.1 or a Unix socket)"
+            )
+        self.queue = AdmissionQueue(concurrency, max_queue)
+        backend = backend or _Backend()
+        self.routes: dict[str, Callable[[dict], dict]] = {
+            "/v1/translate/text": backend.translate_text,
+            "/v1/translate/lines": backend.translate_lines,
+            "/v1/translate/image": backend.translate_image,
+            "/v1/ocr": backend.ocr,
+            "/v1/rewrite": backend.rewrite,
+        }
+        if address.startswith("unix:"):
+            path = address[len("unix:"):]
+            _remove_stale_socket(path)
+            # Created owner-only: a chmod after bind would leave it open to anyone for a moment
+            umask = os.umask(0o177)
+            try:
+                self._server = _DaemonUnixServer(path, _Handler)
+            finally:
+                os.umask(umask)
+        else:
+            host, _, port = address.rpartition(":")
+            self._server = _DaemonHTTPServer((host or "127.0.0.1", int(port)), _Handler)
+        self._server.daemon = self
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        if isinstance(self._server, _DaemonUnixServer):
+            return f"unix:{self._server.server_address}"
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self) -> None:
+        self._server.serve_forever()
+
+    def start(self) -> TranslateDaemon:
+        self._thread = threading.Thread(target=self.serve_forever, name="daemon-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self.queue.shutdown()
+        if isinstance(self._server, _DaemonUnixServer) and os.path.exists(self._server.server_address):
+            os.unlink(self._server.server_address)
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Remove a socket left by a previous run; anything else at `path` is not ours to delete."""
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError(f"{path} exists and is not a socket: refusing to replace it")
+    os.unlink(path)
+
+
+def _is_loopback(address: str) -> bool:
+    host = address.rpartition(":")[0].strip("[]") or "127.0.0.1"
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """http.client connection over a Unix socket, for clients of `--socket`."""
+
+    def __init__(self, path: str, timeout: float = 60.0):
+        super().__init__("localhost", timeout=timeout)
+        self._path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._path)
+
+
+def connect(url: str, timeout: float = 60.0) -> http.client.HTTPConnection:
+    """Keep-alive connection to a daemon given its `url`."""
+    if url.startswith("unix:"):
+        return UnixHTTPConnection(url[len("unix:"):], timeout)
+    host, _, port = url.removeprefix("http://").rpartition(":")
+    return http.client.HTTPConnection(host, int(port), timeout=timeout)
@@ -0,0 +1,207 @@
+"""
+jp-assist: command-line entry point.
+
+    jp-assist translate specs/ --out specs.jsonl              # images and PDF pages under specs/
+    jp-assist translate specs/ --out specs.md --dst EN        # Markdown instead of JSONL
+    jp-assist translate specs/ --out specs.jsonl --jobs 8 --concurrency 6
+    jp-assist serve --listen 127.0.0.1:8787                   # headless daemon for other tools
+    jp-assist serve --listen unix:/tmp/jp-assist.sock
+    jp-assist history export backup.tar                       # history + images, streamed
+    jp-assist history import backup.tar                       # entries already present are skipped
+
+Re-running the same command skips everything already listed in the manifest
+(<out>.manifest by default), so an interrupted batch resumes where it stopped.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import sys
+import threading
+import time
+
+from jp_assist_ai.config.logging import setup_logging
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="jp-assist", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    translate = commands.add_parser("translate", help="translate a directory of screenshots and PDFs")
+    translate.add_argument("path", help="file or directory to translate")
+    translate.add_argument("--out", required=True, help="output file (.jsonl or .md)")
+    translate.add_argument("--format", choices=("jsonl", "md"), default=None, help="defaults to the --out extension")
+    translate.add_argument("--manifest", default=None, help="resume manifest, defaults to <out>.manifest")
+    translate.add_argument("--no-resume", action="store_true", help="ignore the manifest and redo everything")
+    translate.add_argument("--src", default="JP")
+    translate.add_argument("--dst", default="VI")
+    translate.add_argument("--jobs", type=int, default=None, help="OCR/rasterize processes, default: CPU count")
+    translate.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("JP_ASSIST_BATCH_CONCURRENCY", "4")),
+        help="max in-flight LLM requests",
+    )
+    translate.add_argument("--dpi", type=int, default=200, help="PDF rasterization resolution")
+    translate.set_defaults(func=_translate)
+
+    serve = commands.add_parser("serve", help="run the headless translation daemon")
+    serve.add_argument(
+        "--listen",
+        default=os.getenv("JP_ASSIST_DAEMON_LISTEN", "127.0.0.1:8787"),
+        help="host:port, or unix:/path/to.sock",
+    )
+    serve.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("JP_ASSIST_DAEMON_CONCURRENCY", "4")),
+        help="requests processed at once",
+    )
+    serve.add_argument("--max-queue", type=int, default=32, help="requests allowed to wait; more get 503")
+    serve.add_argument("--timeout", type=float, default=60.0, help="default per-request deadline in seconds")
+    serve.set_defaults(func=_serve)
+
+    history = commands.add_parser("history", help="export or import translation history")
+    history_commands = history.add_subparsers(dest="action", required=True)
+    export = history_commands.add_parser("export", help="write history and its images to an archive")
+    export.add_argument("path", help="archive to write")
+    export.add_argument("--chunk-rows", type=int, default=5000, help="entries per compressed chunk")
+    export.add_argument("--codec", choices=("zstd", "gzip"), default=None, help="default: zstd when installed")
+    export.set_defaults(func=_export_history)
+    restore = history_commands.add_parser("import", help="add the entries of an archive to history")
+    restore.add_argument("path", help="archive to read")
+    restore.set_defaults(func=_import_history)
+
+    args = parser.parse_args(argv)
+    setup_logging()
+    return args.func(args)
+
+
+def _translate(args: argparse.Namespace) -> int:
+    from jp_assist_ai.cli.batch import BatchTranslate, JsonlSink, Manifest, MarkdownSink, discover
+    from jp_assist_ai.core.prompts.templates import get_prompts
+    from jp_assist_ai.services.translate_service import get_translator
+
+    if not os.path.exists(args.path):
+        print(f"jp-assist: {args.path}: no such file or directory", file=sys.stderr)
+        return 2
+    fmt = args.format or ("md" if args.out.lower().endswith(".md") else "jsonl")
+    manifest_path = args.manifest or args.out + ".manifest"
+    if args.no_resume and os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    # Without a manifest nothing in the output counts as done: start it over rather than add a second copy
+    resume = os.path.exists(manifest_path)
+
+    translator = get_translator()
+    src, dst = args.src.upper(), args.dst.upper()
+    # A prompt change invalidates earlier results, same as the in-app caches
+    salt = get_prompts().version("translate")
+    use_ocr = bool(os.getenv("JP_ASSIST_OCR", ""))
+    batch = BatchTranslate(
+        translator.translate_lines,
+        translator.translate_image,
+        src_lang=src,
+        dst_lang=dst,
+        jobs=args.jobs,
+        concurrency=args.concurrency,
+        dpi=args.dpi,
+        use_ocr=use_ocr,
+    )
+
+    manifest = Manifest(manifest_path)
+    sink = MarkdownSink(args.out, append=resume) if fmt == "md" else JsonlSink(args.out, append=resume)
+    start = time.perf_counter()
+
+    def progress(item, error: str | None) -> None:
+        status = f"FAILED {error}" if error else "ok"
+        print(f"{item.label}: {status}", file=sys.stderr)
+
+    try:
+        stats = batch.run(discover(args.path, src, dst, salt), sink, manifest, progress)
+    except KeyboardInterrupt:
+        print("Interrupted; re-run the same command to resume.", file=sys.stderr)
+        return 130
+    finally:
+        sink.close()
+        manifest.close()
+
+    elapsed = time.perf_counter() - start
+    rate = stats.done / elapsed if elapsed > 0 else 0.0
+    print(
+        f"{stats.done} translated, {stats.skipped} already done, {len(stats.failed)} failed "
+        f"in {elapsed:.1f}s ({rate:.2f} pages/s)",
+        file=sys.stderr,
+    )
+    return 1 if stats.failed else 0
+
+
+def _export_history(args: argparse.Namespace) -> int:
+    from jp_assist_ai.adapters.storage.sqlite_store import SqliteStore
+    from jp_assist_ai.services.history_archive import export_history
+
+    store = SqliteStore()
+    start = time.perf_counter()
+    try:
+        stats = export_history(store, args.path, chunk_rows=args.chunk_rows, codec=args.codec)
+    except (RuntimeError, OSError) as exc:
+        print(f"jp-assist: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        store.close()
+    size = os.path.getsize(args.path) / 1e6
+    print(
+        f"{stats.entries} entries, {stats.images} images ({size:.1f} MB) in {time.perf_counter() - start:.1f}s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _import_history(args: argparse.Namespace) -> int:
+    import tarfile
+
+    from jp_assist_ai.adapters.storage.sqlite_store import SqliteStore
+    from jp_assist_ai.services.history_archive import import_history
+
+    if not os.path.exists(args.path):
+        print(f"jp-assist: {args.path}: no such file", file=sys.stderr)
+        return 2
+    store = SqliteStore()
+    start = time.perf_counter()
+    try:
+        stats = import_history(store, args.path)
+    except (ValueError, RuntimeError, EOFError, tarfile.TarError) as exc:
+        print(f"jp-assist: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        store.close()
+    print(
+        f"{stats.entries} entries added, {stats.skipped} already in history, {stats.images} images "
+        f"in {time.perf_counter() - start:.1f}s",
+        file=sys.stderr,
+    )
+    return 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    from jp_assist_ai.cli.daemon import TranslateDaemon
+
+    try:
+        daemon = TranslateDaemon(
+            args.listen, args.concurrency, args.max_queue, args.timeout, token=os.getenv("JP_ASSIST_DAEMON_TOKEN")
+        )
+    except ValueError as exc:
+        print(f"jp-assist serve: {exc}", file=sys.stderr)
+        return 2
+    # serve_forever() blocks the main thread; shutdown() has to come from another one
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=daemon.stop, daemon=True).start())
+    print(f"jp-assist daemon listening on {daemon.url}", file=sys.stderr)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        daemon.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import math
+import os
+import queue
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+_TRACE_LOGGER = "jp_assist_ai.trace"
+
+
+def setup_logging(level: str | None = None) -> None:
+    level = (level or os.getenv("JP_ASSIST_LOG_LEVEL", "WARNING")).upper()
+    logging.basicConfig(
+        level=getattr(logging, level, logging.WARNING),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    trace = os.getenv("JP_ASSIST_TRACE", "")
+    if trace and trace != "0":
+        enable_tracing(None if trace == "1" else trace)
+
+
+# --- tracing -----------------------------------------------------------------
+#
+# Spans are written as Chrome trace "complete" events, one JSON object per line
+# (JSON Lines, so runs can append to one file). chrome://tracing and Perfetto
+# want a JSON array; convert before loading:
+#
+#   python -c "import json, sys; json.dump([json.loads(l) for l in open(sys.argv[1])], sys.stdout)" \
+#       trace.jsonl > trace.json
+
+
+@dataclass(frozen=True)
+class StageStats:
+    count: int
+    p50_ms: float
+    p95_ms: float
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def set(self, **_args) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+_current: ContextVar[Span | None] = ContextVar("jp_assist_span", default=None)
+_recorder: _Recorder | None = None
+
+
+class Span:
+    __slots__ = ("name", "args", "_start", "_token", "_parent")
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+        self._start = 0
+        self._token = None
+        self._parent: Span | None = None
+
+    def set(self, **args) -> None:
+        self.args.update(args)
+
+    def __enter__(self) -> Span:
+        self._parent = _current.get()
+        self._token = _current.set(self)
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, _exc, _tb) -> None:
+        duration = time.perf_counter_ns() - self._start
+        _current.reset(self._token)
+        recorder = _recorder
+        if recorder is None:
+            return
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        if self._parent is not None:
+            self.args["parent"] = self._parent.name
+        recorder.record(self.name, self._start, duration, self.args)
+
+
+class _Recorder:
+    def __init__(self, path: str, max_bytes: int, backups: int, window: int):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        file_handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        # Serialization happens on the caller, file I/O on the listener thread
+        events: queue.SimpleQueue = queue.SimpleQueue()
+        self._listener = QueueListener(events, file_handler)
+        self._handler = QueueHandler(events)
+        self._logger = logging.getLogger(_TRACE_LOGGER)
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        self._logger.addHandler(self._handler)
+        self._listener.start()
+
+        self._pid = os.getpid()
+        self._window = window
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, start_ns: int, duration_ns: int, args: dict) -> None:
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self._window)
+            samples.append(duration_ns / 1e6)
+        event = {
+            "name": name,
+            "ph": "X",
+            "ts": start_ns // 1000,
+            "dur": duration_ns // 1000,
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        self._logger.info(json.dumps(event, ensure_ascii=False, default=str))
+
+    def stats(self) -> dict[str, StageStats]:
+        with self._lock:
+            snapshot = {name: sorted(samples) for name, samples in self._samples.items()}
+        return {
+            name: StageStats(count=len(values), p50_ms=_percentile(values, 50), p95_ms=_percentile(values, 95))
+            for name, values in snapshot.items()
+            if values
+        }
+
+    def close(self) -> None:
+        self._listener.stop()
+        self._logger.removeHandler(self._handler)
+        self._listener.handlers[0].close()
+
+
+def _percentile(values: list[float], pct: int) -> float:
+    # Nearest-rank percentile on a sorted list
+    index = max(0, min(len(values) - 1, math.ceil(pct / 100 * len(values)) - 1))
+    return values[index]
+
+
+def _default_trace_path() -> str:
+    base = os.getenv("JP_ASSIST_DATA_DIR") or os.path.join(
+        os.path.expanduser("~"), ".local", "share", "jp-assist-ai"
+    )
+    return os.path.join(base, "trace.jsonl")
+
+
+def enable_tracing(
+    path: str | None = None,
+    max_bytes: int = 10 * 1024 * 1024,
+    backups: int = 3,
+    window: int = 200,
+) -> None:
+    global _recorder
+    disable_tracing()
+    _recorder = _Recorder(path or _default_trace_path(), max_bytes, backups, window)
+
+
+def disable_tracing() -> None:
+    global _recorder
+    recorder, _recorder = _recorder, None
+    if recorder is not None:
+        recorder.close()
+
+
+def tracing_enabled() -> bool:
+    return _recorder is not None
+
+
+def span(name: str, **args):
+    if _recorder is None:
+        return _NOOP
+    return Span(name, args)
+
+
+def record_span(name: str, start_ns: int, duration_ns: int, **args) -> None:
+    """Record a span that was not timed by a `with` block, e.g. the overlap of two concurrent activities."""
+    recorder = _recorder
+    if recorder is not None:
+        recorder.record(name, start_ns, max(0, duration_ns), args)
+
+
+def traced(name: str):
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _recorder is None:
+                return fn(*args, **kwargs)
+            with Span(name, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def stage_stats() -> dict[str, StageStats]:
+    recorder = _recorder
+    return recorder.stats() if recorder is not None else {}
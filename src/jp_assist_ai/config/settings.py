@@ -11,6 +11,11 @@ from PySide6.QtCore import QStandardPaths
 class AppSettings:
     hotkey: str = "Ctrl+Shift+X"
     start_at_login: bool = False
+    # Off until chosen in Settings: any default would shadow Copy-like shortcuts in some app
+    clipboard_hotkey: str = ""
+    frozen_selection: bool = True
+    selection_magnifier: bool = False
+    selection_snapping: bool = False
 
 
 def _settings_path() -> str:
@@ -30,9 +35,22 @@ def load_settings() -> AppSettings:
             data = json.load(f)
         hotkey = str(data.get("hotkey", "")).strip()
         start_at_login = bool(data.get("start_at_login", False))
+        clipboard_hotkey = str(data.get("clipboard_hotkey", "")).strip()
+        frozen_selection = bool(data.get("frozen_selection", AppSettings().frozen_selection))
+        selection_magnifier = bool(data.get("selection_magnifier", False))
+        selection_snapping = bool(data.get("selection_snapping", False))
         if "hotkey" not in data:
             hotkey = AppSettings().hotkey
-        return AppSettings(hotkey=hotkey, start_at_login=start_at_login)
+        if "clipboard_hotkey" not in data:
+            clipboard_hotkey = AppSettings().clipboard_hotkey
+        return AppSettings(
+            hotkey=hotkey,
+            start_at_login=start_at_login,
+            clipboard_hotkey=clipboard_hotkey,
+            frozen_selection=frozen_selection,
+            selection_magnifier=selection_magnifier,
+            selection_snapping=selection_snapping,
+        )
     except Exception:
         return AppSettings()
 
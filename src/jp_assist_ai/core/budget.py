@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import datetime
+
+
+class BudgetExceeded(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class TokenBudget:
+    per_request: int = 0  # estimated prompt tokens for one call; 0 disables
+    per_day: int = 0  # actual input + output tokens per local day; 0 disables
+    min_image_scale: float = 0.5  # below this the text is unreadable, use OCR instead
+
+
+@dataclass(frozen=True)
+class Pricing:
+    # USD per 1M tokens
+    input: float = 0.15
+    cached_input: float = 0.075
+    output: float = 0.60
+
+    def cost(self, input_tokens: int, cached_tokens: int, output_tokens: int) -> float:
+        fresh = max(0, input_tokens - cached_tokens)
+        return (fresh * self.input + cached_tokens * self.cached_input + output_tokens * self.output) / 1_000_000
+
+
+@dataclass(frozen=True)
+class ImageTokenRates:
+    base: int = 85
+    per_tile: int = 170
+
+
+# Tile model used by OpenAI vision models at "high" detail
+_IMAGE_RATES = {
+    "gpt-4o-mini": ImageTokenRates(base=2833, per_tile=5667),
+}
+_IMAGE_TILE = 512
+_IMAGE_MAX_SIDE = 2048
+_IMAGE_SHORT_SIDE = 768
+
+
+def image_rates_for(model: str) -> ImageTokenRates:
+    return _IMAGE_RATES.get(model, ImageTokenRates())
+
+
+def _fitted_size(width: int, height: int) -> tuple[int, int]:
+    scale = min(1.0, _IMAGE_MAX_SIDE / max(width, height, 1))
+    w, h = width * scale, height * scale
+    scale = min(1.0, _IMAGE_SHORT_SIDE / max(min(w, h), 1))
+    return max(1, int(w * scale)), max(1, int(h * scale))
+
+
+def estimate_image_tokens(width: int, height: int, rates: ImageTokenRates = ImageTokenRates()) -> int:
+    w, h = _fitted_size(width, height)
+    tiles = math.ceil(w / _IMAGE_TILE) * math.ceil(h / _IMAGE_TILE)
+    return rates.base + rates.per_tile * tiles
+
+
+def estimate_text_tokens(text: str) -> int:
+    # Kana/kanji are roughly one token each, Latin text about four characters per token
+    cjk = sum(1 for ch in text if ord(ch) >= 0x3000)
+    return cjk + math.ceil((len(text) - cjk) / 4)
+
+
+def fit_image_scale(
+    width: int,
+    height: int,
+    max_tokens: int,
+    rates: ImageTokenRates = ImageTokenRates(),
+) -> float:
+    """Largest scale (<= 1.0) at which the image estimate fits in max_tokens, 0.0 if none does."""
+    if estimate_image_tokens(width, height, rates) <= max_tokens:
+        return 1.0
+    lo, hi = 0.0, 1.0
+    for _ in range(16):
+        mid = (lo + hi) / 2
+        if estimate_image_tokens(max(1, int(width * mid)), max(1, int(height * mid)), rates) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+def start_of_day(timestamp: float) -> float:
+    now = datetime.fromtimestamp(timestamp)
+    return now.replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
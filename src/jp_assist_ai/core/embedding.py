@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import unicodedata
+from typing import Sequence
+
+import numpy as np
+
+# Odd multipliers for the rolling n-gram hash; any fixed values do, but they
+# must never change: stored vectors were hashed with them
+_MULTIPLIERS = (0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D)
+
+
+class HashedNgramEmbedder:
+    """
+    Text -> unit vector from hashed character n-grams (the hashing trick).
+
+    No model to download or load: bigrams and trigrams of the normalized text
+    are hashed into `dim` signed buckets, counts are dampened with a square
+    root and the vector is L2-normalized, so the dot product of two vectors
+    is their cosine similarity. Character n-grams suit Japanese, which has no
+    spaces, and make Latin-script queries tolerant of inflection and typos.
+    A batch is hashed in a handful of NumPy passes, not a loop per n-gram.
+    """
+
+    def __init__(self, dim: int = 256, ngrams: Sequence[int] = (2, 3)):
+        self.dim = dim
+        self._ngrams = tuple(ngrams)
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), dim) float32, one unit row per text (zero for a text with no n-grams)."""
+        out = np.zeros((len(texts), self.dim), np.float32)
+        if not texts:
+            return out
+        normalized = [_normalize(text) for text in texts]
+        lengths = np.fromiter((len(text) for text in normalized), np.int64, len(normalized))
+        codes = np.frombuffer("".join(normalized).encode("utf-32-le"), np.uint32).astype(np.uint64)
+        owner = np.repeat(np.arange(len(texts)), lengths)
+        starts = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        position = np.arange(len(codes)) - starts
+
+        for n in self._ngrams:
+            if len(codes) < n:
+                continue
+            count = len(codes) - n + 1
+            # n-grams that would run into the next text are dropped
+            keep = position[:count] + n <= lengths[owner[:count]]
+            h = np.zeros(count, np.uint64)
+            for i in range(n):
+                h = (h ^ codes[i : i + count]) * np.uint64(_MULTIPLIERS[i % len(_MULTIPLIERS)])
+                h &= np.uint64(0xFFFFFFFF)
+            h ^= h >> np.uint64(15)
+            bucket = (h % np.uint64(self.dim)).astype(np.int64)
+            sign = np.where((h >> np.uint64(31)) & np.uint64(1), -1.0, 1.0)
+            index = owner[:count][keep] * self.dim + bucket[keep]
+            out += np.bincount(index, weights=sign[keep], minlength=out.size).reshape(out.shape).astype(np.float32)
+
+        out = np.sign(out) * np.sqrt(np.abs(out))
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        np.divide(out, norms, out=out, where=norms > 0)
+        return out
+
+
+def _normalize(text: str) -> str:
+    # Full-width / half-width forms fold together; whitespace runs (and line breaks) become one space
+    return " ".join(unicodedata.normalize("NFKC", text).lower().split())
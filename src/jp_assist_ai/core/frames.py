@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable
+
+import numpy as np
+from PIL import Image
+
+
+class MemoryBudget:
+    """
+    Bytes held by frame buffers and previews. Previews are derived data
+    (scaled copies for display) that can be dropped at any time; when an
+    allocation takes the total over `limit`, the least recently used
+    previews are evicted until it fits again. Frames are never evicted.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.used = 0
+        self.peak = 0
+        self.evictions = 0
+        self._previews: OrderedDict[int, tuple[int, Callable[[], None]]] = OrderedDict()
+        self._next_key = 0
+        self._lock = threading.Lock()
+
+    def charge(self, nbytes: int) -> None:
+        with self._lock:
+            self.used += nbytes
+            self.peak = max(self.peak, self.used)
+            evicted = self._over_limit()
+        for evict in evicted:
+            evict()
+
+    def credit(self, nbytes: int) -> None:
+        with self._lock:
+            self.used -= nbytes
+
+    def add_preview(self, nbytes: int, evict: Callable[[], None]) -> int:
+        """Charge a preview; `evict` is called (from the allocating thread) when it has to go."""
+        # Charged before it is listed, so making room never evicts the preview being added
+        self.charge(nbytes)
+        with self._lock:
+            key = self._next_key
+            self._next_key += 1
+            self._previews[key] = (nbytes, evict)
+        return key
+
+    def touch(self, key: int) -> None:
+        with self._lock:
+            if key in self._previews:
+                self._previews.move_to_end(key)
+
+    def remove_preview(self, key: int) -> None:
+        with self._lock:
+            entry = self._previews.pop(key, None)
+            if entry is not None:
+                self.used -= entry[0]
+
+    def _over_limit(self) -> list[Callable[[], None]]:
+        evicted = []
+        while self.used > self.limit and self._previews:
+            _, (nbytes, evict) = self._previews.popitem(last=False)
+            self.used -= nbytes
+            self.evictions += 1
+            evicted.append(evict)
+        return evicted
+
+
+@lru_cache(maxsize=1)
+def default_budget() -> MemoryBudget:
+    return MemoryBudget(int(float(os.getenv("JP_ASSIST_MEMORY_BUDGET_MB", "512")) * 1024 * 1024))
+
+
+class FrameBuffer:
+    """
+    RGBA pixels of one capture, shared by every view cut from it.
+    Views retain the buffer; it leaves the budget when the last one is released.
+    """
+
+    def __init__(self, width: int, height: int, budget: MemoryBudget | None = None):
+        # One spare row: PIL maps a crop as `stride * height` bytes from its first pixel,
+        # which runs past the end of the last row for any crop not starting at x=0
+        self._flat = np.empty((height + 1) * width * 4, dtype=np.uint8)
+        self.pixels = self._flat[: height * width * 4].reshape(height, width, 4)
+        self.width = width
+        self.height = height
+        self.nbytes = self._flat.nbytes
+        self._budget = budget
+        self._refs = 0
+        self._lock = threading.Lock()
+        if budget is not None:
+            budget.charge(self.nbytes)
+
+    @property
+    def refs(self) -> int:
+        return self._refs
+
+    @property
+    def budget(self) -> MemoryBudget | None:
+        return self._budget
+
+    def retain(self) -> None:
+        with self._lock:
+            self._refs += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self._refs -= 1
+            last = self._refs == 0
+        if last and self._budget is not None:
+            self._budget.credit(self.nbytes)
+            self._budget = None
+
+    def memory(self, box: tuple[int, int, int, int]) -> memoryview:
+        """The bytes from the box's first pixel on, as PIL and QImage want them with stride = width * 4."""
+        left, top, _, bottom = box
+        start = (top * self.width + left) * 4
+        return memoryview(self._flat)[start : start + (bottom - top) * self.width * 4]
+
+
+class FrameView:
+    """
+    A rectangle of a FrameBuffer. Cropping makes another view of the same
+    pixels. Only a view that alone holds its whole buffer may write to it.
+    """
+
+    def __init__(self, buffer: FrameBuffer, box: tuple[int, int, int, int] | None = None):
+        self.buffer = buffer
+        self.box = box or (0, 0, buffer.width, buffer.height)
+        self._released = False
+        buffer.retain()
+
+    @classmethod
+    def from_image(cls, image: Image.Image, budget: MemoryBudget | None = None) -> FrameView:
+        buffer = FrameBuffer(image.width, image.height, budget)
+        buffer.pixels[:] = np.asarray(image.convert("RGBA"))
+        return cls(buffer)
+
+    @classmethod
+    def from_bgra(cls, bgra: np.ndarray, budget: MemoryBudget | None = None) -> FrameView:
+        height, width = bgra.shape[:2]
+        buffer = FrameBuffer(width, height, budget)
+        buffer.pixels[..., :3] = bgra[..., 2::-1]
+        buffer.pixels[..., 3] = 255
+        return cls(buffer)
+
+    @property
+    def width(self) -> int:
+        return self.box[2] - self.box[0]
+
+    @property
+    def height(self) -> int:
+        return self.box[3] - self.box[1]
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.width, self.height
+
+    @property
+    def stride(self) -> int:
+        return self.buffer.width * 4
+
+    def crop(self, box: tuple[int, int, int, int]) -> FrameView:
+        """A view of `box` (left, top, right, bottom, relative to this view), clipped to it."""
+        left, top = self.box[:2]
+        x1 = min(max(0, box[0]), self.width - 1)
+        y1 = min(max(0, box[1]), self.height - 1)
+        x2 = min(max(x1 + 1, box[2]), self.width)
+        y2 = min(max(y1 + 1, box[3]), self.height)
+        return FrameView(self.buffer, (left + x1, top + y1, left + x2, top + y2))
+
+    @property
+    def exclusive(self) -> bool:
+        return self.buffer.refs == 1 and self.box == (0, 0, self.buffer.width, self.buffer.height)
+
+    def array(self, writable: bool = False) -> np.ndarray:
+        if writable and not self.exclusive:
+            raise ValueError("Frame is shared; write to a copy (FrameView.from_image(view.image()))")
+        left, top, right, bottom = self.box
+        view = self.buffer.pixels[top:bottom, left:right]
+        view.flags.writeable = writable
+        return view
+
+    def memory(self) -> memoryview:
+        return self.buffer.memory(self.box)
+
+    def image(self) -> Image.Image:
+        # PIL marks mapped images read-only and copies them on the first write itself
+        return Image.frombuffer("RGBA", self.size, self.memory(), "raw", "RGBA", self.stride, 1)
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self.buffer.release()
+
+    def __enter__(self) -> FrameView:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.release()
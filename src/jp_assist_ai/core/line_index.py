@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Sequence
+
+from jp_assist_ai.core.models import OcrLine
+
+
+class LineIndex:
+    """
+    Uniform grid over the OCR line boxes of one capture.
+
+    A query touches only the cells under the rectangle, so the cost grows
+    with the size of the highlight and the lines it hits, not with the
+    number of lines on screen. Cells are squares twice the median line
+    height (at least 16 px), so a line sits in one or two rows of cells
+    and spans a handful of them horizontally.
+    """
+
+    def __init__(self, lines: Sequence[OcrLine], cell: int | None = None):
+        self.lines = tuple(lines)
+        if cell is None:
+            heights = sorted(line.box[3] for line in self.lines if line.box[3] > 0)
+            cell = max(16, 2 * heights[len(heights) // 2]) if heights else 64
+        self._cell = cell
+        self._cells: dict[tuple[int, int], list[int]] = defaultdict(list)
+        for i, line in enumerate(self.lines):
+            for key in self._cover(line.box):
+                self._cells[key].append(i)
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def query(self, rect: tuple[int, int, int, int], min_overlap: float = 0.3) -> list[OcrLine]:
+        """
+        Lines under `rect` (x, y, w, h), in OCR (reading) order. A line counts when
+        the rect covers at least `min_overlap` of its box or its centre.
+        """
+        x, y, w, h = rect
+        hits: set[int] = set()
+        for key in self._cover(rect):
+            hits.update(self._cells.get(key, ()))
+        found = []
+        for i in sorted(hits):
+            line = self.lines[i]
+            lx, ly, lw, lh = line.box
+            ix = min(x + w, lx + lw) - max(x, lx)
+            iy = min(y + h, ly + lh) - max(y, ly)
+            if ix <= 0 or iy <= 0:
+                continue
+            centre_inside = x <= lx + lw / 2 < x + w and y <= ly + lh / 2 < y + h
+            if centre_inside or ix * iy >= min_overlap * max(1, lw * lh):
+                found.append(line)
+        return found
+
+    def _cover(self, box: tuple[int, int, int, int]):
+        x, y, w, h = box
+        cell = self._cell
+        for cy in range(y // cell, (y + max(h, 1) - 1) // cell + 1):
+            for cx in range(x // cell, (x + max(w, 1) - 1) // cell + 1):
+                yield cx, cy
+
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class OcrLine:
+    text: str
+    box: tuple[int, int, int, int]  # x, y, w, h in source image pixels
+    score: float = 1.0
+
+
+@dataclass(frozen=True)
+class LineTranslation:
+    source: str
+    translation: str
+    reused: bool = False
+
+
+@dataclass(frozen=True)
+class ScreenTranslation:
+    lines: tuple[LineTranslation, ...]
+
+    @property
+    def reused_count(self) -> int:
+        return sum(1 for line in self.lines if line.reused)
+
+    def format(self) -> str:
+        if not self.lines:
+            return ""
+        original = "\n".join(line.source for line in self.lines)
+        translated = "\n".join(line.translation for line in self.lines)
+        return f"Original:\n{original}\n\nTranslation:\n{translated}"
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+import numpy as np
+from PIL import Image
+
+V = TypeVar("V")
+
+# Cell means kept for verification. Hashes of a whole screen do not change
+# when one sentence does; at this grid a replaced line moves 15+ cells, a
+# blinking cursor, a clock or a one-pixel shift a handful at most.
+GRID_COLS, GRID_ROWS = 128, 72
+_SAMPLES_PER_CELL = 4
+_MIN_CELL = 10
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    k = np.arange(n)
+    return np.cos(np.pi * (2 * k[None, :] + 1) * k[:, None] / (2 * n)).astype(np.float32)
+
+
+_DCT32 = _dct_matrix(32)
+
+
+@dataclass(frozen=True)
+class CaptureSignature:
+    dhash: int  # 64-bit gradient hash, what the index is keyed on
+    phash: int  # 64-bit DCT hash, a second opinion on candidates
+    grid: bytes  # uint8 cell means, rows x cols
+    rows: int
+    cols: int
+
+    def changed_cells(self, other: CaptureSignature, tolerance: int = 24) -> int | None:
+        """Cells whose mean brightness differs by more than `tolerance`; None if the grids do not line up."""
+        if (self.rows, self.cols) != (other.rows, other.cols):
+            return None
+        a = np.frombuffer(self.grid, np.uint8).astype(np.int16)
+        b = np.frombuffer(other.grid, np.uint8).astype(np.int16)
+        return int(np.count_nonzero(np.abs(a - b) > tolerance))
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def signature(image: Image.Image) -> CaptureSignature:
+    width, height = image.size
+    # Cells much smaller than a glyph would see a one-pixel shift as an edit
+    rows, cols = max(1, min(GRID_ROWS, height // _MIN_CELL)), max(1, min(GRID_COLS, width // _MIN_CELL))
+    grey = image.convert("L")
+    # Box-filtered, not strided: a strided sample aliases thin glyph strokes and a one-pixel shift then looks like an edit
+    step = max(1, min(height // (rows * _SAMPLES_PER_CELL), width // (cols * _SAMPLES_PER_CELL)))
+    if step > 1:
+        grey = grey.reduce(step)
+    grey = np.asarray(grey, np.float32)
+    grid = _cell_means(grey, rows, cols)
+    gradient = _cell_means(grey, 8, 9)
+    dhash = _pack(gradient[:, 1:] > gradient[:, :-1])
+    low = (_DCT32 @ _cell_means(grey, 32, 32) @ _DCT32.T)[:8, :8].ravel()
+    phash = _pack(low > np.median(low[1:]))
+    return CaptureSignature(dhash, phash, np.rint(grid).astype(np.uint8).tobytes(), rows, cols)
+
+
+def _cell_means(grey: np.ndarray, rows: int, cols: int) -> np.ndarray:
+    height, width = grey.shape
+    ys = np.linspace(0, height, rows + 1).astype(np.intp)
+    xs = np.linspace(0, width, cols + 1).astype(np.intp)
+    sums = np.add.reduceat(np.add.reduceat(grey, ys[:-1], axis=0), xs[:-1], axis=1)
+    # Tiny images can give empty cells; they repeat their neighbour instead of dividing by zero
+    area = np.maximum(np.outer(np.diff(ys), np.diff(xs)), 1)
+    return sums / area
+
+
+def _pack(bits: np.ndarray) -> int:
+    return int.from_bytes(np.packbits(bits.ravel()).tobytes(), "big")
+
+
+class MultiIndexHash(Generic[V]):
+    """
+    64-bit keys within a Hamming radius, by multi-index hashing: the key is
+    cut into radius + 1 chunks, and any key within the radius matches at
+    least one chunk exactly, so a search is radius + 1 dict lookups plus a
+    distance check per candidate. Unlike a BK-tree, the cost does not grow
+    with the radius times the number of keys.
+    """
+
+    def __init__(self, radius: int = 4, bits: int = 64):
+        self.radius = radius
+        chunks = radius + 1
+        bounds = [bits * i // chunks for i in range(chunks + 1)]
+        self._chunks = [(lo, (1 << (hi - lo)) - 1) for lo, hi in zip(bounds, bounds[1:])]
+        self._tables: list[dict[int, list[int]]] = [defaultdict(list) for _ in self._chunks]
+        self._keys: list[int] = []
+        self._values: list[V] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: int, value: V) -> None:
+        slot = len(self._keys)
+        self._keys.append(key)
+        self._values.append(value)
+        for table, (shift, mask) in zip(self._tables, self._chunks):
+            table[(key >> shift) & mask].append(slot)
+
+    def search(self, key: int) -> list[tuple[int, V]]:
+        """(distance, value) of every key within the radius, nearest first."""
+        seen: set[int] = set()
+        found = []
+        for table, (shift, mask) in zip(self._tables, self._chunks):
+            for slot in table.get((key >> shift) & mask, ()):
+                if slot in seen:
+                    continue
+                seen.add(slot)
+                distance = (key ^ self._keys[slot]).bit_count()
+                if distance <= self.radius:
+                    found.append((distance, self._values[slot]))
+        found.sort(key=lambda item: item[0])
+        return found
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from typing import Sequence
+
+from jp_assist_ai.adapters.llm.base import Translator
+from jp_assist_ai.core.models import LineTranslation, ScreenTranslation
+from jp_assist_ai.core.prompts.templates import get_prompts
+from jp_assist_ai.core.text.normalizer import line_key
+
+
+class IncrementalTranslator:
+    """
+    Line-level translation that remembers the previous capture.
+
+    Captures taken after scrolling mostly repeat the previous lines, so the new
+    OCR lines are aligned against the last capture and only lines that are
+    neither aligned nor in the line memory are sent to the translator.
+    """
+
+    def __init__(self, translator: Translator, memory_size: int = 4096):
+        self._translator = translator
+        self._memory_size = memory_size
+        self._memory: OrderedDict[tuple[str, str, str, str], str] = OrderedDict()
+        self._prev_scope: tuple[str, str, str] | None = None
+        self._prev_keys: list[str] = []
+        self._prev_translations: list[str] = []
+        self._lock = threading.Lock()
+
+    def translate_lines(self, lines: Sequence[str], src_lang: str, dst_lang: str) -> ScreenTranslation:
+        sources = [line.strip() for line in lines if line and line.strip()]
+        keys = [line_key(line) for line in sources]
+        translations: list[str | None] = [None] * len(sources)
+        # Editing a prompt template changes its version and invalidates old translations
+        scope = (get_prompts().version("translate"), src_lang, dst_lang)
+
+        with self._lock:
+            if self._prev_scope == scope:
+                self._reuse_aligned(keys, translations)
+            for i, key in enumerate(keys):
+                if translations[i] is None:
+                    translations[i] = self._recall(scope, key)
+
+        reused = [t is not None for t in translations]
+        pending = [i for i, t in enumerate(translations) if t is None]
+        if pending:
+            fresh = self._translator.translate_lines([sources[i] for i in pending], src_lang, dst_lang)
+            for i, text in zip(pending, fresh):
+                translations[i] = text
+
+        final = [t or "" for t in translations]
+        with self._lock:
+            for key, text in zip(keys, final):
+                self._remember(scope, key, text)
+            self._prev_scope = scope
+            self._prev_keys = keys
+            self._prev_translations = final
+
+        return ScreenTranslation(
+            lines=tuple(
+                LineTranslation(source=src, translation=text, reused=flag)
+                for src, text, flag in zip(sources, final, reused)
+            )
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._prev_scope = None
+            self._prev_keys = []
+            self._prev_translations = []
+
+    def _reuse_aligned(self, keys: list[str], out: list[str | None]) -> None:
+        if not self._prev_keys or not keys:
+            return
+        matcher = SequenceMatcher(None, self._prev_keys, keys, autojunk=False)
+        for block in matcher.get_matching_blocks():
+            for offset in range(block.size):
+                out[block.b + offset] = self._prev_translations[block.a + offset]
+
+    def _recall(self, scope: tuple[str, str, str], key: str) -> str | None:
+        entry = (*scope, key)
+        text = self._memory.get(entry)
+        if text is not None:
+            self._memory.move_to_end(entry)
+        return text
+
+    def _remember(self, scope: tuple[str, str, str], key: str, text: str) -> None:
+        if not key or not text:
+            return
+        entry = (*scope, key)
+        self._memory[entry] = text
+        self._memory.move_to_end(entry)
+        while len(self._memory) > self._memory_size:
+            self._memory.popitem(last=False)
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, Template
+
+_VERSION = re.compile(r"\{#\s*version:\s*([\w.-]+)\s*#\}")
+_PROMPTS_DIR = Path(__file__).resolve().parent
+
+
+@dataclass(frozen=True)
+class RenderedPrompt:
+    version: str
+    instructions: str  # static prefix, identical for every request of this version
+    request: str
+
+
+class PromptLibrary:
+    """
+    Loads and compiles every `*.jinja` template in one go.
+
+    Templates define an `instructions` block without variables and a `request`
+    block with the per-call part. The version combines the declared
+    `{# version: N #}` header with a hash of the source, so any edit changes it.
+    """
+
+    def __init__(self, directory: Path = _PROMPTS_DIR):
+        env = Environment(
+            loader=FileSystemLoader(str(directory)),
+            undefined=StrictUndefined,
+            keep_trailing_newline=False,
+            autoescape=False,
+        )
+        self._templates: dict[str, Template] = {}
+        self._versions: dict[str, str] = {}
+        self._instructions: dict[str, str] = {}
+        for path in sorted(directory.glob("*.jinja")):
+            name = path.stem
+            source = path.read_text(encoding="utf-8")
+            match = _VERSION.search(source)
+            declared = match.group(1) if match else "0"
+            digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:8]
+            template = env.get_template(path.name)
+            self._templates[name] = template
+            self._versions[name] = f"{name}@{declared}-{digest}"
+            self._instructions[name] = self._render_block(template, "instructions", {})
+
+    def names(self) -> list[str]:
+        return sorted(self._templates)
+
+    def version(self, name: str) -> str:
+        return self._versions[name]
+
+    def render(self, name: str, **variables) -> RenderedPrompt:
+        template = self._templates[name]
+        return RenderedPrompt(
+            version=self._versions[name],
+            instructions=self._instructions[name],
+            request=self._render_block(template, "request", variables),
+        )
+
+    @staticmethod
+    def _render_block(template: Template, block: str, variables: dict) -> str:
+        context = template.new_context(variables)
+        return "".join(template.blocks[block](context)).strip()
+
+
+@lru_cache(maxsize=1)
+def get_prompts() -> PromptLibrary:
+    return PromptLibrary()
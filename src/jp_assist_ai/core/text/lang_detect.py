@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import unicodedata
+
+# Letters that only appear in Vietnamese among the languages we handle
+_VI_LETTERS = set("ăâđêôơưĂÂĐÊÔƠƯ")
+
+
+def detect_language(text: str) -> str:
+    """Best-effort JP / VI / EN guess using character classes; "" when unsure."""
+    kana = kanji = latin = vi = 0
+    for ch in text:
+        code = ord(ch)
+        if 0x3040 <= code <= 0x30FF or 0xFF66 <= code <= 0xFF9F:
+            kana += 1
+        elif 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF:
+            kanji += 1
+        elif ch.isalpha() and code < 0x250:
+            latin += 1
+        elif ch.isalpha():
+            base = unicodedata.normalize("NFD", ch)[0]
+            if ch in _VI_LETTERS or (base.isascii() and base.isalpha()):
+                vi += 1
+        if ch in _VI_LETTERS:
+            vi += 1
+
+    cjk = kana + kanji
+    if cjk and (kana or cjk >= latin + vi):
+        return "JP"
+    if vi and vi * 20 >= latin:
+        return "VI"
+    if latin:
+        return "EN"
+    return ""
+
+
+def is_japanese(text: str) -> bool:
+    return detect_language(text) == "JP"
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+
+_SPACES = re.compile(r"[ \t　]+")
+_ALL_SPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    # NFKC folds full-width ASCII / half-width kana that OCR mixes freely
+    text = unicodedata.normalize("NFKC", text or "")
+    lines = [_SPACES.sub(" ", line).strip() for line in text.splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+def line_key(text: str) -> str:
+    """Comparison key for a single OCR line: spacing differences are noise."""
+    return _ALL_SPACE.sub("", normalize_text(text))
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+
+import re
+
+import numpy as np
+from PIL import Image
+
+from jp_assist_ai.core.text.normalizer import line_key
+
+_INK_THRESHOLD = 48
+# Projections are computed on a copy this many times smaller; plenty to find gaps between text lines
+_PROFILE_STEP = 2
+# Section labels of an image translation (translate.jinja), tolerating Markdown emphasis or headings
+_SECTION = re.compile(r"^[#*\s]*(original|translation)[*\s]*:[*\s]*$", re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class Tile:
+    column: int  # reading order: every tile of column 0, top to bottom, then column 1, ...
+    row: int
+    box: tuple[int, int, int, int]  # left, top, right, bottom in source pixels
+
+
+def plan_tiles(image: Image.Image, max_width: int = 1536, max_height: int = 1024, overlap: int = 48) -> list[Tile]:
+    """
+    Split a large image into tiles no bigger than max_width x max_height.
+
+    Columns are cut first, on vertical gutters that run the full height
+    (side-by-side windows, multi-column pages), then each column is cut into
+    rows on blank horizontal bands so text lines are not sliced. Where no
+    gap is found the cut is forced, and neighbouring tiles overlap by
+    `overlap` pixels so a sliced line is still whole in one of them.
+    """
+    if image.width <= max_width and image.height <= max_height:
+        return [Tile(0, 0, (0, 0, image.width, image.height))]
+
+    ink = _ink_mask(image)
+    tiles: list[Tile] = []
+    # Column gutters must be wide; a few blank pixels between glyphs are not a gutter
+    columns = _cuts(ink.any(axis=0), image.width, max_width, overlap, min_gap=24)
+    for c, (left, right) in enumerate(columns):
+        band = ink[:, left // _PROFILE_STEP : max(left // _PROFILE_STEP + 1, right // _PROFILE_STEP)]
+        rows = _cuts(band.any(axis=1), image.height, max_height, overlap, min_gap=4)
+        tiles.extend(Tile(c, r, (left, top, right, bottom)) for r, (top, bottom) in enumerate(rows))
+    return tiles
+
+
+def _ink_mask(image: Image.Image) -> np.ndarray:
+    small = image.convert("L").reduce(_PROFILE_STEP) if _PROFILE_STEP > 1 else image.convert("L")
+    luma = np.asarray(small, dtype=np.int16)
+    background = int(np.median(luma[::8, ::8]))
+    return np.abs(luma - background) > _INK_THRESHOLD
+
+
+def _cuts(profile: np.ndarray, length: int, limit: int, overlap: int, min_gap: int) -> list[tuple[int, int]]:
+    """Spans covering [0, length), each at most `limit` long, ending in blank runs of `profile` where possible."""
+    if length <= limit:
+        return [(0, length)]
+    overlap = min(overlap, limit // 4)
+    blank = ~profile
+    spans: list[tuple[int, int]] = []
+    start = 0
+    while start < length:
+        remaining = length - start
+        if remaining <= limit:
+            spans.append((start, length))
+            break
+        # Aim for an even split of what is left so the last tile is not a sliver
+        target = start + -(-remaining // -(-remaining // limit))
+        end = start + limit
+        cut = _best_gap(blank, max(start + limit // 2, target - limit // 4), min(end, target + limit // 4), min_gap)
+        if cut is None:
+            cut = min(end, target)
+            spans.append((start, cut))
+            start = cut - overlap
+        else:
+            spans.append((start, cut))
+            # Cut in whitespace: the next tile only needs a sliver of context
+            start = max(start + 1, cut - overlap // 4)
+    return spans
+
+
+def _best_gap(blank: np.ndarray, lo: int, hi: int, min_gap: int) -> int | None:
+    """Middle of the widest blank run (at least min_gap) in [lo, hi), in source pixels; ties go to the later one."""
+    a, b = lo // _PROFILE_STEP, min(len(blank), hi // _PROFILE_STEP)
+    window = blank[a:b]
+    if not window.any():
+        return None
+    # Run boundaries of the blank mask
+    padded = np.concatenate(([False], window, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    starts, stops = edges[::2], edges[1::2]
+    widths = stops - starts
+    best = len(widths) - 1 - int(np.argmax(widths[::-1]))
+    if widths[best] * _PROFILE_STEP < min_gap:
+        return None
+    return int(a + (starts[best] + stops[best]) // 2) * _PROFILE_STEP
+
+
+def merge_tile_texts(tiles: list[Tile], texts: list[str]) -> str:
+    """
+    Join per-tile results in reading order, dropping lines repeated across a
+    row overlap. Each tile answers with an original and a translation
+    section; the overlap is found between the originals of neighbouring
+    tiles, which repeat verbatim, and the same lines are dropped from a
+    line-for-line translation (otherwise the translations are compared).
+    """
+    originals: dict[int, list[str]] = {}
+    translations: dict[int, list[str]] = {}
+    for tile, text in sorted(zip(tiles, texts), key=lambda pair: (pair[0].column, pair[0].row)):
+        original, translation = split_sections(text)
+        merged_original = originals.setdefault(tile.column, [])
+        merged_translation = translations.setdefault(tile.column, [])
+        repeated = _overlap_length(merged_original, original)
+        merged_original.extend(original[repeated:])
+        if not (original and len(original) == len(translation)):
+            # Not line for line: the translations have to be compared themselves
+            repeated = _overlap_length(merged_translation, translation)
+        merged_translation.extend(translation[repeated:])
+    translated = _join_columns(translations)
+    original = _join_columns(originals)
+    return f"Original:\n{original}\n\nTranslation:\n{translated}" if original else translated
+
+
+def split_sections(text: str) -> tuple[list[str], list[str]]:
+    """Non-blank (original, translation) lines of an image translation; unlabelled text counts as translation."""
+    sections: dict[str, list[str]] = {"original": [], "translation": []}
+    current = "translation"
+    for line in text.splitlines():
+        match = _SECTION.match(line)
+        if match:
+            current = match.group(1).lower()
+        elif line.strip():
+            sections[current].append(line)
+    return sections["original"], sections["translation"]
+
+
+def _join_columns(columns: dict[int, list[str]]) -> str:
+    return "\n\n".join("\n".join(lines) for _, lines in sorted(columns.items()) if lines)
+
+
+def _overlap_length(previous: list[str], lines: list[str], max_lines: int = 6) -> int:
+    """How many leading `lines` repeat the tail of `previous` (fuzzily: models rephrase a little)."""
+    for n in range(min(max_lines, len(previous), len(lines)), 0, -1):
+        if all(_same_line(a, b) for a, b in zip(previous[-n:], lines[:n])):
+            return n
+    return 0
+
+
+def _same_line(a: str, b: str) -> bool:
+    ka, kb = line_key(a), line_key(b)
+    if ka == kb:
+        return True
+    return SequenceMatcher(None, ka, kb, autojunk=False).ratio() >= 0.85
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import difflib
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from jp_assist_ai.adapters.llm.base import Translator
+
+STYLES = ("business", "comtor", "technical")
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[。！？!?])")
+
+
+@dataclass(frozen=True)
+class RewriteChunk:
+    source: str
+    separator: str  # whitespace that followed the chunk in the draft
+
+
+@dataclass(frozen=True)
+class RewriteResult:
+    source: str
+    text: str
+    chunks: tuple[tuple[RewriteChunk, str], ...]
+
+    def opcodes(self) -> list[tuple[str, int, int, int, int]]:
+        # Character level: Japanese has no word boundaries to diff on
+        return difflib.SequenceMatcher(None, self.source, self.text, autojunk=False).get_opcodes()
+
+    def unified_diff(self) -> str:
+        return "\n".join(
+            difflib.unified_diff(
+                self.source.splitlines(),
+                self.text.splitlines(),
+                fromfile="draft",
+                tofile="rewrite",
+                lineterm="",
+            )
+        )
+
+
+def split_chunks(text: str, max_chars: int) -> list[RewriteChunk]:
+    """Split at paragraph breaks, then sentence ends, packing pieces up to max_chars."""
+    pieces: list[RewriteChunk] = []
+    pos = 0
+    for match in _PARAGRAPH_BREAK.finditer(text):
+        pieces.extend(_split_paragraph(text[pos:match.start()], match.group(0), max_chars))
+        pos = match.end()
+    pieces.extend(_split_paragraph(text[pos:], "", max_chars))
+
+    chunks: list[RewriteChunk] = []
+    for piece in pieces:
+        if chunks:
+            last = chunks[-1]
+            if len(last.source) + len(last.separator) + len(piece.source) <= max_chars:
+                chunks[-1] = RewriteChunk(last.source + last.separator + piece.source, piece.separator)
+                continue
+        chunks.append(piece)
+    return [chunk for chunk in chunks if chunk.source or chunk.separator]
+
+
+def _split_paragraph(paragraph: str, separator: str, max_chars: int) -> list[RewriteChunk]:
+    if len(paragraph) <= max_chars:
+        return [RewriteChunk(paragraph, separator)]
+    sentences = [s for s in _SENTENCE_END.split(paragraph) if s]
+    result: list[RewriteChunk] = []
+    current = ""
+    for sentence in sentences:
+        if current and len(current) + len(sentence) > max_chars:
+            result.append(RewriteChunk(current, ""))
+            current = ""
+        current += sentence
+    result.append(RewriteChunk(current, separator))
+    return result
+
+
+class RewriteJapanese:
+    """
+    Rewrites long drafts chunk by chunk with bounded concurrency.
+
+    Each chunk sees the tail of the previous chunk and the head of the next one
+    as read-only context, so tone and references stay consistent across chunk
+    boundaries while the chunks themselves are rewritten in parallel.
+    """
+
+    def __init__(
+        self,
+        translator: Translator,
+        max_chars: int = 1200,
+        max_workers: int = 4,
+        context_chars: int = 200,
+    ):
+        self._translator = translator
+        self._max_chars = max_chars
+        self._max_workers = max(1, max_workers)
+        self._context_chars = context_chars
+
+    def execute(self, text: str, style: str = "business") -> RewriteResult:
+        chunks = split_chunks(text, self._max_chars)
+        if not chunks:
+            return RewriteResult(source=text, text=text, chunks=())
+
+        workers = min(self._max_workers, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rewrite") as pool:
+            futures = [
+                pool.submit(self._rewrite_chunk, chunk, style, self._context(chunks, i))
+                for i, chunk in enumerate(chunks)
+            ]
+            rewritten = [future.result() for future in futures]
+
+        stitched = "".join(out + chunk.separator for chunk, out in zip(chunks, rewritten))
+        return RewriteResult(source=text, text=stitched, chunks=tuple(zip(chunks, rewritten)))
+
+    def _rewrite_chunk(self, chunk: RewriteChunk, style: str, context: str) -> str:
+        if not chunk.source.strip():
+            return chunk.source
+        return self._translator.rewrite_text(chunk.source, style, context)
+
+    def _context(self, chunks: list[RewriteChunk], index: int) -> str:
+        if self._context_chars <= 0:
+            return ""
+        parts: list[str] = []
+        if index > 0:
+            parts.append("[before]\n" + chunks[index - 1].source[-self._context_chars:])
+        if index + 1 < len(chunks):
+            parts.append("[after]\n" + chunks[index + 1].source[: self._context_chars])
+        return "\n".join(parts)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+
+from jp_assist_ai.adapters.llm.base import Translator
+from jp_assist_ai.core.prompts.templates import get_prompts
+from jp_assist_ai.core.text.lang_detect import detect_language
+from jp_assist_ai.core.text.normalizer import normalize_text
+
+
+@dataclass(frozen=True)
+class ClipboardTranslation:
+    digest: str
+    source: str
+    src_lang: str
+    dst_lang: str
+    text: str
+
+
+class TranslateClipboard:
+    """
+    Speculative translation of clipboard text.
+
+    `prefetch` is called for every (debounced) clipboard change and only spends
+    backend calls on Japanese text within the size cap, at most once per
+    `min_interval` seconds. `request` is the explicit path used by the hotkey and
+    returns the cached or in-flight result when the text was already prefetched.
+    """
+
+    def __init__(
+        self,
+        translator: Translator,
+        dst_lang: str = "VI",
+        max_chars: int = 4000,
+        min_interval: float = 2.0,
+        cache_size: int = 64,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._translator = translator
+        self._dst_lang = dst_lang
+        self._max_chars = max_chars
+        self._min_interval = min_interval
+        self._cache_size = cache_size
+        self._clock = clock
+        self._cache: OrderedDict[str, ClipboardTranslation] = OrderedDict()
+        self._inflight: dict[str, Future] = {}
+        self._last_prefetch = float("-inf")
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="clipboard")
+
+    def set_target_language(self, dst_lang: str) -> None:
+        with self._lock:
+            self._dst_lang = dst_lang
+
+    def cached(self, text: str) -> ClipboardTranslation | None:
+        source = normalize_text(text)
+        if not source:
+            return None
+        with self._lock:
+            return self._cache.get(self._digest(source))
+
+    def prefetch(self, text: str) -> Future | None:
+        source = normalize_text(text)
+        if not source or len(source) > self._max_chars:
+            return None
+        src_lang = detect_language(source)
+        if src_lang != "JP":
+            return None
+        with self._lock:
+            digest = self._digest(source)
+            known = self._known(digest)
+            if known is not None:
+                return known
+            now = self._clock()
+            if now - self._last_prefetch < self._min_interval:
+                return None
+            self._last_prefetch = now
+            return self._submit(digest, source, src_lang)
+
+    def request(self, text: str) -> Future | None:
+        source = normalize_text(text)
+        if not source:
+            return None
+        src_lang = detect_language(source) or "JP"
+        with self._lock:
+            digest = self._digest(source)
+            known = self._known(digest)
+            if known is not None:
+                return known
+            return self._submit(digest, source, src_lang)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _digest(self, source: str) -> str:
+        version = get_prompts().version("translate")
+        return hashlib.sha256(f"{version}\0{self._dst_lang}\0{source}".encode("utf-8")).hexdigest()
+
+    def _known(self, digest: str) -> Future | None:
+        hit = self._cache.get(digest)
+        if hit is not None:
+            self._cache.move_to_end(digest)
+            done: Future = Future()
+            done.set_result(hit)
+            return done
+        return self._inflight.get(digest)
+
+    def _submit(self, digest: str, source: str, src_lang: str) -> Future:
+        future = self._executor.submit(self._translate, digest, source, src_lang, self._dst_lang)
+        self._inflight[digest] = future
+        return future
+
+    def _translate(self, digest: str, source: str, src_lang: str, dst_lang: str) -> ClipboardTranslation:
+        try:
+            text = self._translator.translate_text(source, src_lang, dst_lang)
+            result = ClipboardTranslation(
+                digest=digest,
+                source=source,
+                src_lang=src_lang,
+                dst_lang=dst_lang,
+                text=text,
+            )
+            with self._lock:
+                self._cache[digest] = result
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(digest, None)
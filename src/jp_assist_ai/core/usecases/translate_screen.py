@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Sequence
+
+from PIL import Image
+
+from jp_assist_ai.core.models import OcrLine, ScreenTranslation
+from jp_assist_ai.core.pipeline import IncrementalTranslator
+
+if TYPE_CHECKING:
+    from jp_assist_ai.adapters.ocr.base import OcrEngine
+
+
+class TranslateScreen:
+    def __init__(self, ocr: OcrEngine, pipeline: IncrementalTranslator):
+        self._ocr = ocr
+        self._pipeline = pipeline
+
+    def execute(self, image: Image.Image, src_lang: str, dst_lang: str) -> ScreenTranslation:
+        return self.translate_lines(self.recognize(image), src_lang, dst_lang)
+
+    def recognize(self, image: Image.Image) -> list[OcrLine]:
+        return self._ocr.recognize_lines(image)
+
+    def translate_lines(self, lines: Sequence[OcrLine], src_lang: str, dst_lang: str) -> ScreenTranslation:
+        """Translate lines already recognized; ones seen before come from the line memory."""
+        return self._pipeline.translate_lines([line.text for line in lines], src_lang, dst_lang)
@@ -0,0 +1,202 @@
+"""
+Streaming export / import of translation history.
+
+An archive is an uncompressed tar stream of:
+
+    manifest.json              format version and the codec of the chunks
+    images/<sha256>.png        each image referenced by history, once
+    history/000000.jsonl.zst   entries, oldest first, `chunk_rows` per member
+                               (.jsonl.gz when zstandard is not installed)
+
+Images come before the entries that point at them, so an import can go
+member by member. PNGs are already compressed and are stored as-is; only the
+JSONL chunks are. Both directions read the database and the archive in
+bounded batches, so memory stays flat whatever the history size.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import tarfile
+import time
+from dataclasses import dataclass
+from typing import IO, Iterator
+
+from jp_assist_ai.adapters.storage.base import HistoryEntry, HistoryStore
+
+FORMAT = 1
+_KIND = "jp-assist-history"
+_IMAGE_BATCH = 64
+_IMPORT_BATCH = 1000
+_JSON = json.JSONEncoder(ensure_ascii=False)
+
+
+@dataclass(frozen=True)
+class ArchiveStats:
+    entries: int
+    images: int
+    skipped: int = 0  # entries already in history (import only)
+
+
+def export_history(store: HistoryStore, path: str, chunk_rows: int = 5000, codec: str | None = None) -> ArchiveStats:
+    """Write all of history to `path` (replaced only once the archive is complete)."""
+    codec = codec or ("zstd" if _zstd() is not None else "gzip")
+    # Checked before reading history: a missing codec should not cost a partial export
+    _compress(codec, b"")
+    newest = store.history(limit=1)
+    # Entries recorded during the export are left for the next one: their images may not be in it
+    last_id = newest[0].id if newest else 0
+    tmp = path + ".tmp"
+    try:
+        stats = _write(store, tmp, chunk_rows, codec, last_id)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    os.replace(tmp, path)
+    return stats
+
+
+def import_history(store: HistoryStore, path: str) -> ArchiveStats:
+    """Add the entries of an archive to history; entries already there are skipped, so re-importing is safe."""
+    entries = images = skipped = 0
+    pending: list[bytes] = []
+
+    def flush_images() -> None:
+        nonlocal images
+        if pending:
+            store.import_history((), pending)
+            images += len(pending)
+            pending.clear()
+
+    def add_entries(batch: list[HistoryEntry]) -> None:
+        nonlocal entries, skipped
+        added = store.import_history(batch)
+        entries += added
+        skipped += len(batch) - added
+
+    with open(path, "rb") as f, tarfile.open(fileobj=f, mode="r|") as tar:
+        manifest = None
+        for member in tar:
+            if not member.isfile():
+                continue
+            data = tar.extractfile(member)
+            if member.name == "manifest.json":
+                manifest = json.load(data)
+                if manifest.get("kind") != _KIND or manifest.get("format") != FORMAT:
+                    raise ValueError(f"{path}: not a history archive this version can read")
+            elif manifest is None:
+                raise ValueError(f"{path}: archive does not start with a manifest")
+            elif member.name.startswith("images/"):
+                blob = data.read()
+                if f"images/{hashlib.sha256(blob).hexdigest()}.png" != member.name:
+                    raise ValueError(f"{path}: {member.name} is corrupt")
+                pending.append(blob)
+                if len(pending) >= _IMAGE_BATCH:
+                    flush_images()
+            elif member.name.startswith("history/"):
+                flush_images()
+                batch: list[HistoryEntry] = []
+                for entry in _decode(_decompress(member.name, data)):
+                    batch.append(entry)
+                    if len(batch) >= _IMPORT_BATCH:
+                        add_entries(batch)
+                        batch = []
+                if batch:
+                    add_entries(batch)
+        flush_images()
+    return ArchiveStats(entries, images, skipped)
+
+
+_EXTENSIONS = {"zstd": "zst", "gzip": "gz"}
+
+
+def _write(store: HistoryStore, path: str, chunk_rows: int, codec: str, last_id: int) -> ArchiveStats:
+    entries = images = 0
+    with open(path, "wb") as f, tarfile.open(fileobj=f, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+        _add(tar, "manifest.json", json.dumps({"kind": _KIND, "format": FORMAT, "codec": codec}).encode())
+
+        digest = ""
+        while batch := store.history_images_after(digest, _IMAGE_BATCH):
+            for digest, data in batch:
+                _add(tar, f"images/{digest}.png", data)
+            images += len(batch)
+
+        after = 0
+        chunk = 0
+        while rows := [entry for entry in store.history_after(after, chunk_rows) if entry.id <= last_id]:
+            lines = b"".join(_encode(entry) for entry in rows)
+            _add(tar, f"history/{chunk:06d}.jsonl.{_EXTENSIONS[codec]}", _compress(codec, lines))
+            after = rows[-1].id
+            entries += len(rows)
+            chunk += 1
+    return ArchiveStats(entries, images)
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def _compress(codec: str, data: bytes) -> bytes:
+    if codec == "zstd":
+        zstandard = _zstd()
+        if zstandard is None:
+            raise RuntimeError("zstd archives need the zstandard package (pip install zstandard)")
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    if codec == "gzip":
+        # Level 1 keeps the export at disk speed; higher levels shave a few percent off the text only
+        return gzip.compress(data, compresslevel=1, mtime=0)
+    raise ValueError(f"Unsupported archive codec: {codec}")
+
+
+def _decompress(name: str, data: IO[bytes]) -> IO[bytes]:
+    if name.endswith(".zst"):
+        zstandard = _zstd()
+        if zstandard is None:
+            raise RuntimeError(f"{name} is zstd-compressed: install the zstandard package to import it")
+        return zstandard.ZstdDecompressor().stream_reader(data)
+    if name.endswith(".gz"):
+        return gzip.GzipFile(fileobj=data)
+    raise ValueError(f"Unsupported archive member: {name}")
+
+
+def _add(tar: tarfile.TarFile, name: str, data: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = int(time.time())
+    tar.addfile(info, io.BytesIO(data))
+
+
+def _encode(entry: HistoryEntry) -> bytes:
+    row = {
+        "created_at": entry.created_at,
+        "src_lang": entry.src_lang,
+        "dst_lang": entry.dst_lang,
+        "source": entry.source,
+        "translation": entry.translation,
+        "image": entry.image,
+    }
+    return _JSON.encode(row).encode() + b"\n"
+
+
+def _decode(stream: IO[bytes]) -> Iterator[HistoryEntry]:
+    for line in io.TextIOWrapper(stream, encoding="utf-8"):
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        yield HistoryEntry(
+            0,
+            float(row["created_at"]),
+            row["src_lang"],
+            row["dst_lang"],
+            row.get("source"),
+            row["translation"],
+            row.get("image"),
+        )
@@ -0,0 +1,93 @@
+"""
+Semantic search over translation history, all local.
+
+History entries are embedded (hashed character n-grams, no model) into a
+memory-mapped vector store as they are added; `sync` catches up on entries
+recorded since the last run. Queries are centered on the corpus mean, so
+n-grams that every entry shares ("the", "です") count for little.
+"""
+from __future__ import annotations
+
+import re
+import threading
+
+import numpy as np
+
+from jp_assist_ai.adapters.storage.base import HistoryEntry, HistoryStore
+from jp_assist_ai.adapters.storage.vector_store import VectorStore
+from jp_assist_ai.config.logging import span
+from jp_assist_ai.core.embedding import HashedNgramEmbedder
+
+# The mean is discounted by n / (n + _MEAN_PRIOR): over a handful of entries
+# it is mostly those entries themselves, not what every entry has in common
+_MEAN_PRIOR = 200
+# ScreenTranslation.format() labels: in every entry, so only noise to a search
+_LABELS = re.compile(r"^(Original|Translation):$", re.MULTILINE)
+
+
+class HistorySearch:
+    def __init__(
+        self,
+        store: HistoryStore,
+        directory: str,
+        embedder: HashedNgramEmbedder | None = None,
+        ivf_min: int = 50_000,
+        nprobe: int = 16,
+    ):
+        self._store = store
+        self._embedder = embedder or HashedNgramEmbedder()
+        self._vectors = VectorStore(directory, self._embedder.dim, tag="hashed-ngram-2-3")
+        self._ivf_min = ivf_min
+        self._nprobe = nprobe
+        self._sync_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def sync(self, batch: int = 2048) -> int:
+        """Embed history entries not indexed yet; returns how many were added."""
+        added = 0
+        with self._sync_lock:
+            last = self._vectors.last_id()
+            while True:
+                entries = self._store.history_after(last, batch)
+                if not entries:
+                    break
+                with span("history_search.embed", entries=len(entries)):
+                    vectors = self._embedder.embed_many([searchable_text(entry) for entry in entries])
+                ids = np.fromiter((entry.id for entry in entries), np.int64, len(entries))
+                self._vectors.append(ids, vectors)
+                last = entries[-1].id
+                added += len(entries)
+            n = len(self._vectors)
+            # Lists are rebuilt once the rows they do not cover would make up a third of the search
+            if n >= self._ivf_min and n > 1.5 * self._vectors.ivf_rows:
+                with span("history_search.build_ivf", rows=n):
+                    self._vectors.build_ivf()
+        return added
+
+    def search(self, query: str, limit: int = 20) -> list[tuple[HistoryEntry, float]]:
+        vector = self._embedder.embed(query)
+        if not vector.any():
+            return []
+        n = len(self._vectors)
+        vector = vector - self._vectors.mean() * (n / (n + _MEAN_PRIOR))
+        vector /= max(float(np.linalg.norm(vector)), 1e-12)
+        with span("history_search.query", rows=n):
+            hits = self._vectors.search(vector, limit, nprobe=self._nprobe)
+        results = []
+        for history_id, score in hits:
+            # Below zero an entry is less like the query than the average entry is
+            if score <= 0:
+                break
+            entry = self._store.get_history(history_id)
+            if entry is not None:
+                results.append((entry, score))
+        return results
+
+
+def searchable_text(entry: HistoryEntry) -> str:
+    text = entry.translation
+    if entry.source and entry.source not in text:
+        text = f"{entry.source}\n{text}"
+    return _LABELS.sub("", text)
@@ -0,0 +1,210 @@
+"""
+Durable queue for translations the backend could not take.
+
+A capture whose translation failed because the backend was unreachable,
+throttled or timing out is written to SQLite (source lines, or the image as
+PNG) instead of being lost. A drainer thread replays the queue once the
+backend answers again: text jobs of a language pair are merged into one
+request, images go one request each, interactive jobs ahead of batch ones.
+Results land in history; listeners hear about each job as it finishes.
+"""
+from __future__ import annotations
+
+import io
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Sequence
+
+from PIL import Image
+
+from jp_assist_ai.adapters.llm.transport import is_transient
+from jp_assist_ai.adapters.storage.base import HistoryEntry, JobStore, QueuedJob
+from jp_assist_ai.config.logging import span
+from jp_assist_ai.core.models import LineTranslation, ScreenTranslation
+
+INTERACTIVE = 0
+BATCH = 10
+
+_log = logging.getLogger(__name__)
+
+Listener = Callable[[QueuedJob, HistoryEntry | None, str | None], None]
+
+
+def encode_png(image: Image.Image) -> bytes:
+    # Fast compression: this runs on the failure path of an interactive request
+    buf = io.BytesIO()
+    image.save(buf, format="PNG", compress_level=1)
+    return buf.getvalue()
+
+
+def is_retryable(exc: BaseException) -> bool:
+    from jp_assist_ai.services.worker_process import WorkerError
+
+    if isinstance(exc, WorkerError):
+        return exc.transient
+    return is_transient(exc)
+
+
+class TranslationQueue:
+    """
+    While the backend keeps failing the drainer backs off (doubling up to
+    `max_delay`) and then probes with a single job; the first success lifts
+    the backoff and full batches resume.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        translate_lines: Callable[[list[str], str, str], list[str]],
+        translate_image: Callable[[Image.Image, str, str], str],
+        batch_size: int = 8,
+        concurrency: int = 4,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        self._store = store
+        self._translate_lines = translate_lines
+        self._translate_image = translate_image
+        self._batch_size = max(1, batch_size)
+        self._concurrency = max(1, concurrency)
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._listeners: list[Listener] = []
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._failures = 0  # consecutive batches that failed transiently
+        self._offline_until = 0.0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            resumed = self._store.requeue_running()
+            if resumed:
+                _log.info("Resuming %d queued translations", resumed)
+            self._thread = threading.Thread(target=self._drain, name="translation-queue", daemon=True)
+            self._thread.start()
+
+    def add_listener(self, listener: Listener) -> None:
+        """Called on the drainer thread with (job, history entry, None) or (job, None, error)."""
+        self._listeners.append(listener)
+
+    def submit_lines(self, lines: Sequence[str], src_lang: str, dst_lang: str, priority: int = BATCH) -> QueuedJob:
+        job = self._store.enqueue_job(priority, src_lang, dst_lang, text="\n".join(lines))
+        self._wake.set()
+        return job
+
+    def submit_image(self, image: Image.Image, src_lang: str, dst_lang: str, priority: int = BATCH) -> QueuedJob:
+        job = self._store.enqueue_job(priority, src_lang, dst_lang, image=encode_png(image))
+        self._wake.set()
+        return job
+
+    def pending(self) -> int:
+        return self._store.pending_jobs()
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _drain(self) -> None:
+        with ThreadPoolExecutor(self._concurrency, thread_name_prefix="queue-llm") as pool:
+            while not self._closed:
+                self._wake.clear()
+                now = time.time()
+                if now < self._offline_until:
+                    self._wake.wait(self._offline_until - now)
+                    continue
+                # While the backend is failing, one job is enough to find out whether it is back
+                jobs = self._store.claim_jobs(1 if self._failures else self._batch_size, now)
+                if not jobs:
+                    due = self._store.next_job_due()
+                    self._wake.wait(None if due is None else max(0.0, due - now))
+                    continue
+                with span("queue.batch", jobs=len(jobs)):
+                    outcomes = list(pool.map(self._run_unit, _units(jobs)))
+                if all(outcomes):
+                    self._failures = 0
+                elif not any(outcomes):
+                    self._failures += 1
+                    self._offline_until = time.time() + self._delay(self._failures)
+
+    def _run_unit(self, jobs: list[QueuedJob]) -> bool:
+        """Translate one request's worth of jobs; False when the backend failed transiently."""
+        try:
+            if jobs[0].image is not None:
+                results = [self._run_image(jobs[0])]
+            else:
+                results = self._run_text(jobs)
+        except Exception as exc:
+            if is_retryable(exc):
+                for job in jobs:
+                    self._store.retry_job(job, time.time() + self._delay(job.attempts), str(exc))
+                return False
+            if len(jobs) > 1:
+                # Merging may be what broke it (e.g. a per-request token budget): try them one by one
+                return all([self._run_unit([job]) for job in jobs])
+            _log.warning("Queued translation %d failed: %s", jobs[0].id, exc)
+            self._store.fail_job(jobs[0], str(exc))
+            self._notify(jobs[0], None, str(exc))
+            return True
+        for job, (translation, source) in zip(jobs, results):
+            entry = self._store.complete_job(job, translation, source)
+            self._notify(job, entry, None)
+        return True
+
+    def _run_image(self, job: QueuedJob) -> tuple[str, None]:
+        data = self._store.get_image(job.image)
+        if data is None:
+            raise ValueError(f"image {job.image} is missing from the store")
+        with Image.open(io.BytesIO(data)) as png:
+            image = png.convert("RGB")
+        return self._translate_image(image, job.src_lang, job.dst_lang), None
+
+    def _run_text(self, jobs: list[QueuedJob]) -> list[tuple[str, str]]:
+        sources = [[line.strip() for line in (job.text or "").splitlines() if line.strip()] for job in jobs]
+        merged = [line for lines in sources for line in lines]
+        translations = self._translate_lines(merged, jobs[0].src_lang, jobs[0].dst_lang) if merged else []
+        if len(translations) != len(merged):
+            # Lines would shift between jobs; merged jobs are retried one by one, a single one fails
+            raise ValueError(f"expected {len(merged)} translated lines, got {len(translations)}")
+        results, start = [], 0
+        for lines in sources:
+            done = translations[start : start + len(lines)]
+            start += len(lines)
+            screen = ScreenTranslation(tuple(LineTranslation(s, t) for s, t in zip(lines, done)))
+            results.append((screen.format(), "\n".join(lines)))
+        return results
+
+    def _delay(self, attempt: int) -> float:
+        # Jittered so jobs that failed together do not all come back in the same second
+        return random.uniform(0.5, 1.0) * min(self._max_delay, self._base_delay * 2 ** max(0, attempt - 1))
+
+    def _notify(self, job: QueuedJob, entry: HistoryEntry | None, error: str | None) -> None:
+        for listener in self._listeners:
+            try:
+                listener(job, entry, error)
+            except Exception:
+                _log.exception("Queue listener failed")
+
+
+def _units(jobs: list[QueuedJob]) -> list[list[QueuedJob]]:
+    """One request each: text jobs merged per language pair, in the order of their most urgent job."""
+    units: list[list[QueuedJob]] = []
+    text_units: dict[tuple[str, str], list[QueuedJob]] = {}
+    for job in jobs:
+        if job.image is not None:
+            units.append([job])
+            continue
+        unit = text_units.get((job.src_lang, job.dst_lang))
+        if unit is None:
+            unit = text_units[(job.src_lang, job.dst_lang)] = []
+            units.append(unit)
+        unit.append(job)
+    return units
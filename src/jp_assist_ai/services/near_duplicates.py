@@ -0,0 +1,109 @@
+"""
+Reuse the translation of a capture seen before.
+
+Every capture translated into history gets a perceptual signature. A new
+capture is looked up by dHash in a multi-index table, candidates are
+checked against their pHash, then their cell grid. That only narrows the
+search: a one-glyph edit ("1,000" -> "9,000", "allowed" -> "not allowed")
+moves none of these, so a candidate is reused only once confirmed, either
+by the stored capture matching the new one pixel for pixel or by the
+earlier recognized text matching the new OCR text. Then its translation is
+returned without an LLM call.
+"""
+from __future__ import annotations
+
+import io
+import threading
+
+import numpy as np
+from PIL import Image
+
+from jp_assist_ai.adapters.storage.base import HistoryEntry, HistoryStore
+from jp_assist_ai.config.logging import span
+from jp_assist_ai.core.near_duplicate import CaptureSignature, MultiIndexHash, hamming, signature
+
+# Candidates verified per lookup; the rest are further away anyway
+_MAX_CHECKED = 8
+# Grey levels an unchanged pixel may drift by (colour management rounding); any edit to a glyph moves far more
+_PIXEL_TOLERANCE = 8
+
+
+class NearDuplicateIndex:
+    def __init__(self, store: HistoryStore, radius: int = 4, max_changed: int = 12):
+        self._store = store
+        self._radius = radius
+        self._max_changed = max_changed
+        self._index: MultiIndexHash[tuple[int, str, str, int]] = MultiIndexHash(radius)
+        self._lock = threading.Lock()
+        with span("near_duplicate.load"):
+            for history_id, src_lang, dst_lang, dhash, phash in store.capture_hashes():
+                self._index.add(dhash, (history_id, src_lang, dst_lang, phash))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def find(
+        self,
+        sig: CaptureSignature,
+        src_lang: str,
+        dst_lang: str,
+        image: Image.Image | None = None,
+        text: str | None = None,
+    ) -> HistoryEntry | None:
+        """
+        The history entry of an earlier capture translated between the same
+        languages that is confirmed to show the same thing: its stored capture
+        equals `image`, or its recognized text equals `text`. Either may be
+        None to skip that check; with both None nothing is ever returned.
+        """
+        if image is None and text is None:
+            return None
+        with self._lock:
+            candidates = self._index.search(sig.dhash)
+        checked = 0
+        for _, (history_id, src, dst, phash) in candidates:
+            if (src, dst) != (src_lang, dst_lang) or hamming(phash, sig.phash) > self._radius:
+                continue
+            if checked == _MAX_CHECKED:
+                break
+            checked += 1
+            stored = self._store.capture_grid(history_id)
+            if stored is None:
+                continue
+            earlier = CaptureSignature(0, phash, *stored)
+            changed = sig.changed_cells(earlier)
+            if changed is None or changed > self._max_changed:
+                continue
+            entry = self._store.get_history(history_id)
+            if entry is not None and self._confirmed(entry, image, text):
+                return entry
+        return None
+
+    def _confirmed(self, entry: HistoryEntry, image: Image.Image | None, text: str | None) -> bool:
+        if text is not None and entry.source is not None and _words(text) == _words(entry.source):
+            return True
+        if image is None or entry.image is None:
+            return False
+        data = self._store.get_image(entry.image)
+        if data is None:
+            return False
+        with Image.open(io.BytesIO(data)) as png:
+            if png.size != image.size:
+                return False
+            before = np.asarray(png.convert("L"), np.int16)
+        after = np.asarray(image.convert("L"), np.int16)
+        return int(np.abs(before - after).max()) <= _PIXEL_TOLERANCE
+
+    def add(self, entry: HistoryEntry, sig: CaptureSignature) -> None:
+        self._store.add_capture_hash(entry.id, sig.dhash, sig.phash, sig.grid, sig.rows, sig.cols)
+        with self._lock:
+            self._index.add(sig.dhash, (entry.id, entry.src_lang, entry.dst_lang, sig.phash))
+
+    def add_png(self, entry: HistoryEntry, data: bytes) -> None:
+        """Index a capture known only as its stored PNG (a queued translation that just completed)."""
+        with Image.open(io.BytesIO(data)) as png:
+            self.add(entry, signature(png))
+
+
+def _words(text: str) -> list[str]:
+    return text.split()
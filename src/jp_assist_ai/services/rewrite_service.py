@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import os
+from functools import lru_cache
+
+from jp_assist_ai.core.usecases.rewrite_japanese import RewriteJapanese
+from jp_assist_ai.services.translate_service import get_translator
+
+
+@lru_cache(maxsize=1)
+def get_rewriter() -> RewriteJapanese:
+    return RewriteJapanese(
+        get_translator(),
+        max_chars=int(os.getenv("JP_ASSIST_REWRITE_CHUNK_CHARS", "1200")),
+        max_workers=int(os.getenv("JP_ASSIST_REWRITE_CONCURRENCY", "4")),
+    )
@@ -1,13 +1,223 @@
 from __future__ import annotations
 
+import atexit
 import os
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
 from jp_assist_ai.adapters.llm.base import Translator
+from jp_assist_ai.adapters.llm.coalescing import CoalescingTranslator
+from jp_assist_ai.adapters.llm.metered import MeteredTranslator
 from jp_assist_ai.adapters.llm.openai_llm import OpenAITranslator
+from jp_assist_ai.adapters.llm.tiled import TiledTranslator
+from jp_assist_ai.adapters.storage.sqlite_store import SqliteStore, default_db_path
+from jp_assist_ai.config.logging import span
+from jp_assist_ai.core.budget import Pricing, TokenBudget, image_rates_for
+from jp_assist_ai.core.pipeline import IncrementalTranslator
+from jp_assist_ai.core.usecases.translate_clipboard import TranslateClipboard
+from jp_assist_ai.core.usecases.translate_screen import TranslateScreen
 
+if TYPE_CHECKING:
+    from PIL import Image
 
+    from jp_assist_ai.adapters.storage.base import HistoryEntry, QueuedJob
+    from jp_assist_ai.services.history_search import HistorySearch
+    from jp_assist_ai.services.job_queue import TranslationQueue
+    from jp_assist_ai.services.near_duplicates import NearDuplicateIndex
+    from jp_assist_ai.services.worker_process import PipelineWorker
+
+
+@lru_cache(maxsize=1)
+def get_store() -> SqliteStore:
+    return SqliteStore()
+
+
+@lru_cache(maxsize=1)
 def get_translator() -> Translator:
     provider = os.getenv("JP_ASSIST_TRANSLATOR", "openai").lower()
     if provider == "openai":
-        return OpenAITranslator()
-    raise ValueError(f"Unsupported translator provider: {provider}")
+        inner = OpenAITranslator()
+        model = inner.model
+    else:
+        raise ValueError(f"Unsupported translator provider: {provider}")
+
+    ocr = get_ocr_engine()
+    metered = MeteredTranslator(
+        inner,
+        get_store(),
+        budget=TokenBudget(
+            per_request=int(os.getenv("JP_ASSIST_MAX_REQUEST_TOKENS", "0")),
+            per_day=int(os.getenv("JP_ASSIST_MAX_DAILY_TOKENS", "0")),
+        ),
+        pricing=Pricing(
+            input=float(os.getenv("JP_ASSIST_PRICE_INPUT", str(Pricing.input))),
+            cached_input=float(os.getenv("JP_ASSIST_PRICE_CACHED_INPUT", str(Pricing.cached_input))),
+            output=float(os.getenv("JP_ASSIST_PRICE_OUTPUT", str(Pricing.output))),
+        ),
+        image_rates=image_rates_for(model),
+        ocr=ocr.recognize if ocr is not None else None,
+    )
+    translator: Translator = metered
+    tile_width = int(os.getenv("JP_ASSIST_TILE_WIDTH", "1536"))
+    if tile_width > 0:
+        # Tiles go through the meter one by one, so budgets apply per request as before
+        translator = TiledTranslator(
+            metered,
+            max_width=tile_width,
+            max_height=int(os.getenv("JP_ASSIST_TILE_HEIGHT", "1024")),
+            max_workers=int(os.getenv("JP_ASSIST_TILE_CONCURRENCY", "4")),
+        )
+    # Outermost, so duplicate and batched requests are metered as the calls actually made
+    return CoalescingTranslator(
+        translator,
+        window=float(os.getenv("JP_ASSIST_COALESCE_WINDOW_MS", "10")) / 1000,
+        max_items=int(os.getenv("JP_ASSIST_COALESCE_MAX_ITEMS", "16")),
+        max_chars=int(os.getenv("JP_ASSIST_COALESCE_MAX_CHARS", "2000")),
+    )
+
+
+def ocr_configured() -> bool:
+    # OCR is opt-in; without it images go to the vision model as-is
+    return bool(os.getenv("JP_ASSIST_OCR", ""))
+
+
+@lru_cache(maxsize=1)
+def get_ocr_engine():
+    if not ocr_configured():
+        return None
+    engine = os.getenv("JP_ASSIST_OCR", "").lower()
+    if engine == "paddle":
+        from jp_assist_ai.adapters.ocr.paddle_ocr import PaddleOcrEngine
+
+        return PaddleOcrEngine()
+    if engine == "tesseract":
+        from jp_assist_ai.adapters.ocr.tesseract_ocr import TesseractOcrEngine
+
+        return TesseractOcrEngine(
+            lang=os.getenv("JP_ASSIST_OCR_LANG", "jpn"),
+            workers=int(os.getenv("JP_ASSIST_OCR_WORKERS", "0")) or None,
+            tessdata=os.getenv("TESSDATA_PREFIX") or None,
+        )
+    raise ValueError(f"Unsupported OCR engine: {engine}")
+
+
+@lru_cache(maxsize=1)
+def get_screen_translator() -> TranslateScreen | None:
+    ocr = get_ocr_engine()
+    if ocr is None:
+        return None
+    return TranslateScreen(ocr, IncrementalTranslator(get_translator()))
+
+
+@lru_cache(maxsize=1)
+def get_worker() -> PipelineWorker | None:
+    # The GUI runs OCR and translations in a worker process unless this is turned off
+    if os.getenv("JP_ASSIST_WORKER_PROCESS", "1") == "0":
+        return None
+    from jp_assist_ai.services.worker_process import PipelineWorker
+
+    worker = PipelineWorker(jobs=int(os.getenv("JP_ASSIST_WORKER_JOBS", "4")))
+    atexit.register(worker.close)
+    return worker
+
+
+@lru_cache(maxsize=1)
+def get_job_queue() -> TranslationQueue | None:
+    # Translations that failed on a transient backend error wait here instead of being dropped
+    if os.getenv("JP_ASSIST_QUEUE", "1") == "0":
+        return None
+    from jp_assist_ai.services.job_queue import TranslationQueue
+
+    worker = get_worker()
+    queue = TranslationQueue(
+        get_store(),
+        worker.translate_texts if worker is not None else _translate_queued_lines,
+        _queued_image_translator(worker),
+        batch_size=int(os.getenv("JP_ASSIST_QUEUE_BATCH", "8")),
+        max_delay=float(os.getenv("JP_ASSIST_QUEUE_MAX_DELAY_S", "60")),
+    )
+    queue.add_listener(_index_queued_capture)
+    atexit.register(queue.close)
+    return queue
+
+
+def _index_queued_capture(job: QueuedJob, entry: HistoryEntry | None, error: str | None) -> None:
+    if entry is None or entry.image is None:
+        return
+    index = get_capture_index()
+    data = get_store().get_image(entry.image) if index is not None else None
+    if data is not None:
+        index.add_png(entry, data)
+
+
+def _translate_queued_lines(texts: list[str], src_lang: str, dst_lang: str) -> list[str]:
+    return get_translator().translate_lines(texts, src_lang, dst_lang)
+
+
+def _queued_image_translator(worker: PipelineWorker | None):
+    def translate(image: Image.Image, src_lang: str, dst_lang: str) -> str:
+        if worker is not None:
+            from jp_assist_ai.core.frames import FrameView
+
+            frame = FrameView.from_image(image)
+            try:
+                return worker.translate(frame, src_lang, dst_lang)
+            finally:
+                frame.release()
+        screen = get_screen_translator()
+        if screen is not None:
+            return screen.execute(image, src_lang, dst_lang).format()
+        return get_translator().translate_image(image, src_lang, dst_lang)
+
+    return translate
+
+
+@lru_cache(maxsize=1)
+def get_capture_index() -> NearDuplicateIndex | None:
+    # Opt-in: a capture confirmed to show the same thing as one in history reuses its translation
+    if os.getenv("JP_ASSIST_NEAR_DUPLICATES", "0") != "1":
+        return None
+    from jp_assist_ai.services.near_duplicates import NearDuplicateIndex
+
+    return NearDuplicateIndex(
+        get_store(),
+        radius=int(os.getenv("JP_ASSIST_NEAR_DUPLICATE_RADIUS", "4")),
+        max_changed=int(os.getenv("JP_ASSIST_NEAR_DUPLICATE_MAX_CELLS", "12")),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_history_search() -> HistorySearch:
+    from jp_assist_ai.services.history_search import HistorySearch
+
+    return HistorySearch(
+        get_store(),
+        os.path.join(os.path.dirname(default_db_path()), "history_index"),
+        ivf_min=int(os.getenv("JP_ASSIST_SEARCH_IVF_MIN", "50000")),
+        nprobe=int(os.getenv("JP_ASSIST_SEARCH_NPROBE", "16")),
+    )
+
+
+def history_image_budget() -> int:
+    """Bytes of capture images kept with history, newest first; 0 keeps none."""
+    return int(float(os.getenv("JP_ASSIST_HISTORY_IMAGES_MB", "200")) * 1_000_000)
+
+
+@lru_cache(maxsize=1)
+def get_clipboard_translator() -> TranslateClipboard:
+    return TranslateClipboard(
+        get_translator(),
+        dst_lang=os.getenv("JP_ASSIST_CLIPBOARD_TARGET", "VI").upper(),
+    )
+
+
+def warm_up() -> None:
+    """Load the OCR model, build the translator and open its backend connection ahead of a request."""
+    with span("warm_up.services"):
+        engine = get_ocr_engine()
+        translator = get_translator()
+    with span("warm_up.connection"):
+        translator.warm_up()
+    if engine is not None:
+        with span("warm_up.ocr"):
+            engine.warm_up()
@@ -0,0 +1,305 @@
+"""
+Out-of-process pipeline worker for the GUI.
+
+OCR, PNG encoding and the LLM round trip run in a child process, so they
+never hold the GUI process's GIL while Qt paints. Capture pixels travel
+through `multiprocessing.shared_memory` segments (one copy in, none out);
+the pipe carries only small tuples:
+
+    client -> worker   (op, job, (segment, width, height) | None, args)
+    worker -> client   (job, ok, result | (error message, transient))
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing as mp
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Sequence
+
+import numpy as np
+from PIL import Image
+
+from jp_assist_ai.config.logging import span
+from jp_assist_ai.core.frames import FrameView
+from jp_assist_ai.core.models import OcrLine
+
+_log = logging.getLogger(__name__)
+
+
+class WorkerError(RuntimeError):
+    def __init__(self, message: str, transient: bool = False):
+        super().__init__(message)
+        self.transient = transient  # the same job may succeed later (backend down, worker restarting)
+
+
+class PipelineWorker:
+    """
+    Client side: starts the worker process on first use (and again if it
+    dies), uploads frames into reusable shared-memory segments and hands
+    back a Future per job. Calls block the calling thread only, so use
+    them from QThreads as before.
+    """
+
+    def __init__(self, jobs: int = 4, keep_segments: int = 2):
+        self._jobs = jobs
+        self._keep_segments = keep_segments
+        self._ctx = mp.get_context("spawn")  # forking a process that runs Qt is not safe
+        self._process = None
+        self._conn: Connection | None = None
+        self._pending: dict[int, tuple[Future, SharedMemory | None, Connection]] = {}
+        self._free: list[SharedMemory] = []
+        self._next_job = 0
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self.starts = 0
+
+    def start(self) -> None:
+        with self._lock:
+            self._ensure_started()
+
+    def warm_up(self) -> None:
+        self.submit("warm_up").result()
+
+    def translate(self, frame: FrameView, src_lang: str, dst_lang: str) -> str:
+        return self.submit("translate", frame, src_lang, dst_lang).result()
+
+    def recognize(self, frame: FrameView) -> list[OcrLine] | None:
+        """OCR lines of the frame, or None when no OCR engine is configured."""
+        return self.submit("recognize", frame).result()
+
+    def translate_lines(self, lines: Sequence[OcrLine], src_lang: str, dst_lang: str) -> str:
+        return self.submit("translate_lines", None, list(lines), src_lang, dst_lang).result()
+
+    def translate_texts(self, texts: Sequence[str], src_lang: str, dst_lang: str) -> list[str]:
+        """One translation per text, straight from the translator (no line memory, no formatting)."""
+        return self.submit("translate_texts", None, list(texts), src_lang, dst_lang).result()
+
+    def submit(self, op: str, frame: FrameView | None = None, *args: Any) -> Future:
+        segment = self._upload(frame) if frame is not None else None
+        future: Future = Future()
+        with self._lock:
+            self._ensure_started()
+            job = self._next_job
+            self._next_job += 1
+            conn = self._conn
+            self._pending[job] = (future, segment, conn)
+        payload = None if segment is None else (segment.name, frame.width, frame.height)
+        try:
+            with self._send_lock:
+                conn.send((op, job, payload, args))
+        except (OSError, ValueError) as exc:
+            self._finish(job, error=WorkerError(f"Worker process unavailable: {exc}", transient=True))
+        return future
+
+    def close(self) -> None:
+        with self._lock:
+            conn, process = self._conn, self._process
+            self._conn = self._process = None
+            segments, self._free = self._free, []
+        if conn is not None:
+            try:
+                with self._send_lock:
+                    conn.send(("stop", -1, None, ()))
+            except (OSError, ValueError):
+                pass
+            conn.close()
+        if process is not None:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for segment in segments:
+            _destroy(segment)
+
+    def _ensure_started(self) -> None:
+        if self._process is not None and self._process.is_alive():
+            return
+        parent, child = self._ctx.Pipe()
+        process = self._ctx.Process(target=serve, args=(child, self._jobs), name="jp-assist-worker", daemon=True)
+        with span("worker.start"):
+            process.start()
+        child.close()
+        self._conn, self._process = parent, process
+        self.starts += 1
+        threading.Thread(target=self._read, args=(parent,), name="worker-results", daemon=True).start()
+
+    def _upload(self, frame: FrameView) -> SharedMemory:
+        nbytes = frame.width * frame.height * 4
+        with self._lock:
+            fits = [segment for segment in self._free if segment.size >= nbytes]
+            segment = min(fits, key=lambda s: s.size) if fits else None
+            if segment is not None:
+                self._free.remove(segment)
+        if segment is None:
+            segment = SharedMemory(create=True, size=nbytes)
+        with span("worker.upload", width=frame.width, height=frame.height):
+            pixels = np.ndarray((frame.height, frame.width, 4), np.uint8, segment.buf)
+            pixels[:] = frame.array()
+            del pixels  # an exported view would keep the segment from closing
+        return segment
+
+    def _read(self, conn: Connection) -> None:
+        while True:
+            try:
+                job, ok, value = conn.recv()
+            except (EOFError, OSError):
+                break
+            if ok:
+                self._finish(job, result=value)
+            else:
+                self._finish(job, error=WorkerError(*value))
+        # The process is gone (crash or close): nothing sent to it will be answered
+        with self._lock:
+            if self._conn is conn:
+                self._conn = self._process = None
+            lost = [job for job, (_, _, sent_to) in self._pending.items() if sent_to is conn]
+        for job in lost:
+            self._finish(job, error=WorkerError("Worker process exited", transient=True))
+
+    def _finish(self, job: int, result: Any = None, error: BaseException | None = None) -> None:
+        with self._lock:
+            entry = self._pending.pop(job, None)
+            if entry is None:
+                return
+            future, segment, _ = entry
+            dropped = None
+            if segment is not None:
+                self._free.append(segment)
+                if len(self._free) > self._keep_segments:
+                    dropped = min(self._free, key=lambda s: s.size)
+                    self._free.remove(dropped)
+        if dropped is not None:
+            self._forget(dropped)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _forget(self, segment: SharedMemory) -> None:
+        # The worker still maps it; the memory is only returned once both sides let go
+        with self._lock:
+            conn = self._conn
+        if conn is not None:
+            try:
+                with self._send_lock:
+                    conn.send(("forget", -1, (segment.name, 0, 0), ()))
+            except (OSError, ValueError):
+                pass
+        _destroy(segment)
+
+
+def _destroy(segment: SharedMemory) -> None:
+    try:
+        segment.close()
+    except BufferError:
+        pass
+    try:
+        segment.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def serve(conn: Connection, jobs: int = 4) -> None:
+    """Worker process main loop. Jobs run on a thread pool so a long OCR does not hold up a translation."""
+    from jp_assist_ai.config.logging import setup_logging
+    from jp_assist_ai.services.translate_service import get_ocr_engine
+
+    setup_logging()
+    try:
+        # Loaded here, on the main thread: tesserocr installs signal handlers on import
+        get_ocr_engine()
+    except Exception:
+        _log.exception("Could not load the OCR engine")
+    pool = ThreadPoolExecutor(jobs, thread_name_prefix="job")
+    send_lock = threading.Lock()
+    # The client reuses its segments, so each is mapped once
+    segments: dict[str, SharedMemory] = {}
+    while True:
+        try:
+            op, job, payload, args = conn.recv()
+        except (EOFError, OSError):
+            break
+        if op == "stop":
+            break
+        if op == "forget":
+            segment = segments.pop(payload[0], None)
+            if segment is not None:
+                try:
+                    segment.close()
+                except BufferError:  # a finished job's image not collected yet; unmapped with it
+                    pass
+            continue
+        image = None
+        if payload is not None:
+            name, width, height = payload
+            segment = segments.get(name)
+            if segment is None:
+                # Registers with the client's resource tracker, which already knows it: no double unlink
+                segment = segments[name] = SharedMemory(name=name)
+            image = Image.frombuffer("RGBA", (width, height), segment.buf, "raw", "RGBA", 0, 1)
+        pool.submit(_run, conn, send_lock, job, op, image, args)
+        del image  # the job holds it; a stale reference here would pin the segment's mapping
+    pool.shutdown(wait=True)
+    for segment in segments.values():
+        try:
+            segment.close()
+        except BufferError:
+            pass
+    conn.close()
+
+
+def _run(conn: Connection, send_lock: threading.Lock, job: int, op: str, image: Image.Image | None, args: tuple) -> None:
+    from jp_assist_ai.adapters.llm.transport import is_transient
+
+    try:
+        reply = (job, True, _OPS[op](image, *args))
+    except Exception as exc:
+        _log.exception("Worker job %s failed", op)
+        reply = (job, False, (str(exc), is_transient(exc)))
+    with send_lock:
+        conn.send(reply)
+
+
+def _warm_up(image: None) -> None:
+    from jp_assist_ai.services.translate_service import warm_up
+
+    warm_up()
+
+
+def _translate(image: Image.Image, src_lang: str, dst_lang: str) -> str:
+    from jp_assist_ai.services.translate_service import get_screen_translator, get_translator
+
+    screen = get_screen_translator()
+    if screen is not None:
+        return screen.execute(image, src_lang, dst_lang).format()
+    return get_translator().translate_image(image, src_lang, dst_lang)
+
+
+def _recognize(image: Image.Image) -> list[OcrLine] | None:
+    from jp_assist_ai.services.translate_service import get_screen_translator
+
+    screen = get_screen_translator()
+    return screen.recognize(image) if screen is not None else None
+
+
+def _translate_lines(image: None, lines: list[OcrLine], src_lang: str, dst_lang: str) -> str:
+    from jp_assist_ai.services.translate_service import get_screen_translator
+
+    return get_screen_translator().translate_lines(lines, src_lang, dst_lang).format()
+
+
+def _translate_texts(image: None, texts: list[str], src_lang: str, dst_lang: str) -> list[str]:
+    from jp_assist_ai.services.translate_service import get_translator
+
+    return get_translator().translate_lines(texts, src_lang, dst_lang)
+
+
+_OPS = {
+    "warm_up": _warm_up,
+    "translate": _translate,
+    "recognize": _recognize,
+    "translate_lines": _translate_lines,
+    "translate_texts": _translate_texts,
+}
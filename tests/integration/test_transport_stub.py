@@ -0,0 +1,17 @@
+"""The transport scenarios of benchmarks/bench_transport.py, against the stub LLM server."""
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.bench_transport import SCENARIOS
+
+
+@pytest.fixture(autouse=True)
+def _api_key(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "stub")
+
+
+@pytest.mark.parametrize("name", sorted(SCENARIOS))
+def test_scenario(name):
+    out, failures = SCENARIOS[name]()
+    assert not failures, f"{name}: {'; '.join(failures)} ({out})"
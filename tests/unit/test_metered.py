@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import pytest
+from PIL import Image
+
+from jp_assist_ai.adapters.llm.base import Translator
+from jp_assist_ai.adapters.llm.metered import MeteredTranslator
+from jp_assist_ai.adapters.storage.base import UsageRecord, UsageStore, UsageSummary
+from jp_assist_ai.core.budget import BudgetExceeded, TokenBudget
+
+
+class _Store(UsageStore):
+    def record_usage(self, record: UsageRecord) -> None:
+        pass
+
+    def usage_since(self, since: float) -> UsageSummary:
+        return UsageSummary()
+
+
+class _Inner(Translator):
+    def __init__(self):
+        super().__init__()
+        self.calls: list[str] = []
+
+    def translate_image(self, image, src_lang, dst_lang):
+        self.calls.append("image")
+        return "from image"
+
+    def translate_text(self, text, src_lang, dst_lang):
+        self.calls.append(text)
+        return f"translated {text}"
+
+    def rewrite_text(self, text, style, context=""):
+        return text
+
+
+def _metered(ocr_text: str) -> tuple[MeteredTranslator, _Inner]:
+    inner = _Inner()
+    # 200 tokens fits no legible downscale of a page, so the OCR fallback is taken
+    budget = TokenBudget(per_request=200, min_image_scale=0.5)
+    return MeteredTranslator(inner, _Store(), budget=budget, ocr=lambda image: ocr_text), inner
+
+
+def test_over_budget_image_falls_back_to_ocr_text():
+    metered, inner = _metered("仕様書")
+    assert metered.translate_image(Image.new("RGB", (2000, 2000)), "JP", "VI") == "translated 仕様書"
+    assert inner.calls == ["仕様書"]
+
+
+@pytest.mark.parametrize("ocr_text", ["", "  \n "])
+def test_over_budget_image_without_ocr_text_is_refused(ocr_text):
+    metered, inner = _metered(ocr_text)
+    with pytest.raises(BudgetExceeded):
+        metered.translate_image(Image.new("RGB", (2000, 2000)), "JP", "VI")
+    assert inner.calls == []
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from jp_assist_ai.adapters.llm.base import _parse_numbered
+
+
+def test_numbered_lines():
+    assert _parse_numbered("[1] one\n[2] two\n[3] three", 3) == ["one", "two", "three"]
+
+
+def test_missing_and_duplicate_items():
+    assert _parse_numbered("[1] one\n[1] again\n[3] three", 3) == ["one", None, "three"]
+
+
+def test_wrapped_item_is_kept_whole():
+    output = "[1] Please check the specification\nfor batch retries before Friday.\n[2] Thanks."
+    assert _parse_numbered(output, 2) == [
+        "Please check the specification for batch retries before Friday.",
+        "Thanks.",
+    ]
+
+
+def test_wrapped_japanese_is_joined_without_space():
+    assert _parse_numbered("[1] バッチ処理の\nリトライ仕様\n[2] 確認", 2) == ["バッチ処理のリトライ仕様", "確認"]
+
+
+def test_preamble_and_blank_lines_are_ignored():
+    output = "Here is the translation:\n\n[1] one\n\n[2] two\n"
+    assert _parse_numbered(output, 2) == ["one", "two"]
+
+
+def test_wrapped_line_after_ignored_duplicate_is_dropped():
+    assert _parse_numbered("[1] one\n[1] dup\ncontinued\n[2] two", 2) == ["one", "two"]
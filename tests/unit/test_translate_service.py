@@ -0,0 +1,57 @@
+"""Every service getter builds, with optional features on and off (catches undefined names in lazy imports)."""
+from __future__ import annotations
+
+import inspect
+
+import pytest
+from PIL import Image
+
+from jp_assist_ai.services import translate_service
+from jp_assist_ai.services.job_queue import encode_png
+
+_GETTERS = sorted(
+    name
+    for name, fn in vars(translate_service).items()
+    if name.startswith("get_") and inspect.isfunction(getattr(fn, "__wrapped__", fn))
+)
+
+
+@pytest.fixture(params=["on", "off"])
+def services(request, tmp_path, monkeypatch):
+    on = request.param == "on"
+    monkeypatch.setenv("JP_ASSIST_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("OPENAI_API_KEY", "stub")
+    monkeypatch.setenv("JP_ASSIST_WORKER_PROCESS", "0")  # no child process in unit tests
+    monkeypatch.setenv("JP_ASSIST_NEAR_DUPLICATES", "1" if on else "0")
+    monkeypatch.setenv("JP_ASSIST_QUEUE", "1" if on else "0")
+    _clear()
+    yield translate_service
+    queue = translate_service.get_job_queue()
+    if queue is not None:
+        queue.close()
+    translate_service.get_store().close()
+    _clear()
+
+
+def _clear() -> None:
+    for name in _GETTERS:
+        getattr(translate_service, name).cache_clear()
+
+
+def test_getters_found():
+    assert {"get_store", "get_translator", "get_history_search", "get_capture_index", "get_job_queue"} <= set(_GETTERS)
+
+
+@pytest.mark.parametrize("name", _GETTERS)
+def test_getter_builds(services, name):
+    getattr(services, name)()
+
+
+def test_queued_capture_is_indexed(services):
+    store = services.get_store()
+    image = encode_png(Image.new("RGB", (64, 48), "white"))
+    entry = store.add_history("JP", "VI", "Translation:\nxin chào", image=image)
+    services._index_queued_capture(None, entry, None)
+    index = services.get_capture_index()
+    if index is not None:
+        assert store.capture_grid(entry.id) is not None
@@ -0,0 +1,324 @@
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import time
+from types import SimpleNamespace
+
+import openai
+import pytest
+
+from jp_assist_ai.adapters.llm.transport import (
+    AimdLimiter,
+    AsyncTransport,
+    CircuitBreaker,
+    CircuitOpen,
+    DeadlineExceeded,
+    RetryPolicy,
+    _classify,
+    _retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+_ERRORS = {400: openai.BadRequestError, 429: openai.RateLimitError, 503: openai.InternalServerError}
+
+
+def _status_error(status: int, headers: dict[str, str] | None = None) -> openai.APIStatusError:
+    # Just what the SDK reads from a response, whichever HTTP library it is built on
+    response = SimpleNamespace(status_code=status, headers=headers or {}, request=None)
+    return _ERRORS[status](f"HTTP {status}", response=response, body=None)
+
+
+def _release(limiter: AimdLimiter, latency: float | None, throttled: bool = False, kind: str = "") -> None:
+    async def go() -> None:
+        await limiter.acquire()
+        await limiter.release(latency, throttled, kind)
+
+    asyncio.run(go())
+
+
+# AimdLimiter
+
+
+def test_limiter_grows_by_one_per_limit_of_fast_successes():
+    limiter = AimdLimiter(initial=4, maximum=32, clock=FakeClock())
+    for _ in range(4):
+        _release(limiter, 0.1)
+    assert limiter.limit == pytest.approx(5.0, abs=0.1)
+
+
+def test_limiter_never_exceeds_maximum():
+    limiter = AimdLimiter(initial=4, maximum=6, clock=FakeClock())
+    for _ in range(200):
+        _release(limiter, 0.1)
+    assert limiter.limit == 6
+
+
+def test_limiter_halves_once_per_burst_of_429s():
+    clock = FakeClock()
+    limiter = AimdLimiter(initial=16, clock=clock)
+    _release(limiter, 0.2)
+    before = limiter.limit
+    clock.now = 10.0
+    for _ in range(5):
+        _release(limiter, None, throttled=True)
+    assert limiter.limit == pytest.approx(before / 2)
+    # One RTT later the next 429 counts again
+    clock.now += 0.3
+    _release(limiter, None, throttled=True)
+    assert limiter.limit == pytest.approx(before / 4)
+
+
+def test_limiter_backs_off_when_latency_climbs():
+    clock = FakeClock()
+    limiter = AimdLimiter(initial=10, latency_tolerance=2.0, clock=clock)
+    _release(limiter, 0.1)
+    before = limiter.limit
+    clock.now = 10.0
+    _release(limiter, 0.5)
+    assert limiter.limit == pytest.approx(before * 0.9)
+
+
+def test_limiter_compares_latency_within_request_class():
+    # Alternating fast text and slow image calls, no 429s: not congestion
+    clock = FakeClock()
+    limiter = AimdLimiter(initial=8, clock=clock)
+    for i in range(40):
+        clock.now += 1.0
+        _release(limiter, 0.3 if i % 2 else 3.0, kind="text" if i % 2 else "image")
+    assert limiter.limit > 8
+
+
+def test_limiter_backs_off_when_one_class_slows_down():
+    clock = FakeClock()
+    limiter = AimdLimiter(initial=8, clock=clock)
+    _release(limiter, 3.0, kind="image")
+    _release(limiter, 0.3, kind="text")
+    before = limiter.limit
+    clock.now = 10.0
+    _release(limiter, 1.0, kind="text")
+    assert limiter.limit == pytest.approx(before * 0.9)
+
+
+def test_limiter_stays_at_minimum():
+    clock = FakeClock()
+    limiter = AimdLimiter(initial=2, minimum=1, clock=clock)
+    for i in range(10):
+        clock.now = float(i)
+        _release(limiter, None, throttled=True)
+    assert limiter.limit == 1
+
+
+def test_limiter_blocks_beyond_limit():
+    limiter = AimdLimiter(initial=2, clock=FakeClock())
+
+    async def go() -> bool:
+        await limiter.acquire()
+        await limiter.acquire()
+        try:
+            await asyncio.wait_for(limiter.acquire(), 0.05)
+        except asyncio.TimeoutError:
+            return True
+        return False
+
+    assert asyncio.run(go())
+    assert limiter.inflight == 2
+
+
+# CircuitBreaker
+
+
+def test_breaker_opens_after_threshold_consecutive_failures():
+    breaker = CircuitBreaker(threshold=3, cooldown=30.0, clock=FakeClock())
+    for _ in range(2):
+        breaker.record(False)
+    breaker.record(True)
+    for _ in range(2):
+        breaker.record(False)
+    assert breaker.state == "closed"
+    breaker.record(False)
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpen):
+        breaker.check()
+
+
+def test_breaker_allows_one_trial_after_cooldown():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, cooldown=30.0, clock=clock)
+    breaker.record(False)
+    clock.now = 30.0
+    assert breaker.state == "half-open"
+    breaker.check()
+    with pytest.raises(CircuitOpen):
+        breaker.check()
+    breaker.record(True)
+    assert breaker.state == "closed"
+    breaker.check()
+
+
+def test_breaker_reopens_when_trial_fails():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=5, cooldown=30.0, clock=clock)
+    for _ in range(5):
+        breaker.record(False)
+    clock.now = 31.0
+    breaker.check()
+    breaker.record(False)
+    assert breaker.state == "open"
+    clock.now = 60.0
+    assert breaker.state == "open"
+    clock.now = 61.0
+    assert breaker.state == "half-open"
+
+
+def test_breaker_abandoned_trial_lets_another_call_try():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, cooldown=1.0, clock=clock)
+    breaker.record(False)
+    clock.now = 1.0
+    breaker.check()
+    breaker.abandon()
+    breaker.check()
+
+
+# Retry-After
+
+
+def test_retry_after_seconds_and_milliseconds():
+    assert _retry_after({"retry-after": "2"}) == 2.0
+    assert _retry_after({"retry-after-ms": "250", "retry-after": "2"}) == 0.25
+    assert _retry_after({"retry-after-ms": "soon", "retry-after": "3"}) == 3.0
+    assert _retry_after({"retry-after": "-5"}) == 0.0
+
+
+def test_retry_after_http_date():
+    value = email.utils.formatdate(time.time() + 10, usegmt=True)
+    assert 8.0 < _retry_after({"retry-after": value}) <= 10.0
+
+
+def test_retry_after_missing_or_garbage():
+    assert _retry_after({}) is None
+    assert _retry_after({"retry-after": "whenever"}) is None
+
+
+def test_retry_delay_never_shorter_than_retry_after():
+    policy = RetryPolicy(base_delay=0.01, max_delay=0.02)
+    assert all(policy.delay(attempt, 1.5) == 1.5 for attempt in range(10))
+    assert all(0 <= policy.delay(attempt, None) <= 0.02 for attempt in range(10))
+
+
+def test_classify_status_codes():
+    assert _classify(_status_error(429, {"retry-after": "1"})) == (True, True, 1.0)
+    assert _classify(_status_error(503)) == (True, False, None)
+    assert _classify(_status_error(400))[0] is False
+    assert _classify(ValueError("not transport")) == (False, False, None)
+
+
+# AsyncTransport
+
+
+def _transport(**kwargs) -> AsyncTransport:
+    return AsyncTransport(
+        lambda: None,
+        limiter=AimdLimiter(initial=4),
+        breaker=kwargs.pop("breaker", CircuitBreaker(threshold=3, cooldown=30.0)),
+        retry=kwargs.pop("retry", RetryPolicy(max_attempts=5, base_delay=0.001, max_delay=0.002)),
+        **kwargs,
+    )
+
+
+def test_transport_waits_for_retry_after_then_succeeds():
+    transport = _transport()
+    calls: list[float] = []
+
+    async def fn(_client) -> str:
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            raise _status_error(429, {"retry-after-ms": "150"})
+        return "ok"
+
+    try:
+        assert transport.call(fn) == "ok"
+    finally:
+        transport.close()
+    assert calls[1] - calls[0] >= 0.15
+    assert transport.retries == 1
+    assert transport.throttled == 1
+    assert transport.breaker.state == "closed"
+
+
+def test_transport_gives_up_when_retry_after_passes_deadline():
+    transport = _transport(deadline=0.2)
+    attempts = 0
+
+    async def fn(_client) -> str:
+        nonlocal attempts
+        attempts += 1
+        raise _status_error(429, {"retry-after": "5"})
+
+    try:
+        with pytest.raises(openai.RateLimitError):
+            transport.call(fn)
+    finally:
+        transport.close()
+    assert attempts == 1
+
+
+def test_transport_opens_breaker_on_server_errors():
+    transport = _transport(retry=RetryPolicy(max_attempts=1))
+    attempts = 0
+
+    async def fn(_client) -> str:
+        nonlocal attempts
+        attempts += 1
+        raise _status_error(503)
+
+    try:
+        for _ in range(3):
+            with pytest.raises(openai.InternalServerError):
+                transport.call(fn)
+        with pytest.raises(CircuitOpen):
+            transport.call(fn)
+    finally:
+        transport.close()
+    assert attempts == 3
+
+
+def test_transport_429s_do_not_open_breaker():
+    transport = _transport(retry=RetryPolicy(max_attempts=1))
+
+    async def fn(_client) -> str:
+        raise _status_error(429)
+
+    try:
+        for _ in range(5):
+            with pytest.raises(openai.RateLimitError):
+                transport.call(fn)
+    finally:
+        transport.close()
+    assert transport.breaker.state == "closed"
+
+
+def test_transport_deadline_releases_caller():
+    transport = _transport()
+
+    async def fn(_client) -> str:
+        await asyncio.sleep(5)
+        return "late"
+
+    start = time.monotonic()
+    try:
+        with pytest.raises(DeadlineExceeded):
+            transport.call(fn, deadline=0.1)
+    finally:
+        transport.close()
+    assert time.monotonic() - start < 1.0
+    assert transport.limiter.inflight == 0